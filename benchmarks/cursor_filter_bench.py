@@ -0,0 +1,120 @@
+"""
+Gesture cursor benchmark: the old moving average moved once per camera frame
+vs the One-Euro filter + prediction output thread (jarvis/cursor_output.py).
+
+    python benchmarks/cursor_filter_bench.py [--seconds 60] [--fps 30] [--noise 3] [--latency 0.035]
+
+A synthetic fingertip path (holds with tremor, minimum-jerk moves of varying
+speed) is sampled by a jittery camera, corrupted with landmark noise and
+delivered `latency` seconds later, as from the hand-tracking stage. The
+cursor is read at CURSOR_RATE Hz, like a display refresh. Reported per method:
+  err moving    mean / p95 distance (px) to the true fingertip while the hand moves
+  jitter still  mean cursor movement (px per refresh) once the hand has held
+                still for 250 ms (tremor and landmark noise, not settling)
+"""
+import argparse
+import os
+import sys
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from jarvis.config import Config
+from jarvis.cursor_output import CursorOutput
+
+SCREEN = (1920, 1080)
+
+def make_path(seconds, rng, rate=1000):
+    """True fingertip position sampled at `rate` Hz, plus a 'moving' mask."""
+    n = int(seconds * rate)
+    pos = np.zeros((n, 2))
+    moving = np.zeros(n, dtype=bool)
+    cur = np.array(SCREEN) / 2
+    i = 0
+    while i < n:
+        hold = int(rng.uniform(0.3, 1.0) * rate)
+        pos[i:i + hold] = cur
+        i += hold
+        target = rng.uniform((100, 100), (SCREEN[0] - 100, SCREEN[1] - 100))
+        dur = int(rng.uniform(0.15, 0.8) * rate)
+        s = np.linspace(0, 1, dur)[:, None]
+        s = 10 * s**3 - 15 * s**4 + 6 * s**5  # minimum-jerk profile
+        pos[i:i + dur] = (cur + (target - cur) * s)[:n - i]
+        moving[i:i + dur] = True
+        cur = target
+        i += dur
+    t = np.arange(n) / rate
+    tremor = 1.5 * np.stack([np.sin(2 * np.pi * 9 * t), np.cos(2 * np.pi * 7 * t)], axis=1)
+    return pos + tremor, moving, rate
+
+def camera_samples(path, rate, fps, noise, latency, rng):
+    """(capture time, arrival time, noisy position) per camera frame."""
+    times = np.arange(0, len(path) / rate - latency - 0.1, 1 / fps)
+    times = times + rng.uniform(-0.003, 0.003, len(times))
+    idx = np.clip((times * rate).astype(int), 0, len(path) - 1)
+    return times, times + latency, path[idx] + rng.normal(0, noise, (len(times), 2))
+
+def evaluate(cursor_fn, path, moving, rate, samples, refresh):
+    capture, arrival, noisy = samples
+    ticks = np.arange(arrival[0], arrival[-1], 1 / refresh)
+    out = np.zeros((len(ticks), 2))
+    j = 0
+    for k, now in enumerate(ticks):
+        while j < len(arrival) and arrival[j] <= now:
+            cursor_fn.push(capture[j], *noisy[j])
+            j += 1
+        out[k] = cursor_fn.position(now)
+    idx = np.clip((ticks * rate).astype(int), 0, len(path) - 1)
+    err = np.linalg.norm(out - path[idx], axis=1)
+    mov = moving[idx]
+    settled = np.convolve(moving, np.ones(rate // 4), mode="full")[:len(moving)] == 0
+    step = np.linalg.norm(np.diff(out, axis=0), axis=1)
+    still = settled[idx][1:]
+    return err[mov].mean(), np.percentile(err[mov], 95), step[still].mean()
+
+class MovingAverage:
+    """The previous MouseController: mean of the last MOUSE_SMOOTHING samples, moved per frame."""
+    def __init__(self, n=5):
+        self.hist = []
+        self.n = n
+        self.pos = np.zeros(2)
+        
+    def push(self, t, x, y):
+        self.hist = (self.hist + [(x, y)])[-self.n:]
+        self.pos = np.mean(self.hist, axis=0)
+        
+    def position(self, now):
+        return self.pos
+
+class OneEuro:
+    """CursorOutput; predict=False reads the filtered sample without extrapolation."""
+    def __init__(self, predict):
+        self.out = CursorOutput(SCREEN, dry_run=True)
+        self.predict = predict
+        self.pos = np.zeros(2)
+        
+    def push(self, t, x, y):
+        self.pos = self.out.push(t, x, y)
+        
+    def position(self, now):
+        return self.out.predicted(now) if self.predict else self.pos
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=60)
+    parser.add_argument("--fps", type=float, default=30)
+    parser.add_argument("--noise", type=float, default=3.0, help="landmark noise, screen px (std)")
+    parser.add_argument("--latency", type=float, default=0.035, help="capture -> hand result delay (s)")
+    parser.add_argument("--refresh", type=float, default=Config.CURSOR_RATE)
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(0)
+    path, moving, rate = make_path(args.seconds, rng)
+    samples = camera_samples(path, rate, args.fps, args.noise, args.latency, rng)
+    
+    print(f"{args.fps:g} fps camera, {args.latency * 1000:g} ms latency, {args.noise:g} px noise, {args.refresh:g} Hz refresh")
+    print(f"{'method':<28} {'err moving':>11} {'p95':>8} {'jitter still':>13}")
+    for name, fn in [("moving average (5)", MovingAverage()),
+                     ("one-euro", OneEuro(predict=False)),
+                     ("one-euro + prediction", OneEuro(predict=True))]:
+        mean_err, p95, jitter = evaluate(fn, path, moving, rate, samples, args.refresh)
+        print(f"{name:<28} {mean_err:>9.1f}px {p95:>6.1f}px {jitter:>11.2f}px")
@@ -0,0 +1,81 @@
+"""
+FaceID lookup benchmark: exact gallery scan vs the IVF index (jarvis/face_index.py).
+
+    python benchmarks/face_index_bench.py [--sizes 1000 10000 100000] [--queries 500]
+
+Identities are synthetic faces: a mean 6-keypoint layout with per-person jitter,
+embedded exactly like FaceID.get_embeddings. Each query is a fresh noisy capture
+of an enrolled person. Reported per size:
+  exact / ivf      mean lookup time per face (ms)
+  agree            share of queries where the IVF best sample equals the exact one
+  max dconf        largest confidence difference (0 whenever the best sample agrees)
+  decision         share of queries with the same thresholded name as identify()
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from jarvis.config import Config
+from jarvis.face_id import FaceID
+from jarvis.face_index import FaceIndex
+
+# Eyes, nose tip, mouth corners, chin (same order as FaceID.KEYPOINTS)
+MEAN_FACE = np.array([[-1.0, 0.0], [1.0, 0.0], [0.0, 1.0], [-0.7, 1.8], [0.7, 1.8], [0.0, 2.8]], dtype=np.float32)
+
+def embed(pts):
+    dists = np.linalg.norm(pts[:, FaceID.PAIRS_A] - pts[:, FaceID.PAIRS_B], axis=2)
+    emb = dists / np.linalg.norm(pts[:, 0] - pts[:, 1], axis=1)[:, None]
+    return emb / np.linalg.norm(emb, axis=1, keepdims=True)
+
+def make_data(n, queries, rng):
+    people = MEAN_FACE + rng.normal(0, 0.12, (n, 6, 2)).astype(np.float32)
+    gallery = embed(people + rng.normal(0, 0.01, people.shape).astype(np.float32)).astype(np.float32)
+    who = rng.integers(0, n, queries)
+    probes = embed(people[who] + rng.normal(0, 0.01, (queries, 6, 2)).astype(np.float32)).astype(np.float32)
+    return gallery, np.arange(n, dtype=np.int32), probes
+
+def decide(score):
+    return score > Config.FACE_MATCH_THRESHOLD
+
+def run(n, queries, nprobe, rng):
+    gallery, labels, probes = make_data(n, queries, rng)
+
+    t = time.perf_counter()
+    index = FaceIndex(nprobe)
+    index.build(gallery, labels, np.arange(n))
+    build_s = time.perf_counter() - t
+
+    t = time.perf_counter()
+    exact = [(int(np.argmax(s)), float(s.max())) for s in (gallery @ q for q in probes)]
+    exact_ms = (time.perf_counter() - t) * 1000 / queries
+
+    t = time.perf_counter()
+    approx = []
+    for q in probes:
+        scores, cand = index.search(q)
+        best = int(np.argmax(scores))
+        approx.append((int(cand[best]), float(scores[best])))
+    ivf_ms = (time.perf_counter() - t) * 1000 / queries
+
+    agree = np.mean([e[0] == a[0] for e, a in zip(exact, approx)])
+    dconf = max(abs(e[1] - a[1]) for e, a in zip(exact, approx))
+    same_decision = np.mean([(decide(e[1]), e[0] if decide(e[1]) else -1) ==
+                             (decide(a[1]), a[0] if decide(a[1]) else -1) for e, a in zip(exact, approx)])
+    print(f"{n:>8} {build_s:>8.2f} {exact_ms:>9.3f} {ivf_ms:>9.3f} {exact_ms / ivf_ms:>8.1f}x "
+          f"{agree * 100:>7.2f}% {dconf:>10.5f} {same_decision * 100:>9.2f}%")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--nprobe", type=int, default=Config.FACE_INDEX_NPROBE)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"nprobe={args.nprobe}, {args.queries} queries per size")
+    print(f"{'ids':>8} {'build s':>8} {'exact ms':>9} {'ivf ms':>9} {'speedup':>9} {'agree':>8} {'max dconf':>10} {'decision':>10}")
+    for n in args.sizes:
+        run(n, args.queries, args.nprobe, rng)
@@ -0,0 +1,125 @@
+"""
+Gesture engine benchmark: vectorized features + state machine (jarvis/gestures.py)
+vs computing the same features hand by hand in plain Python.
+
+    python benchmarks/gesture_bench.py [--hands 1 2 4] [--frames 5000]
+
+Hands are synthetic 21-point skeletons (open, fist, pinch, two-finger) built
+from joint angles, randomly rotated, scaled and jittered like MediaPipe
+output. Reported per hand count:
+  python / numpy   mean time per frame for the features alone (us)
+  engine           full GestureEngine.update() per frame (us) and the rate it allows
+  agree            share of frames where both feature paths agree to 1e-3
+"""
+import argparse
+import math
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from jarvis.config import Config
+from jarvis.gestures import GestureEngine, hand_features, TIPS
+
+FRAME = (1280, 720)
+# Finger bases (x, y) relative to the wrist in palm lengths, and segment lengths
+BASES = [(-0.35, -0.25), (-0.25, -0.95), (0.0, -1.0), (0.22, -0.95), (0.42, -0.85)]
+SEGMENTS = [(0.45, 0.35, 0.3), (0.45, 0.28, 0.22), (0.5, 0.3, 0.24), (0.46, 0.28, 0.22), (0.36, 0.22, 0.2)]
+POSES = {
+    "open": [0.1, 0.1, 0.1, 0.1, 0.1],
+    "fist": [0.6, 1.3, 1.3, 1.3, 1.3],
+    "two": [0.6, 0.1, 0.1, 1.3, 1.3],
+}
+
+def make_hand(pose, rng, scale=0.12):
+    """(21, 3) normalized landmarks for a pose name ("open", "fist", "two", "pinch")."""
+    flex = POSES["open" if pose == "pinch" else pose]
+    pts = np.zeros((21, 3))
+    for f, ((bx, by), segs) in enumerate(zip(BASES, SEGMENTS)):
+        p = np.array([bx, by, 0.0])
+        pts[1 + 4 * f] = p
+        theta = 0.0
+        spread = -0.6 if f == 0 else 0.0
+        for j, seg in enumerate(segs):
+            theta += flex[f] + rng.normal(0, 0.05)
+            d = np.array([math.sin(spread) * math.cos(theta), -math.cos(spread) * math.cos(theta), -math.sin(theta)])
+            p = p + seg * d
+            pts[2 + 4 * f + j] = p
+    if pose == "pinch":
+        # Thumb joints slide towards the index tip
+        tip = pts[8] + rng.normal(0, 0.03, 3)
+        for j, k in enumerate((2, 3, 4)):
+            pts[k] = pts[1] + (tip - pts[1]) * (j + 1) / 3 + [0.05 * (2 - j), 0, 0]
+    a = rng.uniform(-0.4, 0.4)
+    rot = np.array([[math.cos(a), -math.sin(a), 0], [math.sin(a), math.cos(a), 0], [0, 0, 1]])
+    pts = pts @ rot.T * scale * rng.uniform(0.8, 1.2)
+    pts[:, 0] = pts[:, 0] * FRAME[1] / FRAME[0] # square pixels
+    pts[:, :2] += rng.uniform(0.3, 0.7, 2)
+    return (pts + rng.normal(0, 0.001, pts.shape)).astype(np.float32)
+
+def python_features(hand, frame_size):
+    """The same features, one hand at a time in plain Python (reference)."""
+    w, h = frame_size
+    pts = [(x * w, y * h, z * w) for x, y, z in hand.tolist()]
+    palm = max(math.dist(pts[0][:2], pts[9][:2]), 1.0)
+    tips = [pts[i][:2] for i in TIPS]
+    tip_dist = [math.dist(tips[i], tips[j]) for i in range(5) for j in range(i + 1, 5)]
+    flexion = []
+    for f in range(5):
+        chain = [pts[0]] + pts[1 + 4 * f:5 + 4 * f]
+        bones = [[b - a for a, b in zip(chain[k], chain[k + 1])] for k in range(4)]
+        for k in range(3):
+            u, v = bones[k], bones[k + 1]
+            cos = sum(x * y for x, y in zip(u, v)) / ((math.hypot(*u) + 1e-6) * (math.hypot(*v) + 1e-6))
+            flexion.append(math.acos(max(-1.0, min(1.0, cos))))
+    a = [p - q for p, q in zip(pts[5], pts[0])]
+    b = [p - q for p, q in zip(pts[17], pts[0])]
+    n = [a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0]]
+    norm = math.hypot(*n) + 1e-6
+    return palm, tip_dist, flexion, [c / norm for c in n]
+
+def run(n_hands, frames, rng):
+    poses = list(POSES) + ["pinch"]
+    data = [np.stack([make_hand(poses[rng.integers(len(poses))], rng) for _ in range(n_hands)]) for _ in range(200)]
+    labels = ["RIGHT", "LEFT", "RIGHT", "LEFT"][:n_hands]
+    
+    t = time.perf_counter()
+    for i in range(frames):
+        for hand in data[i % len(data)]:
+            python_features(hand, FRAME)
+    py_us = (time.perf_counter() - t) * 1e6 / frames
+    
+    t = time.perf_counter()
+    for i in range(frames):
+        hand_features(data[i % len(data)], FRAME)
+    np_us = (time.perf_counter() - t) * 1e6 / frames
+    
+    engine = GestureEngine()
+    t = time.perf_counter()
+    for i in range(frames):
+        engine.update(data[i % len(data)], labels, FRAME, i / 30)
+    engine_us = (time.perf_counter() - t) * 1e6 / frames
+    
+    agree = 0
+    for hands in data:
+        f = hand_features(hands, FRAME)
+        ok = True
+        for k, hand in enumerate(hands):
+            palm, tip_dist, flexion, normal = python_features(hand, FRAME)
+            ok &= (abs(palm - f.palm_size[k]) < 1e-3 * palm and np.allclose(tip_dist, f.tip_dist[k], rtol=1e-3, atol=1e-2)
+                   and np.allclose(flexion, f.flexion[k].ravel(), atol=1e-3) and np.allclose(normal, f.palm_normal[k], atol=1e-3))
+        agree += ok
+    print(f"{n_hands:>6} {py_us:>10.1f} {np_us:>10.1f} {py_us / np_us:>8.1f}x {engine_us:>10.1f} {1e6 / engine_us:>9.0f} {agree / len(data) * 100:>7.1f}%")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hands", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--frames", type=int, default=5000)
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(0)
+    print(f"{args.frames} frames, {FRAME[0]}x{FRAME[1]}, vocabulary: {', '.join(Config.GESTURES)}")
+    print(f"{'hands':>6} {'python us':>10} {'numpy us':>10} {'speedup':>9} {'engine us':>10} {'engine Hz':>9} {'agree':>8}")
+    for n in args.hands:
+        run(n, args.frames, rng)
@@ -0,0 +1,80 @@
+"""
+Per-frame memory churn of HUD drawing, measured with tracemalloc.
+
+    python benchmarks/hud_alloc_bench.py [--frames 200]
+
+For each case the frame is drawn once to warm caches, then every frame's
+transient peak (tracemalloc peak above the pre-frame baseline) is recorded.
+"legacy" cases reproduce the pre-pool code (np.full fill + addWeighted result
+copied back; img.copy() overlay blended over the whole frame) for comparison.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from jarvis.config import Config
+from jarvis.graphics_utils import GraphicsUtils
+from jarvis.hologram_ui import HologramUI
+from jarvis.matrix_rain import MatrixRain
+from jarvis.detections import Detections
+
+PANELS = [(20, 20, 280, 160), (Config.WIDTH - 350, Config.HEIGHT - 220, 330, 200),
+          (Config.WIDTH // 2 - 150, 100, 300, 60)] + [(Config.WIDTH - 160, 150 + 50 * i, 140, 40) for i in range(4)]
+
+def legacy_panels(img):
+    for x, y, w, h in PANELS:
+        sub = img[y:y+h, x:x+w]
+        fill = np.full(sub.shape, Config.BLUE_DEEP, dtype=np.uint8)
+        img[y:y+h, x:x+w] = cv2.addWeighted(sub, 1 - Config.UI_ALPHA, fill, Config.UI_ALPHA, 0)
+
+def pooled_panels(img):
+    for rect in PANELS:
+        GraphicsUtils.blend_rect(img, rect, Config.BLUE_DEEP, Config.UI_ALPHA)
+
+def legacy_overlay(img):
+    overlay = img.copy()
+    cv2.addWeighted(overlay, Config.MATRIX_OPACITY, img, 1.0 - Config.MATRIX_OPACITY, 0, img)
+
+def pooled_overlay(img):
+    overlay = GraphicsUtils.pool.copy("matrix_overlay", img)
+    GraphicsUtils.blend_into(img, overlay, Config.MATRIX_OPACITY)
+
+def measure(name, fn, frame, frames):
+    img = frame.copy()
+    fn(img) # warm-up: pools, tiles and HUD layers are filled here
+    peaks = []
+    t = time.perf_counter()
+    for _ in range(frames):
+        np.copyto(img, frame)
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        fn(img)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    ms = (time.perf_counter() - t) * 1000 / frames
+    print(f"{name:<22} {np.mean(peaks) / 1024:>12.1f} {max(peaks) / 1024:>12.1f} {ms:>9.2f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    frame = np.random.default_rng(0).integers(0, 256, (Config.HEIGHT, Config.WIDTH, 3), dtype=np.uint8)
+    ui = HologramUI()
+    for i in range(8):
+        ui.add_notification(f"Benchmark note {i}")
+    hud = lambda img: ui.update(img, Detections(), "ACTIVE", (0, 0), 30, True, True)
+
+    tracemalloc.start()
+    print(f"{Config.WIDTH}x{Config.HEIGHT}, {args.frames} frames (tracemalloc slows timings)")
+    print(f"{'case':<22} {'mean KiB':>12} {'max KiB':>12} {'ms/frame':>9}")
+    measure("panels (legacy)", legacy_panels, frame, args.frames)
+    measure("panels (in place)", pooled_panels, frame, args.frames)
+    measure("frame blend (legacy)", legacy_overlay, frame, args.frames)
+    measure("frame blend (pool)", pooled_overlay, frame, args.frames)
+    measure("matrix rain", MatrixRain().update, frame, args.frames)
+    measure("full HUD", hud, frame, args.frames)
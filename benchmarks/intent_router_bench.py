@@ -0,0 +1,93 @@
+"""
+Voice command dispatch benchmark: linear substring scan (the old elif chain in
+JarvisCore.process_command) vs the indexed IntentRouter (jarvis/intents.py).
+
+    python benchmarks/intent_router_bench.py [--sizes 10 100 1000] [--queries 5000]
+
+Each size registers that many synthetic commands ("<verb> <noun>", a quarter
+with a trailing "{arg}" slot) over a shared vocabulary, so first words collide
+the way real command packs do. Queries are spoken forms of random commands
+("jarvis please <phrase> now") plus 20% utterances that match nothing.
+Reported per size:
+  linear / router  mean dispatch time per utterance (us)
+  correct          share of queries the router sends to the intended command
+"""
+import argparse
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from jarvis.intents import IntentRouter
+
+SYLLABLES = ["ka", "lo", "mi", "ren", "sa", "tor", "vi", "zu", "pe", "dan", "gor", "hel"]
+
+def make_words(n, rng, syllables=3):
+    words = set()
+    while len(words) < n:
+        words.add("".join(rng.choice(SYLLABLES, syllables)))
+    return sorted(words)
+
+def make_commands(n, rng):
+    verbs = make_words(max(4, n // 10), rng)   # ~10 commands share each first word
+    nouns = make_words(n * 2, rng, 4)
+    phrases, seen = [], set()
+    while len(phrases) < n:
+        verb, noun = rng.choice(verbs), rng.choice(nouns)
+        if (verb, noun) in seen:
+            continue
+        seen.add((verb, noun))
+        phrases.append(f"{verb} {noun}" + (" {arg}" if rng.random() < 0.25 else ""))
+    return phrases
+
+def make_queries(phrases, count, rng):
+    queries = []
+    for _ in range(count):
+        if rng.random() < 0.2:
+            queries.append(("jarvis what is the weather like", None))
+            continue
+        i = int(rng.integers(len(phrases)))
+        spoken = phrases[i].replace("{arg}", "the blue one")
+        queries.append((f"jarvis please {spoken} now", i))
+    return queries
+
+def linear_dispatch(literals, text):
+    for i, literal in enumerate(literals):
+        if literal in text:
+            return i
+    return None
+
+def run(n, count, rng):
+    phrases = make_commands(n, rng)
+    queries = make_queries(phrases, count, rng)
+    literals = [p.replace(" {arg}", "") for p in phrases]
+    
+    router = IntentRouter(modules=[], entry_points=False)
+    for i, phrase in enumerate(phrases):
+        router.add(f"cmd{i}", i, [phrase])
+    router.load()
+    
+    t = time.perf_counter()
+    for text, _ in queries:
+        linear_dispatch(literals, text)
+    linear_us = (time.perf_counter() - t) * 1e6 / count
+    
+    t = time.perf_counter()
+    results = [router.match(text) for text, _ in queries]
+    router_us = (time.perf_counter() - t) * 1e6 / count
+    
+    correct = np.mean([(m[0].handler if m else None) == want for m, (_, want) in zip(results, queries)])
+    print(f"{n:>8} {linear_us:>10.2f} {router_us:>10.2f} {linear_us / router_us:>8.1f}x {correct * 100:>8.2f}%")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--queries", type=int, default=5000)
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(0)
+    print(f"{args.queries} queries per size")
+    print(f"{'commands':>8} {'linear us':>10} {'router us':>10} {'speedup':>9} {'correct':>9}")
+    for n in args.sizes:
+        run(n, args.queries, rng)
@@ -0,0 +1,88 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .config import Config
+
+class CommandExecutor:
+    """
+    Runs side-effecting commands (screenshots, browser launches, model loads)
+    on a small thread pool so the frame loop never waits on them.
+    Each command name has at most `limit` runs in flight; further requests
+    are refused instead of piling up. Workers report back through an event
+    queue that the frame loop drains with poll(): completion callbacks run
+    there, on the main thread, and failures become HUD notifications.
+    A run that outlives its timeout is reported and gives up its slot, so
+    new runs of that command are accepted again. Threads cannot be killed:
+    the stuck call keeps its pool thread until it returns, and a late result
+    is still delivered.
+    """
+    def __init__(self, workers=Config.COMMAND_WORKERS):
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jarvis-cmd")
+        self._events = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._in_flight = {}   # name -> running count
+        self._deadlines = {}   # future -> (name, deadline or None, timeout)
+        self._timed_out = set()  # futures whose slot was already given back
+        
+    def submit(self, name, fn, limit=None, timeout=None, on_done=None):
+        """
+        Schedules fn() and returns its Future, or None if `name` is at its limit.
+        on_done(result) runs on the thread that calls poll().
+        """
+        limit = limit or Config.COMMAND_LIMIT
+        timeout = timeout if timeout is not None else Config.COMMAND_TIMEOUT
+        with self._lock:
+            if self._in_flight.get(name, 0) >= limit:
+                self._events.put(("busy", name, None, None))
+                return None
+            self._in_flight[name] = self._in_flight.get(name, 0) + 1
+            future = self._pool.submit(fn)
+            self._deadlines[future] = (name, time.monotonic() + timeout if timeout else None, timeout)
+        future.add_done_callback(lambda f: self._finished(name, f, on_done))
+        return future
+        
+    def _finished(self, name, future, on_done):
+        with self._lock:
+            if future in self._timed_out:
+                self._timed_out.discard(future)
+            else:
+                self._in_flight[name] -= 1
+            self._deadlines.pop(future, None)
+        self._events.put(("done", name, future, on_done))
+        
+    def poll(self, notify):
+        """Reports timeouts and delivers finished commands; notify(text) gets HUD messages."""
+        now = time.monotonic()
+        with self._lock:
+            for future, (name, deadline, timeout) in list(self._deadlines.items()):
+                if deadline is not None and now > deadline:
+                    # Free the slot so a hung call can't lock the command out for good
+                    del self._deadlines[future]
+                    self._timed_out.add(future)
+                    self._in_flight[name] -= 1
+                    print(f"[COMMANDS] {name} still running after {timeout}s; accepting new runs")
+                    notify(f"CMD TIMEOUT: {name}")
+                    
+        while True:
+            try:
+                kind, name, future, on_done = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "busy":
+                notify(f"CMD BUSY: {name}")
+                continue
+            if future.cancelled():
+                continue
+            error = future.exception()
+            if error is not None:
+                print(f"[COMMANDS] {name} failed: {error}")
+                notify(f"CMD FAILED: {name}")
+            elif on_done is not None:
+                try:
+                    on_done(future.result())
+                except Exception as e:
+                    print(f"[COMMANDS] {name} callback error: {e}")
+                    
+    def stop(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,119 @@
+import datetime
+import os
+import webbrowser
+from functools import partial
+import pyautogui
+from .config import Config
+from .intents import command
+
+# Built-in voice commands. Each handler gets the JarvisCore instance plus the
+# phrase's slots; earlier commands win when an utterance matches several.
+# Handlers that set JarvisCore state run on the main thread (main_thread=True);
+# the rest run on the command pool and only speak or touch the OS.
+
+@command("shutdown system", main_thread=True)
+def shutdown_system(core):
+    core.voice.speak("Are you sure you want to shut down the PC?", emotion="urgent")
+    core.running = False
+
+@command("goodbye", "terminate", main_thread=True)
+def goodbye(core):
+    core.voice.speak("Shutting down protocols. Goodbye, sir.", emotion="sad")
+    core.running = False
+
+@command("enable object", "enable objects", timeout=120) # first use loads/exports the model
+def enable_objects(core):
+    if core.vision.toggle(True):
+        core.voice.speak("Object detection enabled.")
+    else:
+        core.voice.speak("Vision module failed to load.")
+
+@command("disable object", "disable objects")
+def disable_objects(core):
+    core.vision.toggle(False)
+    core.voice.speak("Vision module paused.")
+
+@command("register my name is {name}", allow_locked=True, main_thread=True)
+def register_user(core, name):
+    core.registering_user = name
+    core.registration_buffer = []
+    core.voice.speak(f"Please look at the camera. Registering {name}.")
+
+@command("open youtube")
+def open_youtube(core):
+    webbrowser.open("https://youtube.com")
+    core.voice.speak("Opening YouTube.")
+
+@command("open google")
+def open_google(core):
+    webbrowser.open("https://google.com")
+    core.voice.speak("Opening Google.")
+
+@command("search for {query}")
+def search(core, query):
+    webbrowser.open(f"https://google.com/search?q={query}")
+    core.voice.speak(f"Searching for {query}.")
+
+@command("search wikipedia for {query}", "search wikipedia {query}")
+def search_wikipedia(core, query):
+    webbrowser.open(f"https://en.wikipedia.org/wiki/{query}")
+    core.voice.speak(f"Searching Wikipedia for {query}.")
+
+@command("enable mouse", main_thread=True)
+def enable_mouse(core):
+    core.mouse.paused_by_keyboard = False
+    core.voice.speak("Mouse control active.")
+
+@command("disable mouse", main_thread=True)
+def disable_mouse(core):
+    core.mouse.paused_by_keyboard = True
+    core.voice.speak("Mouse control paused.")
+
+@command("take screenshot", "take a screenshot", main_thread=True)
+def take_screenshot(core):
+    ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = os.path.join(Config.SCREENSHOT_DIR, f"screenshot_{ts}.png")
+    
+    def saved(_):
+        core.voice.speak("Screenshot saved.")
+        core.ui.add_notification(f"Saved: {path}")
+    # The capture is slow; the HUD notification is added back on the main thread
+    core.executor.submit("take_screenshot", partial(pyautogui.screenshot, path), on_done=saved)
+
+@command("maximize window")
+def maximize_window(core):
+    pyautogui.hotkey('win', 'up')
+    core.voice.speak("Window maximized.")
+
+@command("minimize window")
+def minimize_window(core):
+    pyautogui.hotkey('win', 'down')
+    core.voice.speak("Window minimized.")
+
+@command("mute mic", main_thread=True)
+def mute_mic(core):
+    core.mic_muted = True
+    core.voice.speak("Microphone muted.")
+
+@command("unmute mic", allow_muted=True, main_thread=True)
+def unmute_mic(core):
+    core.mic_muted = False
+    core.voice.speak("Microphone online.")
+
+@command("battery status")
+def battery_status(core):
+    batt = core.telemetry.snapshot.battery
+    if batt is not None:
+        core.voice.speak(f"Battery is at {int(batt)} percent.")
+    else:
+        core.voice.speak("System is running on AC power.")
+
+@command("time")
+def tell_time(core):
+    now = datetime.datetime.now().strftime("%I:%M %p")
+    core.voice.speak(f"It is {now}.")
+
+@command("date")
+def tell_date(core):
+    today = datetime.datetime.now().strftime("%A, %B %d")
+    core.voice.speak(f"Today is {today}.")
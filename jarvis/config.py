@@ -11,6 +11,7 @@ class Config:
     WIDTH = 1280
     HEIGHT = 720
     FPS_LIMIT = 60
+    CAMERA_INDEX = 0
     
     # ===================== DYNAMIC PATHS =====================
     _CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -24,7 +25,9 @@ class Config:
     SCREENSHOT_DIR = os.path.join(DATA_DIR, "screenshots")
     FACES_DIR = os.path.join(ASSETS_DIR, "faces")
     
-    DB_FILE = os.path.join(DATA_DIR, "face_db.json")
+    DB_FILE = os.path.join(DATA_DIR, "face_db.json") # Legacy JSON DB, migrated on first start
+    FACE_STORE_FILE = os.path.join(DATA_DIR, "face_db.sqlite")
+    FACE_INDEX_FILE = os.path.join(DATA_DIR, "face_index.npz") # IVF index, rebuilt if stale
     LOG_FILE = os.path.join(LOGS_DIR, "jarvis.log")
     
     # ===================== COLORS (BGR) =====================
@@ -43,15 +46,45 @@ class Config:
     GLOW_STRENGTH = 15
     MATRIX_SPEED = 1
     MATRIX_OPACITY = 0.15 
+    MATRIX_COLUMNS = 64 # Rain columns across the frame, whatever the resolution
+    MATRIX_DENSITY = 1.0 # Share of columns carrying a drop (0..1)
     CINEMATIC_MODE = True
+    HUD_CACHE = True # Blend pre-rendered static HUD layers instead of redrawing them every frame
+    TEXT_CACHE = True # Stamp glow text from pre-rendered sprites
+    TEXT_CACHE_MAX_BYTES = 4 * 1024 * 1024 # LRU budget for cached text sprites
     
     # ===================== MOUSE CONTROL =====================
-    MOUSE_SMOOTHING = 5         
+    CURSOR_RATE = 120           # Hz the cursor thread moves the OS cursor at (≈ display refresh)
+    CURSOR_MIN_CUTOFF = 0.5     # One-Euro: smoothing of a still hand (Hz; lower = less jitter)
+    CURSOR_BETA = 0.01          # One-Euro: how fast smoothing relaxes with speed (higher = less lag)
+    CURSOR_PREDICT = 0.0        # Extra seconds extrapolated past "now" (e.g. to hide display latency)
+    CURSOR_PREDICT_MIN_SPEED = 250 # px/s below which the cursor is not extrapolated (still-hand jitter)
+    CURSOR_MAX_EXTRAPOLATE = 0.1 # Never extrapolate further than this past a sample
+    CURSOR_RESET_GAP = 0.5      # Seconds without samples after which the filter restarts
     FRAME_REDUCTION = 120       
     CLICK_THRESHOLD = 30        
     CLICK_COOLDOWN = 0.6
+    CLICK_LOOKBACK = 0.08       # Click where the cursor was this long before the pinch closed
     GESTURE_HAND = "RIGHT" # "RIGHT", "LEFT", "BOTH"
     
+    # ===================== HOTKEYS =====================
+    HOTKEYS_ENABLED = True      # Global keyboard hooks (off = no-op backend; always off when headless)
+    HOTKEYS = {                 # Key name -> built-in action or voice command text
+        "esc": "toggle_mouse",
+        "d": "toggle_debug",
+    }
+    HOTKEY_DEBOUNCE = 0.3       # Seconds between two firings of the same key
+    
+    # ===================== GESTURES =====================
+    MAX_HANDS = 2               # Hands tracked at once (two are needed for zoom)
+    GESTURES = ["fist", "pinch", "drag", "right_click", "scroll", "zoom"] # Enabled gesture vocabulary
+    GESTURE_CURL_ANGLE = 2.0    # Total bend (rad) over a finger's joints at which it counts as curled
+    GESTURE_RELEASE_RATIO = 1.3 # A pinch opens at this multiple of its closing distance (no chatter)
+    GESTURE_DRAG_HOLD = 0.25    # Seconds a pinch is held before the cursor drags with the button down
+    GESTURE_SCROLL_STEP = 0.15  # Two-finger travel (palm lengths) per scroll step
+    GESTURE_ZOOM_STEP = 0.15    # Relative change in two-hand distance per zoom step
+    GESTURE_SCROLL_CLICKS = 120 # pyautogui.scroll() amount per step (one wheel notch on Windows)
+    
     # ===================== SECURITY =====================
     FACE_MATCH_THRESHOLD = 0.85 
     REGISTRATION_FRAMES = 15    
@@ -59,6 +92,15 @@ class Config:
     MAX_SAMPLES_PER_USER = 5    
     ADMIN_USER = "Admin" # Default admin name
     LOCK_ON_UNKNOWN = True
+    FACE_REVERIFY_INTERVAL = 30 # Frames between FaceID checks on a settled face track
+    FACE_VOTE_WINDOW = 5        # Recent FaceID results kept per track
+    FACE_VOTE_MIN = 3           # Agreeing results needed to (re)assign an identity
+    FACE_CONF_MARGIN = 0.03     # Matches this close to the threshold are re-checked every frame
+    FACE_SIZE_DRIFT = 0.25      # Re-check when the face size changes by this fraction
+    FACE_TRACK_IOU = 0.3
+    FACE_TRACK_MAX_MISSES = 5   # Frames a face may vanish before its track is dropped
+    FACE_INDEX_MIN_SAMPLES = 5000 # Galleries this large are searched through the IVF index (0 = always exact scan)
+    FACE_INDEX_NPROBE = 8       # Buckets scanned per query; higher = closer to exact, slower
     
     # ===================== VOICE =====================
     WAKE_WORD = "jarvis"
@@ -68,10 +110,57 @@ class Config:
     MIC_ENERGY_THRESHOLD = 300
     MIC_DYNAMIC_ENERGY = True
     ONE_SHOT_COMMAND = True     
+    STT_BACKEND = "auto"        # "auto" (offline Vosk if installed, else Google), "vosk" or "google"
+    VOSK_MODEL_PATH = os.path.join(ASSETS_DIR, "models", "vosk-model-small-en-us-0.15")
+    STT_CHUNK_MS = 100          # Streaming: audio per recognizer step
+    STT_STABLE_PARTIALS = 2     # Streaming: unchanged partials before a closed command (no {slot} at the end) fires
+    VOICE_EMOTION_RATES = {"urgent": 20, "sad": -20} # Speech rate offsets per emotion
+    TTS_CACHE_DIR = os.path.join(DATA_DIR, "tts_cache")
+    TTS_CACHED_PHRASES = {      # Pre-rendered to WAV (text -> emotion) and played without synthesis
+        "Systems online. At your service, sir.": "neutral",
+        "Access denied. Please identify yourself.": "urgent",
+        "Object detection enabled.": "neutral",
+        "Vision module paused.": "neutral",
+        "Opening YouTube.": "neutral",
+        "Opening Google.": "neutral",
+        "Mouse control active.": "neutral",
+        "Mouse control paused.": "neutral",
+        "Screenshot saved.": "neutral",
+        "Window maximized.": "neutral",
+        "Window minimized.": "neutral",
+        "Microphone muted.": "neutral",
+        "Microphone online.": "neutral",
+        "Yes sir?": "neutral",
+    }
+    COMMAND_PLUGINS = []        # Extra modules with @command handlers (e.g. ["my_pack.commands"])
+    COMMAND_WORKERS = 4         # Threads running command handlers off the frame loop
+    COMMAND_LIMIT = 1           # Default runs of one command in flight at once
+    COMMAND_TIMEOUT = 10.0      # Default seconds before a running command is reported as stuck and its slot freed
     
     # ===================== VISION =====================
     YOLO_MODEL = "yolov8n.pt" 
+    VISION_BACKEND = "torch"    # "torch", "onnxruntime", "openvino" (exports cached next to YOLO_MODEL)
+    VISION_PRECISION = "fp32"   # "fp32", "fp16", "int8" (non-torch backends only)
     YOLO_CONF_THRESHOLD = 0.5
+    YOLO_CLASSES = []           # Label allowlist, e.g. ["person", "cell phone"]; empty = all
+    YOLO_MIN_AREA = 0           # Ignore boxes smaller than this (px^2)
+    YOLO_IMGSZ = 640            # Detector input size; 320/416 are much faster on CPU
+    VISION_ROIS = []            # Only detect inside these (x, y, w, h) frame regions; empty = full frame
+    YOLO_ASYNC = True           # Background inference; detect() returns the latest result
+    YOLO_DETECT_INTERVAL = 3    # Run YOLO every N frames, track boxes in between
+    YOLO_ADAPTIVE_INTERVAL = True
+    YOLO_MAX_INTERVAL = 10      # Adaptive: longest gap between YOLO runs on a still scene
+    YOLO_MOTION_THRESHOLD = 4.0 # Adaptive: mean grey-level change that counts as motion
+    TRACK_IOU_THRESHOLD = 0.3
+    TRACK_MAX_MISSES = 2        # Detector runs a track may go unmatched before it is dropped
+    
+    # ===================== PERFORMANCE =====================
+    PIPELINE_MODE = True        # Threaded capture -> inference -> render stages
+    PERF_WINDOW = 300           # Samples per stage for rolling p50/p95/p99
+    PERF_DUMP_ON_EXIT = True    # Write stage timings to data/logs as JSON + CSV
+    TELEMETRY_INTERVAL = 0.5    # Seconds between CPU/RAM/battery samples (background thread)
+    TELEMETRY_HISTORY = 60      # Samples kept for the HUD sparklines
+    TELEMETRY_BATTERY_EVERY = 10 # Query the battery only every N samples (slow on some platforms)
     
     @staticmethod
     def setup_directories():
@@ -0,0 +1,208 @@
+import math
+import queue
+import threading
+import time
+from collections import deque
+from functools import partial
+import pyautogui
+from .config import Config
+
+class OneEuroFilter:
+    """
+    One-Euro filter over a 2D point (Casiez et al., CHI 2012): a low-pass
+    whose cutoff rises with speed, so a still hand is smoothed hard while
+    fast moves get little lag. Also tracks the filtered velocity.
+    """
+    def __init__(self, min_cutoff=Config.CURSOR_MIN_CUTOFF, beta=Config.CURSOR_BETA, d_cutoff=4.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+        
+    def reset(self):
+        self.t = None
+        self.x = self.y = 0.0
+        self.vx = self.vy = 0.0
+        
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+        
+    def __call__(self, t, x, y):
+        """Filters the sample (x, y) taken at time t (seconds); returns the filtered point."""
+        if self.t is None or t - self.t > Config.CURSOR_RESET_GAP:
+            self.t, self.x, self.y, self.vx, self.vy = t, x, y, 0.0, 0.0
+            return self.x, self.y
+        dt = t - self.t
+        if dt <= 0:
+            return self.x, self.y
+            
+        a = self._alpha(self.d_cutoff, dt)
+        self.vx += a * ((x - self.x) / dt - self.vx)
+        self.vy += a * ((y - self.y) / dt - self.vy)
+        
+        a = self._alpha(self.min_cutoff + self.beta * math.hypot(self.vx, self.vy), dt)
+        self.x += a * (x - self.x)
+        self.y += a * (y - self.y)
+        self.t = t
+        return self.x, self.y
+
+class CursorOutput:
+    """
+    Drives the OS cursor from its own thread at CURSOR_RATE Hz.
+    The frame loop push()es timestamped hand positions; they are One-Euro
+    filtered and the thread extrapolates the filtered motion to "now" plus
+    CURSOR_PREDICT seconds, so the cursor keeps gliding between camera
+    frames and frame-loop hiccups instead of stepping at camera rate and
+    trailing by the hand tracker's latency. Below CURSOR_PREDICT_MIN_SPEED
+    nothing is extrapolated, so a still hand's noise is not amplified.
+    Clicks and presses are timestamped: they land where the filtered cursor
+    was CLICK_LOOKBACK seconds before the pinch closed, so the pinch itself
+    doesn't drag the click point. Button, scroll and zoom actions run on the
+    output thread in order with the moves.
+    """
+    def __init__(self, screen_size, dry_run=False, rate=Config.CURSOR_RATE):
+        self.screen_w, self.screen_h = screen_size
+        self.dry_run = dry_run
+        self.period = 1.0 / rate
+        self.filter = OneEuroFilter()
+        self._state = None              # (t, x, y, vx, vy) latest filtered sample, replaced atomically
+        self._trail = deque(maxlen=64)  # (t, x, y) filtered history for timestamped clicks
+        self._ops = queue.SimpleQueue() # pyautogui calls for the output thread
+        self._pinned = None             # (x, y) the cursor is held at (pressed button, scroll, zoom)
+        self._stop = threading.Event()
+        self._thread = None
+        
+    def start(self):
+        if not self.dry_run and self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="jarvis-cursor", daemon=True)
+            self._thread.start()
+        return self
+        
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            
+    def push(self, t, x, y):
+        """Adds a raw screen-space sample taken at time t; returns the filtered position."""
+        fx, fy = self.filter(t, x, y)
+        self._trail.append((t, fx, fy))
+        self._state = (t, fx, fy, self.filter.vx, self.filter.vy)
+        return fx, fy
+        
+    def hold(self):
+        """Stops moving the cursor (fist, pause) and forgets the motion."""
+        self._state = None
+        self._pinned = None
+        self._trail.clear()
+        self.filter.reset()
+        
+    def position_at(self, t):
+        """Filtered position at (or just before) time t."""
+        best = None
+        for ts, x, y in reversed(self._trail):
+            best = (x, y)
+            if ts <= t:
+                break
+        return best
+        
+    def predicted(self, now):
+        """Where the cursor should be at `now`, or None while holding."""
+        if self._pinned is not None:
+            return self._pinned
+        state = self._state
+        if state is None:
+            return None
+        t, x, y, vx, vy = state
+        v0 = Config.CURSOR_PREDICT_MIN_SPEED
+        gain = min(max(math.hypot(vx, vy) / v0 - 1, 0.0), 1.0) if v0 else 1.0 # ramps to 1 at 2 * v0
+        horizon = gain * min(now - t + Config.CURSOR_PREDICT, Config.CURSOR_MAX_EXTRAPOLATE)
+        return (min(max(x + vx * horizon, 0), self.screen_w - 1),
+                min(max(y + vy * horizon, 0), self.screen_h - 1))
+                
+    def current(self):
+        """Filtered (or pinned) cursor position, or None while holding."""
+        if self._pinned is not None:
+            return self._pinned
+        state = self._state
+        return (state[1], state[2]) if state is not None else None
+        
+    def click(self, t, button="left"):
+        """Queues a click for a pinch detected in the sample taken at time t."""
+        pos = self.position_at(t - Config.CLICK_LOOKBACK)
+        if pos is not None:
+            self._queue(pyautogui.click, int(pos[0]), int(pos[1]), button=button)
+            
+    def press(self, t, button="left"):
+        """
+        Button down for a pinch at time t; the cursor stays pinned there until unpin() or release().
+        Returns False (nothing queued) when there is no cursor position yet, e.g. right after hold().
+        """
+        pos = self.position_at(t - Config.CLICK_LOOKBACK)
+        if pos is None:
+            return False
+        self._pinned = pos
+        self._queue(pyautogui.mouseDown, int(pos[0]), int(pos[1]), button=button)
+        return True
+        
+    def release(self, button="left"):
+        self._queue(pyautogui.mouseUp, button=button)
+        self._pinned = None
+        
+    def pin(self):
+        """Freezes the cursor where it is (e.g. while scrolling)."""
+        if self._pinned is None:
+            self._pinned = self.current()
+            
+    def unpin(self):
+        self._pinned = None
+        
+    def scroll(self, clicks):
+        self._queue(pyautogui.scroll, clicks)
+        
+    def zoom(self, clicks):
+        self._queue(self._ctrl_scroll, clicks)
+        
+    @staticmethod
+    def _ctrl_scroll(clicks, _pause=False):
+        pyautogui.keyDown('ctrl', _pause=_pause)
+        try:
+            pyautogui.scroll(clicks, _pause=_pause)
+        finally:
+            pyautogui.keyUp('ctrl', _pause=_pause)
+            
+    def _queue(self, fn, *args, **kwargs):
+        if not self.dry_run:
+            self._ops.put(partial(fn, *args, _pause=False, **kwargs))
+            
+    def _loop(self):
+        last = None
+        next_tick = time.perf_counter()
+        while not self._stop.is_set():
+            try:
+                while True:
+                    self._ops.get_nowait()()
+                    last = None # the action may have moved the cursor
+            except queue.Empty:
+                pass
+            except pyautogui.FailSafeException:
+                pass
+                
+            pos = self.predicted(time.perf_counter())
+            if pos is not None:
+                pos = (int(pos[0]), int(pos[1]))
+                if pos != last:
+                    try:
+                        pyautogui.moveTo(*pos, _pause=False)
+                        last = pos
+                    except pyautogui.FailSafeException:
+                        pass
+                        
+            next_tick += self.period
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                self._stop.wait(delay)
+            else:
+                next_tick = time.perf_counter() # fell behind; don't try to catch up
@@ -0,0 +1,95 @@
+import time
+import numpy as np
+from collections import namedtuple
+
+Detection = namedtuple("Detection", ["bbox", "label", "conf", "track_id", "cls"])
+
+class Detections:
+    """
+    Struct-of-arrays detection set shared by VisionSystem, the tracker and the HUD.
+    boxes (N,4) float32 xyxy, conf (N,) float32, cls (N,) int32, track_ids (N,) int64
+    (-1 = untracked). names maps class id -> label.
+
+    Tags: frame_index / captured_at identify the frame the set belongs to;
+    detected_index / detected_at the frame the last YOLO run actually saw.
+    """
+    def __init__(self, boxes=None, conf=None, cls=None, track_ids=None, names=None,
+                 frame_index=None, captured_at=None, detected_index=None, detected_at=None):
+        self.boxes = np.zeros((0, 4), np.float32) if boxes is None else np.asarray(boxes, np.float32).reshape(-1, 4)
+        n = len(self.boxes)
+        self.conf = np.zeros(n, np.float32) if conf is None else np.asarray(conf, np.float32).reshape(-1)
+        self.cls = np.zeros(n, np.int32) if cls is None else np.asarray(cls, np.int32).reshape(-1)
+        self.track_ids = np.full(n, -1, np.int64) if track_ids is None else np.asarray(track_ids, np.int64).reshape(-1)
+        self.names = names if names is not None else {}
+
+        self.frame_index = frame_index
+        self.captured_at = captured_at
+        self.detected_index = detected_index if detected_index is not None else frame_index
+        self.detected_at = detected_at if detected_at is not None else captured_at
+
+    @classmethod
+    def from_ultralytics(cls, results, names, frame_index=None, captured_at=None):
+        """
+        Builds the set from ultralytics Results with one device-to-host copy per
+        result: boxes.data is (N,6) [x1, y1, x2, y2, conf, cls].
+        """
+        data = [r.boxes.data.cpu().numpy() for r in results if r.boxes is not None]
+        data = np.concatenate(data) if data else np.zeros((0, 6), np.float32)
+        return cls(data[:, :4], data[:, 4], data[:, 5], names=names,
+                   frame_index=frame_index, captured_at=captured_at)
+
+    @classmethod
+    def concat(cls, parts, names=None, frame_index=None, captured_at=None):
+        """Joins several sets (e.g. one per ROI) into one."""
+        if not parts:
+            return cls(names=names, frame_index=frame_index, captured_at=captured_at)
+        return cls(np.concatenate([p.boxes for p in parts]), np.concatenate([p.conf for p in parts]),
+                   np.concatenate([p.cls for p in parts]), np.concatenate([p.track_ids for p in parts]),
+                   names if names is not None else parts[0].names, frame_index, captured_at)
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def __bool__(self):
+        return len(self.boxes) > 0
+
+    def __iter__(self):
+        """Yields Detection tuples with integer pixel boxes, for drawing."""
+        ibox = self.boxes.astype(np.int32).tolist()
+        for bbox, conf, c, tid in zip(ibox, self.conf.tolist(), self.cls.tolist(), self.track_ids.tolist()):
+            yield Detection(tuple(bbox), self.names.get(c, str(c)), conf, tid if tid >= 0 else None, c)
+
+    @property
+    def labels(self):
+        return [self.names.get(c, str(c)) for c in self.cls.tolist()]
+
+    @property
+    def areas(self):
+        return (self.boxes[:, 2] - self.boxes[:, 0]) * (self.boxes[:, 3] - self.boxes[:, 1])
+
+    def select(self, mask):
+        """Subset by boolean mask or index array; tags are kept."""
+        return Detections(self.boxes[mask], self.conf[mask], self.cls[mask], self.track_ids[mask], self.names,
+                          self.frame_index, self.captured_at, self.detected_index, self.detected_at)
+
+    def filter(self, classes=None, min_area=None, min_conf=None):
+        """
+        Vectorized filtering.
+        classes: iterable of allowed labels or class ids; min_area in px^2.
+        """
+        keep = np.ones(len(self), dtype=bool)
+        if classes:
+            ids = [c for c in classes if isinstance(c, int)]
+            ids += [i for i, n in self.names.items() if n in classes]
+            keep &= np.isin(self.cls, ids)
+        if min_area:
+            keep &= self.areas >= min_area
+        if min_conf:
+            keep &= self.conf >= min_conf
+        return self if keep.all() else self.select(keep)
+
+    def age(self, now=None):
+        """Seconds since the frame behind these detections was captured."""
+        if self.detected_at is None:
+            return 0.0
+        return (now if now is not None else time.perf_counter()) - self.detected_at
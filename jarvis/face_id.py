@@ -1,126 +1,252 @@
-import json
 import numpy as np
-import os
 from .config import Config
+from .face_store import FaceStore
+from .face_index import FaceIndex
 
 class FaceID:
     """
     Biometric System 2.6 (Premium)
     Adds Admin checks and Security Locking.
+    Matching runs against a pre-normalized (samples, dim) gallery matrix, so
+    all visible faces are scored against all samples in one matrix multiply.
+    Samples persist through FaceStore (SQLite, written off the render thread).
+    Galleries of FACE_INDEX_MIN_SAMPLES or more are searched through an IVF
+    index (FaceIndex) instead of the full matrix.
     """
+    # Mesh indices: left eye, right eye, nose tip, mouth left, mouth right, chin
+    KEYPOINTS = [33, 263, 1, 61, 291, 152]
+    # Distance pairs over KEYPOINTS; every distance is divided by the eye distance
+    PAIRS_A = [0, 1, 0, 1, 2, 3, 0, 1, 2, 2, 3, 4]
+    PAIRS_B = [2, 2, 3, 4, 5, 4, 5, 5, 3, 4, 5, 5]
+    
     def __init__(self):
+        self.store = FaceStore()
         self.db = {}
+        self._names = []            # label index -> name
+        self._name_ids = {}         # name -> label index
+        self._gallery = np.zeros((16, 12), dtype=np.float32) # row capacity grows by doubling
+        self._labels = np.zeros(16, dtype=np.int32)
+        self._ids = np.zeros(16, dtype=np.int64) # stable sample ids for the index
+        self._next_id = 0
+        self._count = 0
+        self._index = None          # built/loaded lazily on first large lookup
         self.load_db()
         
     def load_db(self):
-        if os.path.exists(Config.DB_FILE):
-            try:
-                with open(Config.DB_FILE, 'r') as f:
-                    self.db = json.load(f)
-            except Exception as e:
-                print(f"[FACE_ID] Error loading DB: {e}")
-                self.db = {}
-        else:
-            self.db = {}
-            
-    def save_db(self):
         try:
-            with open(Config.DB_FILE, 'w') as f:
-                json.dump(self.db, f, indent=4)
+            self.db = self.store.load()
         except Exception as e:
-            print(f"[FACE_ID] Error saving DB: {e}")
-
-    def get_embedding(self, landmarks):
-        lms = np.array(landmarks)
-        try:
-            left_eye = lms[33]
-            right_eye = lms[263]
-            nose_tip = lms[1]
-            mouth_left = lms[61]
-            mouth_right = lms[291]
-            chin = lms[152]
-        except IndexError:
-            return None 
+            print(f"[FACE_ID] Error loading DB: {e}")
+            self.db = {}
+        self._rebuild_gallery()
+        
+    def _rebuild_gallery(self):
+        self._names = list(self.db)
+        self._name_ids = {name: i for i, name in enumerate(self._names)}
+        rows = [vec for name in self._names for vec in self.db[name]]
+        labels = [self._name_ids[name] for name in self._names for _ in self.db[name]]
+        
+        self._count = len(rows)
+        capacity = max(16, self._count)
+        self._gallery = np.zeros((capacity, 12), dtype=np.float32)
+        self._labels = np.zeros(capacity, dtype=np.int32)
+        self._ids = np.arange(capacity, dtype=np.int64)
+        self._next_id = self._count
+        self._index = None
+        if rows:
+            gallery = np.asarray(rows, dtype=np.float32)
+            gallery /= np.maximum(np.linalg.norm(gallery, axis=1, keepdims=True), 1e-9)
+            self._gallery[:self._count] = gallery
+            self._labels[:self._count] = labels
             
-        base_dist = np.linalg.norm(left_eye - right_eye)
-        if base_dist < 1e-6: return None
+    def _append_sample(self, name, vec):
+        vec = np.asarray(vec, dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        if norm < 1e-9: return
         
-        def dist_ratio(p1, p2):
-            return np.linalg.norm(p1 - p2) / base_dist
+        if name not in self._name_ids:
+            self._name_ids[name] = len(self._names)
+            self._names.append(name)
             
-        vector = [
-            dist_ratio(left_eye, nose_tip),
-            dist_ratio(right_eye, nose_tip),
-            dist_ratio(left_eye, mouth_left),
-            dist_ratio(right_eye, mouth_right),
-            dist_ratio(nose_tip, chin),
-            dist_ratio(mouth_left, mouth_right),
-            dist_ratio(left_eye, chin),
-            dist_ratio(right_eye, chin),
-            dist_ratio(nose_tip, mouth_left),
-            dist_ratio(nose_tip, mouth_right),
-            dist_ratio(mouth_left, chin),
-            dist_ratio(mouth_right, chin)
-        ]
-        return vector
-
-    def register_face(self, name, landmarks_buffer):
-        embeddings = []
-        for lms in landmarks_buffer:
-            emb = self.get_embedding(lms)
-            if emb:
-                embeddings.append(emb)
+        if self._count == len(self._gallery):
+            self._gallery = np.concatenate([self._gallery, np.zeros_like(self._gallery)])
+            self._labels = np.concatenate([self._labels, np.zeros_like(self._labels)])
+            self._ids = np.concatenate([self._ids, np.zeros_like(self._ids)])
+        self._gallery[self._count] = vec / norm
+        self._labels[self._count] = self._name_ids[name]
+        self._ids[self._count] = self._next_id
+        if self._index is not None:
+            self._index.add(self._gallery[self._count], self._name_ids[name], self._next_id)
+        self._next_id += 1
+        self._count += 1
+        
+    def _remove_oldest_sample(self, name):
+        """Drops the first (oldest) gallery row of `name`, keeping row order."""
+        rows = np.flatnonzero(self._labels[:self._count] == self._name_ids[name])
+        if not len(rows): return
+        i, n = rows[0], self._count
+        if self._index is not None:
+            self._index.remove(int(self._ids[i]))
+        self._gallery[i:n-1] = self._gallery[i+1:n]
+        self._labels[i:n-1] = self._labels[i+1:n]
+        self._ids[i:n-1] = self._ids[i+1:n]
+        self._count -= 1
+        
+    def _get_index(self):
+        """
+        The IVF index for large galleries, or None for an exact scan.
+        First use reuses the centroids saved in FACE_INDEX_FILE (only the cheap
+        bucket assignment runs); k-means is retrained when there is no usable
+        file or the gallery size drifted far from the trained size.
+        """
+        if Config.FACE_INDEX_MIN_SAMPLES <= 0 or self._count < Config.FACE_INDEX_MIN_SAMPLES:
+            return None
+        if self._index is not None and not self._index.needs_retrain(self._count):
+            return self._index
+            
+        gallery = self._gallery[:self._count]
+        labels = self._labels[:self._count]
+        ids = self._ids[:self._count]
+        index = FaceIndex(Config.FACE_INDEX_NPROBE)
+        saved = None
+        if self._index is None:
+            try:
+                saved = FaceIndex.load(Config.FACE_INDEX_FILE)
+            except Exception as e:
+                print(f"[FACE_ID] Error loading index: {e}")
+                
+        if saved is not None and saved["centroids"].shape[1:] == gallery.shape[1:]:
+            index.build(gallery, labels, ids, saved["centroids"], int(saved["trained_size"]))
+        if not len(index.centroids) or index.needs_retrain(self._count):
+            print(f"[FACE_ID] Building search index over {self._count} samples...")
+            index.build(gallery, labels, ids)
+        self._index = index
+        return index
+        
+    def save_db(self):
+        """Waits until all queued enrollments are committed to disk."""
+        self.store.flush()
         
-        if not embeddings:
+    def close(self):
+        if self._index is not None and self._index.dirty:
+            try:
+                self._index.save(Config.FACE_INDEX_FILE)
+            except Exception as e:
+                print(f"[FACE_ID] Error saving index: {e}")
+        self.store.close()
+        
+    def get_embeddings(self, landmarks):
+        """
+        Vectorized embeddings for a stack of faces.
+        landmarks: (frames, N, 2+) pixel-space array (or list of (N, 2) arrays).
+        Returns ((frames, 12) float32 embeddings, (frames,) validity mask).
+        """
+        lms = np.asarray(landmarks, dtype=np.float32)
+        if lms.ndim != 3 or lms.shape[1] <= max(self.KEYPOINTS):
+            return np.zeros((len(lms), 12), dtype=np.float32), np.zeros(len(lms), dtype=bool)
+            
+        pts = lms[:, self.KEYPOINTS, :2]
+        base_dist = np.linalg.norm(pts[:, 0] - pts[:, 1], axis=1)
+        valid = base_dist >= 1e-6
+        
+        dists = np.linalg.norm(pts[:, self.PAIRS_A] - pts[:, self.PAIRS_B], axis=2)
+        return dists / np.where(valid, base_dist, 1.0)[:, None], valid
+        
+    def get_embedding(self, landmarks):
+        """Embedding of one face ((N, 2) landmarks) or None if it is unusable."""
+        lms = np.asarray(landmarks, dtype=np.float32)
+        embs, valid = self.get_embeddings(lms[None])
+        return embs[0] if valid[0] else None
+        
+    def register_face(self, name, landmarks_buffer):
+        """
+        landmarks_buffer: per-frame (N, 2) landmark arrays, or one stacked
+        (frames, N, 2) array; all frames are embedded in one pass.
+        """
+        embeddings, valid = self.get_embeddings(landmarks_buffer)
+        if not valid.any():
             return False
             
-        avg_embedding = np.mean(embeddings, axis=0).tolist()
+        avg_embedding = embeddings[valid].mean(axis=0).astype(np.float32)
         
         if name not in self.db:
             self.db[name] = []
             
         self.db[name].append(avg_embedding)
+        self._append_sample(name, avg_embedding)
         
         if len(self.db[name]) > Config.MAX_SAMPLES_PER_USER:
             self.db[name].pop(0) 
+            self._remove_oldest_sample(name)
             
-        self.save_db()
+        self.store.add_sample(name, avg_embedding, Config.MAX_SAMPLES_PER_USER)
         return True
-
+        
     def identify(self, landmarks):
         """
         Identifies a face.
         Returns (Name, Confidence_Score)
         """
-        if not self.db:
-            return "UNKNOWN", 0.0
+        return self.identify_batch([landmarks])[0]
+        
+    def identify_batch(self, landmarks_list, k=1):
+        """
+        Identifies several faces at once.
+        With k=1 returns [(Name, Confidence_Score)] per face, thresholded like identify().
+        With k>1 returns, per face, the k best distinct names as [(Name, Score), ...]
+        without thresholding.
+        """
+        results = [[("UNKNOWN", 0.0)] if k > 1 else ("UNKNOWN", 0.0) for _ in landmarks_list]
+        if self._count == 0:
+            return results
             
-        current_vec = self.get_embedding(landmarks)
-        if current_vec is None:
-            return "UNKNOWN", 0.0
+        embeddings, valid = self.get_embeddings(landmarks_list)
+        rows = np.flatnonzero(valid)
+        if not len(rows):
+            return results
             
-        current_vec = np.array(current_vec)
-        norm_curr = np.linalg.norm(current_vec)
+        queries = embeddings[valid]
+        queries /= np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-9)
+        index = self._get_index()
+        if index is not None:
+            candidates = [index.search(q) for q in queries]
+            # Every probed bucket can be empty (emptied by enrollments rotating out
+            # old samples); those faces fall back to the exact scan
+            for i, (face_scores, _) in enumerate(candidates):
+                if not len(face_scores):
+                    candidates[i] = (self._gallery[:self._count] @ queries[i], self._labels[:self._count])
+        else:
+            labels = self._labels[:self._count]
+            scores = queries @ self._gallery[:self._count].T # (faces, samples) cosine similarity
+            candidates = [(face_scores, labels) for face_scores in scores]
+            
+        for row, (face_scores, labels) in zip(rows, candidates):
+            matches = self._top_names(face_scores, labels, k)
+            if k > 1:
+                results[row] = matches or results[row]
+            elif matches:
+                name, score = matches[0]
+                if score > Config.FACE_MATCH_THRESHOLD:
+                    results[row] = (name, score)
+        return results
         
-        best_match = "UNKNOWN"
-        best_score = -1.0
+    def _top_names(self, scores, labels, k):
+        """k best distinct names for one row of sample scores ([] if there are none)."""
+        if not len(scores):
+            return []
+        # Every name owns at most MAX_SAMPLES_PER_USER rows, so this many candidates hold k names
+        m = min(len(scores), k * Config.MAX_SAMPLES_PER_USER)
+        cand = np.argpartition(-scores, m - 1)[:m] if m < len(scores) else np.arange(len(scores))
+        cand = cand[np.argsort(-scores[cand])]
         
-        for name, samples in self.db.items():
-            for stored_vec in samples:
-                stored_vec = np.array(stored_vec)
-                norm_stored = np.linalg.norm(stored_vec)
-                
-                dot_product = np.dot(current_vec, stored_vec)
-                similarity = dot_product / (norm_curr * norm_stored)
-                
-                if similarity > best_score:
-                    best_score = similarity
-                    best_match = name
-                
-        if best_score > Config.FACE_MATCH_THRESHOLD:
-            return best_match, best_score
-            
-        return "UNKNOWN", 0.0
+        matches, seen = [], set()
+        for idx in cand:
+            name = self._names[labels[idx]]
+            if name not in seen:
+                seen.add(name)
+                matches.append((name, float(scores[idx])))
+                if len(matches) == k: break
+        return matches
         
     def is_admin(self, name):
         return name.lower() == Config.ADMIN_USER.lower()
@@ -0,0 +1,121 @@
+import os
+import numpy as np
+
+class FaceIndex:
+    """
+    IVF (inverted file) index over unit-length face embeddings.
+    Spherical k-means splits the gallery into ~sqrt(n) buckets and a query only
+    scores the `nprobe` buckets whose centroids are closest, so lookup cost grows
+    with sqrt(n) instead of n.
+    Candidate scores are exact dot products: whenever the best sample lies in a
+    probed bucket the result (name and confidence) is identical to the linear
+    scan. It can only miss when the best sample sits in an unprobed bucket; see
+    benchmarks/face_index_bench.py for the measured agreement.
+    """
+    KMEANS_ITERS = 12
+    TRAIN_ROWS_PER_LIST = 64 # k-means is trained on a sample of this many rows per bucket
+    
+    def __init__(self, nprobe=8):
+        self.nprobe = nprobe
+        self.centroids = np.zeros((0, 12), dtype=np.float32)
+        self.trained_size = 0
+        self.dirty = False
+        self._vecs = []   # per bucket: (m, dim) unit vectors
+        self._labels = [] # per bucket: (m,) label indices
+        self._ids = []    # per bucket: (m,) sample ids
+        self._where = {}  # sample id -> bucket
+        
+    def __len__(self):
+        return len(self._where)
+        
+    def build(self, vecs, labels, ids, centroids=None, trained_size=None):
+        """
+        (Re)builds all buckets. Without `centroids` k-means is trained first
+        (and the index is marked dirty so close() persists the new centroids).
+        """
+        vecs = np.asarray(vecs, dtype=np.float32)
+        self.dirty = centroids is None
+        if centroids is None:
+            centroids = self._train(vecs)
+        self.trained_size = len(vecs) if trained_size is None else trained_size
+        self.centroids = np.ascontiguousarray(centroids, dtype=np.float32)
+        assign = self._assign(vecs)
+        
+        order = np.argsort(assign, kind="stable")
+        bounds = np.searchsorted(assign[order], np.arange(len(self.centroids) + 1))
+        self._vecs, self._labels, self._ids = [], [], []
+        for b in range(len(self.centroids)):
+            rows = order[bounds[b]:bounds[b + 1]]
+            self._vecs.append(vecs[rows])
+            self._labels.append(np.asarray(labels, dtype=np.int32)[rows])
+            self._ids.append(np.asarray(ids, dtype=np.int64)[rows])
+        self._where = dict(zip(np.asarray(ids).tolist(), assign.tolist()))
+        
+    def _train(self, vecs):
+        n = len(vecs)
+        nlist = max(1, int(round(np.sqrt(n))))
+        rng = np.random.default_rng(0)
+        sample = vecs[rng.choice(n, min(n, nlist * self.TRAIN_ROWS_PER_LIST), replace=False)]
+        centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+        
+        for _ in range(self.KMEANS_ITERS):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, sample)
+            counts = np.bincount(assign, minlength=nlist)
+            empty = counts == 0
+            sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))] # re-seed empty buckets
+            centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-9)
+        return centroids.astype(np.float32)
+        
+    def _assign(self, vecs, chunk=8192):
+        assign = np.empty(len(vecs), dtype=np.int64)
+        for s in range(0, len(vecs), chunk):
+            assign[s:s + chunk] = np.argmax(vecs[s:s + chunk] @ self.centroids.T, axis=1)
+        return assign
+        
+    def needs_retrain(self, size):
+        """Buckets drift out of balance once the gallery grows/shrinks a lot since training."""
+        return not len(self.centroids) or size > 4 * self.trained_size or 4 * size < self.trained_size
+        
+    def add(self, vec, label, sample_id):
+        b = int(np.argmax(self.centroids @ vec))
+        self._vecs[b] = np.concatenate([self._vecs[b], vec[None].astype(np.float32)])
+        self._labels[b] = np.append(self._labels[b], np.int32(label))
+        self._ids[b] = np.append(self._ids[b], np.int64(sample_id))
+        self._where[sample_id] = b
+        
+    def remove(self, sample_id):
+        b = self._where.pop(sample_id, None)
+        if b is None: return
+        keep = self._ids[b] != sample_id
+        self._vecs[b] = self._vecs[b][keep]
+        self._labels[b] = self._labels[b][keep]
+        self._ids[b] = self._ids[b][keep]
+        
+    def search(self, query):
+        """
+        Scores one unit-length query against the probed buckets.
+        Returns (scores, labels) of all candidates, unsorted.
+        """
+        cscores = self.centroids @ query
+        nprobe = min(self.nprobe, len(cscores))
+        probe = np.argpartition(-cscores, nprobe - 1)[:nprobe] if nprobe < len(cscores) else range(len(cscores))
+        vecs = np.concatenate([self._vecs[b] for b in probe])
+        labels = np.concatenate([self._labels[b] for b in probe])
+        return vecs @ query, labels
+        
+    def save(self, path):
+        """Writes the trained centroids; bucket contents are re-assigned on load."""
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, centroids=self.centroids, trained_size=self.trained_size)
+        os.replace(tmp, path)
+        self.dirty = False
+        
+    @staticmethod
+    def load(path):
+        """Returns the saved arrays as a dict (or None if there is no usable file)."""
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            return {key: data[key] for key in data.files}
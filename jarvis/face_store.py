@@ -0,0 +1,109 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import closing
+import numpy as np
+from .config import Config
+
+class FaceStore:
+    """
+    Compact, crash-safe storage for face embeddings.
+    One SQLite row per sample with the vector as a float32 BLOB; a small
+    `manifest` table records schema version and embedding size. Every change
+    is a single transaction (WAL journal), and all writes happen on a
+    background thread so enrollment never stalls the camera loop.
+    """
+    SCHEMA_VERSION = 1
+    
+    def __init__(self, path=Config.FACE_STORE_FILE, legacy_json=Config.DB_FILE):
+        self.path = path
+        self.legacy_json = legacy_json
+        self._queue = queue.Queue()
+        self._writer = None
+        
+        with closing(self._connect()) as conn, conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS manifest (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute("CREATE TABLE IF NOT EXISTS samples ("
+                         "id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, vec BLOB NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS samples_name ON samples (name, id)")
+            conn.execute("INSERT OR IGNORE INTO manifest VALUES ('schema_version', ?)", (str(self.SCHEMA_VERSION),))
+        self._migrate_json()
+        
+    def _connect(self):
+        """New connection; callers close it (closing() or the writer's finally)."""
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+        
+    def _migrate_json(self):
+        """One-time import of the legacy face_db.json (kept as .migrated backup)."""
+        if not os.path.exists(self.legacy_json):
+            return
+        try:
+            with open(self.legacy_json, 'r') as f:
+                db = json.load(f)
+            rows = [(name, np.asarray(vec, dtype=np.float32).tobytes())
+                    for name, samples in db.items() for vec in samples]
+            with closing(self._connect()) as conn, conn:
+                if conn.execute("SELECT COUNT(*) FROM samples").fetchone()[0] == 0:
+                    conn.executemany("INSERT INTO samples (name, vec) VALUES (?, ?)", rows)
+                    self._set_dim(conn, rows)
+            os.replace(self.legacy_json, self.legacy_json + ".migrated")
+            print(f"[FACE_ID] Migrated {len(rows)} samples from {os.path.basename(self.legacy_json)}")
+        except Exception as e:
+            print(f"[FACE_ID] Error migrating JSON DB: {e}")
+            
+    def _set_dim(self, conn, rows):
+        if rows:
+            dim = len(rows[0][1]) // 4
+            conn.execute("INSERT OR REPLACE INTO manifest VALUES ('dim', ?)", (str(dim),))
+            
+    def load(self):
+        """Returns {name: [float32 vector, ...]} with samples oldest first."""
+        db = {}
+        with closing(self._connect()) as conn:
+            for name, blob in conn.execute("SELECT name, vec FROM samples ORDER BY id"):
+                db.setdefault(name, []).append(np.frombuffer(blob, dtype=np.float32))
+        return db
+        
+    def add_sample(self, name, vec, max_samples=Config.MAX_SAMPLES_PER_USER):
+        """Queues a sample; the user's oldest samples beyond max_samples are pruned in the same commit."""
+        self._queue.put((name, np.asarray(vec, dtype=np.float32).tobytes(), max_samples))
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._write_loop, name="jarvis-facestore", daemon=True)
+            self._writer.start()
+            
+    def _write_loop(self):
+        conn = self._connect()
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    self._queue.task_done()
+                    break
+                name, blob, max_samples = item
+                try:
+                    with conn:
+                        conn.execute("INSERT INTO samples (name, vec) VALUES (?, ?)", (name, blob))
+                        conn.execute("DELETE FROM samples WHERE name = ? AND id NOT IN "
+                                     "(SELECT id FROM samples WHERE name = ? ORDER BY id DESC LIMIT ?)",
+                                     (name, name, max_samples))
+                        self._set_dim(conn, [(name, blob)])
+                except Exception as e:
+                    print(f"[FACE_ID] Error saving DB: {e}")
+                finally:
+                    self._queue.task_done()
+        finally:
+            conn.close()
+            
+    def flush(self):
+        """Blocks until every queued write is committed."""
+        self._queue.join()
+        
+    def close(self):
+        if self._writer is not None and self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join(timeout=5)
@@ -0,0 +1,106 @@
+from collections import deque, Counter
+from .config import Config
+
+class FaceTrack:
+    """
+    One face followed across frames, with a cached identity decision.
+    Identity comes from a majority vote over the last FACE_VOTE_WINDOW
+    verifications, so one bad frame cannot flip it.
+    """
+    def __init__(self, track_id, bbox, frame_idx):
+        self.id = track_id
+        self.bbox = bbox
+        self.misses = 0
+        self.votes = deque(maxlen=Config.FACE_VOTE_WINDOW)
+        self.name = "UNKNOWN"
+        self.conf = 0.0
+        self.confirmed = False
+        self.last_verified = None
+        self.verified_size = None
+        self.created = frame_idx
+
+    @property
+    def size(self):
+        x1, y1, x2, y2 = self.bbox
+        return max(x2 - x1, y2 - y1)
+
+    def needs_verify(self, frame_idx):
+        """
+        Re-run FaceID until the vote is settled, then only on schedule,
+        or when the face moved towards/away from the camera enough that the
+        cached decision may no longer hold.
+        """
+        if not self.confirmed or self.last_verified is None:
+            return True
+        if frame_idx - self.last_verified >= Config.FACE_REVERIFY_INTERVAL:
+            return True
+        if self.name != "UNKNOWN" and self.conf < Config.FACE_MATCH_THRESHOLD + Config.FACE_CONF_MARGIN:
+            return True
+        return abs(self.size - self.verified_size) > Config.FACE_SIZE_DRIFT * self.verified_size
+
+    def vote(self, name, conf, frame_idx):
+        self.votes.append((name, conf))
+        self.last_verified = frame_idx
+        self.verified_size = self.size
+
+        winner, count = Counter(n for n, _ in self.votes).most_common(1)[0]
+        if count >= Config.FACE_VOTE_MIN:
+            self.name = winner
+            self.conf = max(c for n, c in self.votes if n == winner)
+            self.confirmed = True
+
+class FaceTracker:
+    """
+    Associates faces between frames by bounding-box overlap (landmark extents).
+    A face that goes missing for FACE_TRACK_MAX_MISSES frames is dropped, so
+    whoever appears next starts a fresh track and is verified from scratch.
+    """
+    def __init__(self):
+        self.tracks = []
+        self.next_id = 1
+
+    def update(self, boxes, frame_idx):
+        """
+        boxes: list of (x1, y1, x2, y2) for the faces in this frame.
+        Returns the FaceTrack for each box, in the same order.
+        """
+        assigned = [None] * len(boxes)
+        free = list(self.tracks)
+
+        pairs = sorted(
+            ((_iou(t.bbox, b), ti, bi) for ti, t in enumerate(free) for bi, b in enumerate(boxes)),
+            reverse=True
+        )
+        used_t, used_b = set(), set()
+        for iou, ti, bi in pairs:
+            if iou < Config.FACE_TRACK_IOU or ti in used_t or bi in used_b:
+                continue
+            track = free[ti]
+            track.bbox = boxes[bi]
+            track.misses = 0
+            assigned[bi] = track
+            used_t.add(ti)
+            used_b.add(bi)
+
+        for ti, track in enumerate(free):
+            if ti not in used_t:
+                track.misses += 1
+        self.tracks = [t for t in self.tracks if t.misses <= Config.FACE_TRACK_MAX_MISSES]
+
+        for bi, box in enumerate(boxes):
+            if assigned[bi] is None:
+                track = FaceTrack(self.next_id, box, frame_idx)
+                self.next_id += 1
+                self.tracks.append(track)
+                assigned[bi] = track
+        return assigned
+
+    def reset(self):
+        self.tracks = []
+
+def _iou(a, b):
+    ix = max(0, min(a[2], b[2]) - max(a[0], b[0]))
+    iy = max(0, min(a[3], b[3]) - max(a[1], b[1]))
+    inter = ix * iy
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
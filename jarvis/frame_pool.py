@@ -0,0 +1,26 @@
+import numpy as np
+
+class FramePool:
+    """
+    Named, reusable image buffers for the render thread.
+    get() hands back the same array for a name as long as shape/dtype match,
+    so per-frame scratch images (overlays, private copies) are allocated once.
+    A buffer is only valid until the next get() with the same name.
+    """
+    def __init__(self):
+        self._buffers = {}
+        
+    def get(self, name, shape, dtype=np.uint8):
+        buf = self._buffers.get(name)
+        if buf is None or buf.shape != tuple(shape) or buf.dtype != dtype:
+            buf = self._buffers[name] = np.empty(shape, dtype=dtype)
+        return buf
+        
+    def copy(self, name, src):
+        """Like src.copy(), but into the pooled buffer `name`."""
+        dst = self.get(name, src.shape, src.dtype)
+        np.copyto(dst, src)
+        return dst
+        
+    def clear(self):
+        self._buffers.clear()
@@ -0,0 +1,141 @@
+import cv2
+import numpy as np
+import os
+from .config import Config
+
+class FrameSource:
+    """
+    Base class for anything that feeds BGR frames into JARVIS.
+    Mirrors the cv2.VideoCapture interface: read() -> (ret, frame), release().
+    `finished` becomes True once a finite source has no more frames.
+    """
+    live = False
+
+    def __init__(self):
+        self.finished = False
+
+    def read(self):
+        raise NotImplementedError
+
+    def release(self):
+        pass
+
+class CameraSource(FrameSource):
+    """Live webcam capture."""
+    live = True
+
+    def __init__(self, index=Config.CAMERA_INDEX):
+        super().__init__()
+        self.cap = cv2.VideoCapture(index)
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, Config.WIDTH)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, Config.HEIGHT)
+
+    def read(self):
+        return self.cap.read()
+
+    def release(self):
+        self.cap.release()
+
+class VideoFileSource(FrameSource):
+    """
+    Replays a recorded video file as fast as it can be decoded.
+    Frames are resized to the configured resolution so the HUD layout matches.
+    """
+    def __init__(self, path, loop=False):
+        super().__init__()
+        self.path = path
+        self.loop = loop
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise IOError(f"Cannot open video: {path}")
+
+    def read(self):
+        ret, frame = self.cap.read()
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        if not ret:
+            self.finished = True
+            return False, None
+        return True, _fit(frame)
+
+    def release(self):
+        self.cap.release()
+
+class ImageDirSource(FrameSource):
+    """Plays back a directory of still images in file name order."""
+    EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+    def __init__(self, path, loop=False):
+        super().__init__()
+        self.files = sorted(
+            os.path.join(path, f) for f in os.listdir(path)
+            if f.lower().endswith(self.EXTENSIONS)
+        )
+        if not self.files:
+            raise IOError(f"No images found in: {path}")
+        self.loop = loop
+        self.pos = 0
+
+    def read(self):
+        if self.pos >= len(self.files):
+            if not self.loop:
+                self.finished = True
+                return False, None
+            self.pos = 0
+
+        frame = cv2.imread(self.files[self.pos])
+        self.pos += 1
+        if frame is None:
+            return False, None
+        return True, _fit(frame)
+
+class SyntheticSource(FrameSource):
+    """
+    Deterministic generated frames (moving blobs over a gradient).
+    Needs no files or hardware; useful for smoke tests and UI benchmarks.
+    """
+    def __init__(self, count=None, seed=0):
+        super().__init__()
+        self.count = count
+        self.index = 0
+        rng = np.random.default_rng(seed)
+        self.blobs = rng.uniform(0, 1, size=(6, 4))
+        gradient = np.linspace(20, 90, Config.WIDTH, dtype=np.uint8)
+        self.background = np.dstack([np.tile(gradient, (Config.HEIGHT, 1))] * 3)
+
+    def read(self):
+        if self.count is not None and self.index >= self.count:
+            self.finished = True
+            return False, None
+
+        frame = self.background.copy()
+        t = self.index / 30.0
+        for bx, by, speed, size in self.blobs:
+            cx = int((bx + 0.2 * np.sin(t * (1 + speed))) * Config.WIDTH) % Config.WIDTH
+            cy = int((by + 0.2 * np.cos(t * (1 + speed))) * Config.HEIGHT) % Config.HEIGHT
+            cv2.circle(frame, (cx, cy), int(20 + size * 60), (80, 160, 220), -1)
+        self.index += 1
+        return True, frame
+
+def _fit(frame):
+    h, w = frame.shape[:2]
+    if (w, h) != (Config.WIDTH, Config.HEIGHT):
+        frame = cv2.resize(frame, (Config.WIDTH, Config.HEIGHT), interpolation=cv2.INTER_AREA)
+    return frame
+
+def open_source(spec=None, loop=False):
+    """
+    Builds a FrameSource from a CLI-style spec:
+    None -> default camera, integer string -> camera index,
+    "synthetic" -> generator, directory -> images, anything else -> video file.
+    """
+    if spec is None:
+        return CameraSource()
+    if isinstance(spec, int) or str(spec).isdigit():
+        return CameraSource(int(spec))
+    if spec == "synthetic":
+        return SyntheticSource()
+    if os.path.isdir(spec):
+        return ImageDirSource(spec, loop=loop)
+    return VideoFileSource(spec, loop=loop)
@@ -0,0 +1,210 @@
+import math
+from collections import namedtuple
+import numpy as np
+from .config import Config
+
+# 0=Wrist, 1-4=Thumb, 5-8=Index, 9-12=Middle, 13-16=Ring, 17-20=Pinky
+TIPS = np.array([4, 8, 12, 16, 20])
+_CHAINS = np.array([[0, 1, 2, 3, 4], [0, 5, 6, 7, 8], [0, 9, 10, 11, 12], [0, 13, 14, 15, 16], [0, 17, 18, 19, 20]])
+_PAIR_A, _PAIR_B = np.triu_indices(5, 1)  # the 10 fingertip pairs
+THUMB_INDEX, THUMB_MIDDLE, INDEX_MIDDLE = 0, 1, 4  # their columns in tip_dist
+
+# Every vector the features need, gathered with one fancy index:
+# 20 bones (5 fingers x 4), the 10 fingertip pairs, wrist->middle MCP, wrist->index MCP, wrist->pinky MCP
+_FROM = np.concatenate([_CHAINS[:, :-1].ravel(), TIPS[_PAIR_A], [0, 0, 0]])
+_TO = np.concatenate([_CHAINS[:, 1:].ravel(), TIPS[_PAIR_B], [9, 5, 17]])
+_BONES, _PAIRS, _PALM = slice(0, 20), slice(20, 30), 30
+
+HandFeatures = namedtuple("HandFeatures", [
+    "points",       # (H, 21, 3) landmarks in pixels (z scaled like x)
+    "palm_size",    # (H,) wrist -> middle MCP distance, px
+    "tip_dist",     # (H, 10) pairwise fingertip distances in the image plane, px
+    "flexion",      # (H, 5, 3) bend (rad) at each finger's three joints; 0 = straight
+    "curled",       # (H, 5) total bend past GESTURE_CURL_ANGLE
+    "palm_normal",  # (H, 3) unit normal of the wrist / index MCP / pinky MCP plane
+])
+
+HandGesture = namedtuple("HandGesture", [
+    "label",        # handedness ("RIGHT", "LEFT", ...)
+    "state",        # "point", "fist", "pinch", "drag", "scroll" or "zoom"
+    "pointer",      # index fingertip (x, y), px
+    "palm_size",
+    "pinch_dist",   # thumb -> index tip, px
+    "right_dist",   # thumb -> middle tip, px
+    "threshold",    # current pinch distance threshold, px
+])
+
+def hand_features(landmarks, frame_size):
+    """
+    Features for every hand in one NumPy pass.
+    landmarks: (H, 21, 3) normalized MediaPipe coordinates.
+    frame_size: (width, height)
+    """
+    w, h = frame_size
+    pts = np.asarray(landmarks, dtype=np.float32) * np.array([w, h, w], dtype=np.float32)
+    vec = pts[:, _TO] - pts[:, _FROM]                          # (H, 33, 3)
+    sq_xy = vec[..., 0] ** 2 + vec[..., 1] ** 2
+    palm = np.maximum(np.sqrt(sq_xy[:, _PALM]), 1.0)
+    tip_dist = np.sqrt(sq_xy[:, _PAIRS])
+    
+    bones = vec[:, _BONES].reshape(-1, 5, 4, 3)
+    lengths = np.sqrt(sq_xy[:, _BONES] + vec[:, _BONES, 2] ** 2).reshape(-1, 5, 4) + 1e-6
+    cos = (bones[:, :, :-1] * bones[:, :, 1:]).sum(axis=-1) / (lengths[:, :, :-1] * lengths[:, :, 1:])
+    flexion = np.arccos(np.clip(cos, -1.0, 1.0))
+    curled = flexion.sum(axis=2) > Config.GESTURE_CURL_ANGLE
+    
+    a, b = vec[:, 31], vec[:, 32]  # wrist->index MCP, wrist->pinky MCP
+    normal = np.stack([a[:, 1] * b[:, 2] - a[:, 2] * b[:, 1],
+                       a[:, 2] * b[:, 0] - a[:, 0] * b[:, 2],
+                       a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0]], axis=1)
+    normal /= np.sqrt((normal ** 2).sum(axis=1, keepdims=True)) + 1e-6
+    return HandFeatures(pts, palm, tip_dist, flexion, curled, normal)
+
+class _HandState:
+    def __init__(self):
+        self.state = "point"
+        self.since = 0.0
+        self.last_press = float("-inf")
+        self.right_down = False
+        self.anchor = 0.0
+
+class GestureEngine:
+    """
+    Classifies hand poses into gestures and events.
+    Features for all hands come from one vectorized hand_features() call;
+    what is left per hand is a small state machine over a few booleans:
+    
+        point --pinch--> pinch --held GESTURE_DRAG_HOLD--> drag
+          ^                |  (release)                     | (release)
+          +----------------+--------------------------------+
+        point <-> fist, point <-> scroll (index + middle out and together)
+        two hands pinching -> zoom
+        
+    Only gestures listed in GESTURES are recognized. update() returns the
+    per-hand HandGesture list and events as (label, name, value) tuples:
+    press / release / drag / right_click / scroll (steps, + = up) per hand,
+    and ("BOTH", "zoom", steps) for two-hand zoom (+ = apart).
+    """
+    def __init__(self, vocabulary=None):
+        self.vocabulary = set(vocabulary if vocabulary is not None else Config.GESTURES)
+        self._hands = {}
+        self._zoom = None  # (label_a, label_b, anchor distance) while zooming
+        
+    def update(self, landmarks, labels, frame_size, t):
+        """
+        landmarks: (H, 21, 3) normalized landmarks; labels: H handedness strings.
+        t: capture time of the frame (seconds).
+        """
+        events = []
+        labels = self._unique(labels)
+        for label in [l for l in self._hands if l not in labels]:
+            if self._hands.pop(label).state in ("pinch", "drag"):
+                events.append((label, "release", None)) # hand left the frame mid-pinch
+        if not labels:
+            self._zoom = None
+            return [], events
+            
+        f = hand_features(landmarks, frame_size)
+        vocab = self.vocabulary
+        threshold = np.clip(Config.CLICK_THRESHOLD * f.palm_size / 80.0, 15, 70)
+        fist = f.curled[:, 1:].all(axis=1) if "fist" in vocab else np.zeros(len(labels), dtype=bool)
+        two_up = (~f.curled[:, 1] & ~f.curled[:, 2] & f.curled[:, 3] & f.curled[:, 4]
+                  & (f.tip_dist[:, INDEX_MIDDLE] < 0.5 * f.palm_size))
+        scroll_y = (f.points[:, 8, 1] + f.points[:, 12, 1]) / 2
+        
+        rows = zip(labels, fist.tolist(), two_up.tolist(), threshold.tolist(), f.palm_size.tolist(),
+                   f.tip_dist[:, THUMB_INDEX].tolist(), f.tip_dist[:, THUMB_MIDDLE].tolist(),
+                   scroll_y.tolist(), f.points[:, 8, :2].tolist())
+        gestures = []
+        for label, is_fist, is_two_up, thr, palm, d_left, d_right, y, pointer in rows:
+            hand = self._hands.get(label)
+            if hand is None:
+                hand = self._hands[label] = _HandState()
+            held = hand.state in ("pinch", "drag", "zoom")
+            pinched = d_left < (thr * Config.GESTURE_RELEASE_RATIO if held else thr)
+            self._step(hand, label, is_fist, pinched, d_right < thr, is_two_up, y, palm, t, events)
+            gestures.append(HandGesture(label, hand.state, tuple(pointer), palm, d_left, d_right, thr))
+            
+        if "zoom" in vocab:
+            self._step_zoom(gestures, events)
+        return gestures, events
+        
+    @staticmethod
+    def _unique(labels):
+        """Two hands reported with the same handedness get distinct keys."""
+        seen = {}
+        out = []
+        for label in labels:
+            label = label.upper()
+            seen[label] = seen.get(label, 0) + 1
+            out.append(label if seen[label] == 1 else f"{label}{seen[label]}")
+        return out
+        
+    def _set(self, hand, state, t):
+        hand.state = state
+        hand.since = t
+        
+    def _step(self, hand, label, is_fist, pinched, right_pinched, is_two_up, y, palm, t, events):
+        vocab = self.vocabulary
+        state = hand.state
+        if state in ("pinch", "drag"):
+            if is_fist or not pinched:
+                events.append((label, "release", None))
+                self._set(hand, "fist" if is_fist else "point", t)
+            elif state == "pinch" and "drag" in vocab and t - hand.since >= Config.GESTURE_DRAG_HOLD:
+                events.append((label, "drag", None))
+                self._set(hand, "drag", t)
+        elif state == "zoom":
+            if not pinched:
+                self._set(hand, "point", t)
+        elif is_fist:
+            if state != "fist":
+                self._set(hand, "fist", t)
+        elif state == "scroll" and is_two_up:
+            steps = int((hand.anchor - y) / (Config.GESTURE_SCROLL_STEP * palm))
+            if steps:
+                events.append((label, "scroll", steps))
+                hand.anchor -= steps * Config.GESTURE_SCROLL_STEP * palm
+        elif pinched and "pinch" in vocab and t - hand.last_press > Config.CLICK_COOLDOWN:
+            events.append((label, "press", None))
+            hand.last_press = t
+            self._set(hand, "pinch", t)
+        elif is_two_up and "scroll" in vocab:
+            hand.anchor = y
+            self._set(hand, "scroll", t)
+        elif state != "point":
+            self._set(hand, "point", t)
+            
+        # Right click: thumb meets the middle finger while simply pointing
+        if right_pinched and not hand.right_down and state == hand.state == "point" \
+                and "right_click" in vocab and t - hand.last_press > Config.CLICK_COOLDOWN:
+            events.append((label, "right_click", None))
+            hand.last_press = t
+        hand.right_down = right_pinched
+        
+    def _step_zoom(self, gestures, events):
+        pinching = [g for g in gestures if g.state in ("pinch", "drag", "zoom")]
+        if len(pinching) < 2:
+            self._zoom = None
+            return
+        a, b = pinching[0], pinching[1]
+        dist = math.dist(a.pointer, b.pointer)
+        if self._zoom is None or self._zoom[:2] != (a.label, b.label):
+            for g in (a, b):
+                hand = self._hands[g.label]
+                # The pinch starts a zoom, not a click
+                if (g.label, "press", None) in events:
+                    events.remove((g.label, "press", None))
+                elif hand.state in ("pinch", "drag"):
+                    events.append((g.label, "release", None))
+                hand.state = "zoom"
+            self._zoom = (a.label, b.label, dist)
+            gestures[gestures.index(a)] = a._replace(state="zoom")
+            gestures[gestures.index(b)] = b._replace(state="zoom")
+            return
+        anchor = self._zoom[2]
+        step = math.log1p(Config.GESTURE_ZOOM_STEP)
+        steps = int(math.log(max(dist, 1e-6) / anchor) / step)
+        if steps:
+            events.append(("BOTH", "zoom", steps))
+            self._zoom = (a.label, b.label, anchor * math.exp(steps * step))
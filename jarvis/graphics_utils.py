@@ -1,31 +1,99 @@
 import cv2
 import numpy as np
 from .config import Config
+from .frame_pool import FramePool
+from .sprite_cache import SpriteCache
 
 class GraphicsUtils:
     """
     Helper functions for drawing glowing text and glass panels.
     Premium Edition: Thicker glows, smoother alphas.
+    All blending writes straight into the destination ROI (dst=) using cached
+    solid-colour tiles, so drawing allocates nothing per frame.
+    Glow text is pre-rendered into LRU-cached sprites and stamped with one
+    masked copy.
     """
+    pool = FramePool() # Shared scratch/frame buffers for the render thread
+    _tiles = {}        # color -> solid tile, grown to the largest ROI requested
+    text_cache = SpriteCache(Config.TEXT_CACHE_MAX_BYTES)
+
+    @staticmethod
+    def solid_tile(color, h, w):
+        """A cached (h, w, 3) view filled with `color`. Treat as read-only."""
+        key = tuple(int(c) for c in color)
+        tile = GraphicsUtils._tiles.get(key)
+        if tile is None or tile.shape[0] < h or tile.shape[1] < w:
+            th = max(h, tile.shape[0] if tile is not None else 0)
+            tw = max(w, tile.shape[1] if tile is not None else 0)
+            tile = GraphicsUtils._tiles[key] = np.full((th, tw, 3), key, dtype=np.uint8)
+        return tile[:h, :w]
+
+    @staticmethod
+    def blend_rect(img, rect, color, alpha):
+        """Tints img[rect] towards `color` by `alpha`, in place. Returns the ROI view (None if empty)."""
+        x, y, w, h = rect
+        sub = img[max(0, y):y+h, max(0, x):x+w]
+        if sub.shape[0] == 0 or sub.shape[1] == 0: return None
+        tile = GraphicsUtils.solid_tile(color, sub.shape[0], sub.shape[1])
+        cv2.addWeighted(sub, 1-alpha, tile, alpha, 0, dst=sub)
+        return sub
+
+    @staticmethod
+    def blend_into(dst, src, alpha):
+        """dst = src * alpha + dst * (1 - alpha), in place (same-shape images or ROI views)."""
+        cv2.addWeighted(src, alpha, dst, 1.0 - alpha, 0, dst=dst)
+        return dst
+
     @staticmethod
     def draw_glow_text(img, text, pos, scale=0.5, color=Config.CYAN_HOLO, thickness=1, glow_intensity=3):
         """Draws text with a blurred glow outline."""
-        x, y = pos
+        if not Config.TEXT_CACHE:
+            GraphicsUtils._put_glow_text(img, text, pos, scale, color, thickness, glow_intensity)
+            return
+            
+        key = (text, scale, tuple(color), thickness, glow_intensity)
+        bgr, mask, dx, dy = GraphicsUtils.text_cache.get(
+            key, lambda: GraphicsUtils._render_glow_text(text, scale, color, thickness, glow_intensity))
+        
+        # Clip the sprite to the image, then one masked copy
+        h, w = bgr.shape[:2]
+        x, y = pos[0] + dx, pos[1] + dy
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, img.shape[1]), min(y + h, img.shape[0])
+        if x0 >= x1 or y0 >= y1: return
+        np.copyto(img[y0:y1, x0:x1], bgr[y0-y:y1-y, x0-x:x1-x], where=mask[y0-y:y1-y, x0-x:x1-x])
+        
+    @staticmethod
+    def _put_glow_text(img, text, pos, scale, color, thickness, glow_intensity):
         # Glow (Thick line)
         cv2.putText(img, text, pos, Config.FONT, scale, color, thickness + glow_intensity)
         # Core (Thin line)
         cv2.putText(img, text, pos, Config.FONT, scale, Config.WHITE, thickness)
+        
+    @staticmethod
+    def _render_glow_text(text, scale, color, thickness, glow_intensity):
+        """
+        Sprite for the text cache: (bgr, mask (h, w, 1) bool, dx, dy), cropped
+        to the drawn pixels; (dx, dy) is its top-left relative to the text origin.
+        """
+        t = thickness + glow_intensity
+        (tw, th), base = cv2.getTextSize(text, Config.FONT, scale, t)
+        pad = t + 2
+        ox, oy = pad, pad + th
+        bgr = np.zeros((th + base + 2 * pad, tw + 2 * pad, 3), dtype=np.uint8)
+        GraphicsUtils._put_glow_text(bgr, text, (ox, oy), scale, color, thickness, glow_intensity)
+        
+        mask = np.zeros(bgr.shape[:2], dtype=np.uint8)
+        cv2.putText(mask, text, (ox, oy), Config.FONT, scale, 255, t)
+        cv2.putText(mask, text, (ox, oy), Config.FONT, scale, 255, thickness)
+        x, y, w, h = cv2.boundingRect(mask)
+        return (bgr[y:y+h, x:x+w].copy(), mask[y:y+h, x:x+w, None] > 0, x - ox, y - oy)
 
     @staticmethod
     def draw_glass_panel(img, rect, color=Config.BLUE_DEEP, alpha=Config.UI_ALPHA, title=None):
         x, y, w, h = rect
-        sub = img[y:y+h, x:x+w]
-        if sub.shape[0] == 0 or sub.shape[1] == 0: return
-        
-        # Fill
-        fill = np.full(sub.shape, color, dtype=np.uint8)
-        res = cv2.addWeighted(sub, 1-alpha, fill, alpha, 0)
-        img[y:y+h, x:x+w] = res
+        # Fill (blended in place)
+        if GraphicsUtils.blend_rect(img, rect, color, alpha) is None: return
         
         # Border
         cv2.rectangle(img, (x, y), (x+w, y+h), Config.CYAN_HOLO, 1)
@@ -50,6 +118,17 @@ class GraphicsUtils:
         if title:
             GraphicsUtils.draw_glow_text(img, title, (x+10, y+25), 0.6, Config.CYAN_HOLO, 1)
             
+    @staticmethod
+    def draw_sparkline(img, values, rect, color=Config.CYAN_HOLO, vmax=100.0):
+        """Polyline of recent values (oldest left) scaled into rect (x, y, w, h)."""
+        if len(values) < 2: return
+        x, y, w, h = rect
+        vals = np.clip(np.asarray(values, dtype=np.float32) / vmax, 0, 1)
+        xs = x + np.linspace(0, w, len(vals))
+        ys = y + h - vals * h
+        pts = np.stack([xs, ys], axis=1).round().astype(np.int32)
+        cv2.polylines(img, [pts], False, color, 1)
+            
     @staticmethod
     def draw_cinematic_border(img):
         h, w = img.shape[:2]
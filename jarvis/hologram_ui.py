@@ -1,19 +1,25 @@
 import cv2
 import numpy as np
 import datetime
-import psutil
 from collections import deque
 from .config import Config
 from .matrix_rain import MatrixRain
 from .graphics_utils import GraphicsUtils
+from .hud_layer import HudLayer
+from .telemetry import Telemetry
 
 class HologramUI:
     """
     Manages the HUD rendering, including glow effects, menus, and notifications.
     Premium Edition: Cinematic visuals, FPS counter, Status Icons.
+    Static chrome (border, panels, titles, menu buttons) is rendered once into
+    cached HudLayers keyed by their inputs (e.g. hover state) and blended per
+    frame; only values that change are drawn live.
+    System stats come from a Telemetry snapshot (sampled on its own thread).
     """
-    def __init__(self):
+    def __init__(self, telemetry=None):
         self.matrix = MatrixRain()
+        self.telemetry = telemetry if telemetry is not None else Telemetry().start()
         self.notifications = deque(maxlen=8)
         self.greeting_timer = 0
         self.greeting_text = ""
@@ -24,6 +30,7 @@ class HologramUI:
             "MUSIC": (Config.WIDTH - 160, 250, 140, 40),
             "OBJECTS": (Config.WIDTH - 160, 300, 140, 40)
         }
+        self._layers = {}
         
     def add_notification(self, text):
         ts = datetime.datetime.now().strftime("%H:%M:%S")
@@ -40,64 +47,96 @@ class HologramUI:
             if x < cx < x+w and y < cy < y+h:
                 return name
         return None
-
+        
+    def _layer(self, img, key, draw_fn):
+        """Blends the cached layer for `key`, rendering it on first use (or when immediate mode is on)."""
+        if not Config.HUD_CACHE:
+            draw_fn(img)
+            return
+        key = (key, img.shape)
+        layer = self._layers.get(key)
+        if layer is None:
+            layer = self._layers[key] = HudLayer(img.shape, draw_fn)
+        layer.composite(img)
+        
+    def invalidate(self):
+        """Drops every cached layer (call after changing layout or colors at runtime)."""
+        self._layers.clear()
+        
+    def _draw_chrome(self, img):
+        GraphicsUtils.draw_cinematic_border(img)
+        GraphicsUtils.draw_glass_panel(img, (20, 20, 280, 160), title="SYSTEM STATUS")
+        gpu_status = "GPU: ON" if Config.CINEMATIC_MODE else "GPU: OFF" # Mock status or tied to YOLO
+        GraphicsUtils.draw_glow_text(img, gpu_status, (Config.WIDTH - 100, 70), 0.5, Config.CYAN_HOLO)
+        GraphicsUtils.draw_glass_panel(img, (Config.WIDTH - 350, Config.HEIGHT - 220, 330, 200), title="LOGS")
+        
+    def _draw_voice(self, img):
+        cx = Config.WIDTH // 2
+        cv2.circle(img, (cx, Config.HEIGHT - 40), 10, Config.CYAN_HOLO, -1)
+        GraphicsUtils.draw_glow_text(img, "VOICE ACTIVE", (cx - 60, Config.HEIGHT - 60), 0.6, Config.CYAN_HOLO, glow_intensity=5)
+        
+    def _draw_lock(self, img):
+        GraphicsUtils.draw_glass_panel(img, (Config.WIDTH//2 - 150, 100, 300, 60), Config.RED_ALERT, 0.8)
+        GraphicsUtils.draw_glow_text(img, "SECURITY LOCK ACTIVE", (Config.WIDTH//2 - 130, 140), 0.7, Config.WHITE, 2)
+        
+    def _draw_button(self, img, name, is_hover):
+        x, y, w, h = rect = self.menu_buttons[name]
+        bg_color = Config.BLUE_DEEP if not is_hover else Config.CYAN_DIM
+        GraphicsUtils.draw_glass_panel(img, rect, bg_color, 0.6)
+        
+        color = Config.CYAN_HOLO if not is_hover else Config.WHITE
+        GraphicsUtils.draw_glow_text(img, name, (x+10, y+25), 0.5, color)
+        
     def update(self, img, detections, mouse_status, cursor_pos, fps, is_listening, is_locked):
         # 1. Matrix Background
         img = self.matrix.update(img)
         
-        # 2. Cinematic Border
-        GraphicsUtils.draw_cinematic_border(img)
-        
-        # 3. System Stats Panel (Top Left)
-        GraphicsUtils.draw_glass_panel(img, (20, 20, 280, 160), title="SYSTEM STATUS")
+        # 2. Static chrome: cinematic border, stats & logs panels, GPU status
+        self._layer(img, "chrome", self._draw_chrome)
         
-        cpu = psutil.cpu_percent()
-        ram = psutil.virtual_memory().percent
-        batt = psutil.sensors_battery()
-        pwr = batt.percent if batt else 100
+        # 3. System Stats (Top Left)
+        snap = self.telemetry.snapshot
+        cpu = snap.cpu
+        ram = snap.ram
+        pwr = snap.battery if snap.battery is not None else 100
         
         y = 60
         GraphicsUtils.draw_glow_text(img, f"CPU: {int(cpu)}%", (35, y), 0.5, Config.WHITE)
         cv2.rectangle(img, (130, y-8), (130 + int(cpu), y), Config.CYAN_HOLO, -1)
+        GraphicsUtils.draw_sparkline(img, self.telemetry.series("cpu"), (240, y-14, 50, 16), Config.CYAN_HOLO)
         
         y += 35
         GraphicsUtils.draw_glow_text(img, f"RAM: {int(ram)}%", (35, y), 0.5, Config.WHITE)
         cv2.rectangle(img, (130, y-8), (130 + int(ram), y), Config.ORANGE_WARN, -1)
+        GraphicsUtils.draw_sparkline(img, self.telemetry.series("ram"), (240, y-14, 50, 16), Config.ORANGE_WARN)
         
         y += 35
         pwr_color = Config.GREEN_OK if pwr > 20 else Config.RED_ALERT
         GraphicsUtils.draw_glow_text(img, f"PWR: {int(pwr)}%", (35, y), 0.5, Config.WHITE)
         cv2.rectangle(img, (130, y-8), (130 + int(pwr), y), pwr_color, -1)
         
-        # 4. FPS & GPU (Top Right)
+        # JARVIS' own footprint
+        cv2.putText(img, f"JARVIS: {int(snap.proc_cpu)}% CPU  {snap.proc_rss // (1024 * 1024)} MB  {snap.threads} THR",
+                    (35, y + 28), Config.FONT, 0.4, Config.CYAN_DIM, 1)
+                    
+        # 4. FPS (Top Right)
         GraphicsUtils.draw_glow_text(img, f"FPS: {int(fps)}", (Config.WIDTH - 100, 40), 0.6, Config.GREEN_OK)
-        gpu_status = "GPU: ON" if Config.CINEMATIC_MODE else "GPU: OFF" # Mock status or tied to YOLO
-        GraphicsUtils.draw_glow_text(img, gpu_status, (Config.WIDTH - 100, 70), 0.5, Config.CYAN_HOLO)
-
+        
         # 5. Voice Status (Bottom Center)
         if is_listening:
-            cx = Config.WIDTH // 2
-            cv2.circle(img, (cx, Config.HEIGHT - 40), 10, Config.CYAN_HOLO, -1)
-            GraphicsUtils.draw_glow_text(img, "VOICE ACTIVE", (cx - 60, Config.HEIGHT - 60), 0.6, Config.CYAN_HOLO, glow_intensity=5)
-
+            self._layer(img, "voice", self._draw_voice)
+            
         # 6. Security Lock Status
         if is_locked:
-             GraphicsUtils.draw_glass_panel(img, (Config.WIDTH//2 - 150, 100, 300, 60), Config.RED_ALERT, 0.8)
-             GraphicsUtils.draw_glow_text(img, "SECURITY LOCK ACTIVE", (Config.WIDTH//2 - 130, 140), 0.7, Config.WHITE, 2)
-
-        # 7. Hologram Menu
+            self._layer(img, "lock", self._draw_lock)
+            
+        # 7. Hologram Menu (one cached layer per button and hover state)
         for name, rect in self.menu_buttons.items():
             x, y, w, h = rect
             is_hover = x < cursor_pos[0] < x+w and y < cursor_pos[1] < y+h
+            self._layer(img, ("button", name, is_hover), lambda im, n=name, hv=is_hover: self._draw_button(im, n, hv))
             
-            bg_color = Config.BLUE_DEEP if not is_hover else Config.CYAN_DIM
-            GraphicsUtils.draw_glass_panel(img, rect, bg_color, 0.6)
-            
-            color = Config.CYAN_HOLO if not is_hover else Config.WHITE
-            GraphicsUtils.draw_glow_text(img, name, (x+10, y+25), 0.5, color)
-            
-        # 8. Notifications
-        GraphicsUtils.draw_glass_panel(img, (Config.WIDTH - 350, Config.HEIGHT - 220, 330, 200), title="LOGS")
+        # 8. Notifications (panel is part of the chrome layer)
         y = Config.HEIGHT - 40
         for note in reversed(self.notifications):
             cv2.putText(img, note, (Config.WIDTH - 340, y), Config.FONT, 0.4, Config.CYAN_DIM, 1)
@@ -120,11 +159,15 @@ class HologramUI:
             
         # 11. YOLO Detections
         for d in detections:
-            x1, y1, x2, y2 = d['bbox']
-            label = d['label'].upper()
+            x1, y1, x2, y2 = d.bbox
+            label = d.label.upper()
             color = Config.RED_ALERT if label in ['person', 'knife', 'scissors'] else Config.CYAN_HOLO
             
             cv2.rectangle(img, (x1, y1), (x2, y2), color, 1)
-            GraphicsUtils.draw_glow_text(img, f"{label} {int(d['conf']*100)}%", (x1, y1-10), 0.5, color)
+            tag = f"{label} #{d.track_id}" if d.track_id is not None else label
+            # Class + id is a stable sprite; the confidence changes every frame, so it is plain text
+            GraphicsUtils.draw_glow_text(img, tag, (x1, y1-10), 0.5, color)
+            (tw, _), _ = cv2.getTextSize(tag + " ", Config.FONT, 0.5, 1)
+            cv2.putText(img, f"{int(d.conf*100)}%", (x1 + tw, y1-10), Config.FONT, 0.5, color, 1)
             
         return img
@@ -0,0 +1,97 @@
+import queue
+import threading
+import time
+from .config import Config
+
+class NullHotkeyBackend:
+    """No keyboard hooks (headless runs, replay mode, servers without input access)."""
+    name = "none"
+    
+    def start(self, on_event):
+        pass
+        
+    def stop(self):
+        pass
+
+class KeyboardHotkeyBackend:
+    """Global key events from the `keyboard` package (needs root on Linux)."""
+    name = "keyboard"
+    
+    def __init__(self):
+        import keyboard
+        self.keyboard = keyboard
+        self._hook = None
+        
+    def start(self, on_event):
+        self._hook = self.keyboard.hook(lambda e: on_event((e.name or "").lower(), e.event_type == "down"))
+        
+    def stop(self):
+        if self._hook is not None:
+            self.keyboard.unhook(self._hook)
+            self._hook = None
+
+class HotkeyService:
+    """
+    Turns global key events into actions for the main loop.
+    Backend callbacks run on the keyboard hook thread; a binding fires once
+    per physical press (auto-repeat is ignored until the key is released)
+    and at most once per HOTKEY_DEBOUNCE seconds. Fired actions wait in a
+    queue that the frame loop drains with poll(), so it never blocks on input.
+    """
+    def __init__(self, bindings=None, backend=None):
+        self.bindings = {k.lower(): v for k, v in (bindings if bindings is not None else Config.HOTKEYS).items()}
+        self.backend = backend or NullHotkeyBackend()
+        self._mailbox = queue.SimpleQueue()
+        self._held = set()
+        self._last_fired = {}
+        self._lock = threading.Lock()
+        
+    def start(self):
+        try:
+            self.backend.start(self._on_event)
+        except Exception as e:
+            print(f"[HOTKEYS] {self.backend.name} backend failed ({e}); hotkeys disabled.")
+            self.backend = NullHotkeyBackend()
+        return self
+        
+    def stop(self):
+        try:
+            self.backend.stop()
+        except Exception:
+            pass
+            
+    def _on_event(self, key, is_down):
+        action = self.bindings.get(key)
+        if action is None:
+            return
+        with self._lock:
+            if not is_down:
+                self._held.discard(key)
+                return
+            if key in self._held:
+                return # auto-repeat while held
+            self._held.add(key)
+            now = time.monotonic()
+            if now - self._last_fired.get(key, float("-inf")) < Config.HOTKEY_DEBOUNCE:
+                return
+            self._last_fired[key] = now
+        self._mailbox.put(action)
+        
+    def poll(self):
+        """Returns the actions fired since the last call (oldest first)."""
+        actions = []
+        while True:
+            try:
+                actions.append(self._mailbox.get_nowait())
+            except queue.Empty:
+                return actions
+
+def create_hotkeys(headless=False):
+    """HotkeyService on the `keyboard` backend, or the no-op backend when headless/unavailable."""
+    backend = None
+    if not headless and Config.HOTKEYS_ENABLED:
+        try:
+            backend = KeyboardHotkeyBackend()
+        except Exception as e:
+            print(f"[HOTKEYS] keyboard package unavailable ({e}); hotkeys disabled.")
+    return HotkeyService(backend=backend).start()
@@ -0,0 +1,36 @@
+import cv2
+import numpy as np
+
+class HudLayer:
+    """
+    Pre-rendered static HUD chrome, blended onto each frame in one pass.
+    draw_fn(img) is rendered once over black and once over white: the black
+    pass is the premultiplied colour, (white - black) the per-channel
+    transparency. Compositing frame * inv / 255 + premult then gives the same
+    pixels draw_fn would have drawn on the live frame, without re-running it.
+    Only the tiles draw_fn actually touched are stored and blended.
+    """
+    def __init__(self, shape, draw_fn):
+        h, w = shape[:2]
+        black = np.zeros((h, w, 3), dtype=np.uint8)
+        white = np.full((h, w, 3), 255, dtype=np.uint8)
+        draw_fn(black)
+        draw_fn(white)
+        
+        touched = np.any((black != 0) | (white != 255), axis=2).astype(np.uint8)
+        # Merge nearby strokes (text, corner accents) into one tile each
+        touched = cv2.dilate(touched, np.ones((9, 9), np.uint8))
+        n, _, stats, _ = cv2.connectedComponentsWithStats(touched)
+        
+        self.tiles = []
+        for x, y, tw, th, _ in stats[1:n]:
+            inv = cv2.subtract(white[y:y+th, x:x+tw], black[y:y+th, x:x+tw])
+            self.tiles.append((slice(y, y+th), slice(x, x+tw), inv, black[y:y+th, x:x+tw].copy()))
+            
+    def composite(self, img):
+        """Blends the layer into img in place."""
+        for ys, xs, inv, premult in self.tiles:
+            sub = img[ys, xs]
+            cv2.multiply(sub, inv, dst=sub, scale=1 / 255.0)
+            cv2.add(sub, premult, dst=sub)
+        return img
@@ -0,0 +1,157 @@
+import importlib
+import re
+import threading
+from collections import namedtuple
+from .config import Config
+
+Intent = namedtuple("Intent", "name handler patterns order allow_locked allow_muted limit timeout main_thread")
+
+REGISTRY = [] # Intents declared with @command, picked up by every router on load
+
+_TOKEN = re.compile(r"[\w']+")
+_SLOT = re.compile(r"^\{(\w+)\}$")
+
+def command(*phrases, name=None, allow_locked=False, allow_muted=False, limit=None, timeout=None, main_thread=False):
+    """
+    Declares a voice command. Phrases are matched on word boundaries; a
+    "{slot}" token captures the words in its place and is passed to the
+    handler as a keyword argument:
+    
+        @command("search for {query}")
+        def search(core, query): ...
+        
+    Commands registered earlier win when several match the same utterance.
+    Handlers run on the command pool: `limit` caps concurrent runs and
+    `timeout` (seconds) is when a slow run is reported and stops counting
+    against the limit; both default to COMMAND_LIMIT / COMMAND_TIMEOUT.
+    main_thread=True runs the handler inline on the frame loop instead. Use
+    it for handlers that change JarvisCore or HUD state, which the loop reads
+    without locks; hand anything slow to core.executor from there.
+    """
+    def decorator(fn):
+        REGISTRY.append(dict(name=name or fn.__name__, handler=fn, phrases=phrases,
+                             allow_locked=allow_locked, allow_muted=allow_muted,
+                             limit=limit, timeout=timeout, main_thread=main_thread))
+        return fn
+    return decorator
+
+def _compile_phrase(phrase):
+    """
+    Phrase -> (compiled regex, index key). The key is the first one or two
+    adjacent literal words ("take screenshot", "search for", "time").
+    """
+    tokens = phrase.lower().split()
+    parts, key_words, key_done = [], [], False
+    for i, tok in enumerate(tokens):
+        slot = _SLOT.match(tok)
+        if slot:
+            lazy = "?" if i < len(tokens) - 1 else ""
+            parts.append(f"(?P<{slot.group(1)}>.+{lazy})")
+            key_done = key_done or bool(key_words)
+        else:
+            if not key_done:
+                key_words.extend(_TOKEN.findall(tok))
+            parts.append(re.escape(tok))
+    if not key_words:
+        raise ValueError(f"Command phrase needs at least one literal word: {phrase!r}")
+    body = r"\s+".join(parts)
+    if not _SLOT.match(tokens[0]): body = r"\b" + body
+    if not _SLOT.match(tokens[-1]): body = body + r"\b"
+    return re.compile(body), " ".join(key_words[:2])
+
+class IntentRouter:
+    """
+    Maps utterances to registered commands.
+    Every phrase is indexed by its first one or two literal words, so a
+    lookup only tokenizes the utterance, fetches the few intents keyed by its
+    words and word pairs and runs their compiled patterns: cost depends on
+    the utterance, not on how many commands are registered.
+    Command modules (jarvis.commands, Config.COMMAND_PLUGINS and the
+    "jarvis.commands" entry-point group) are imported on first use.
+    """
+    ENTRY_POINT_GROUP = "jarvis.commands"
+    
+    def __init__(self, modules=None, entry_points=True):
+        self.modules = list(modules) if modules is not None else ["jarvis.commands"] + list(Config.COMMAND_PLUGINS)
+        self.entry_points = entry_points
+        self.intents = []
+        self._index = {}   # "word" or "word word" -> [(intent, regex, open_ended), ...]
+        self._loaded = False
+        self._load_lock = threading.Lock() # voice thread and main loop may both trigger the first load
+        
+    def add(self, name, handler, phrases, allow_locked=False, allow_muted=False, limit=None, timeout=None, main_thread=False):
+        intent = Intent(name, handler, tuple(phrases), len(self.intents), allow_locked, allow_muted, limit, timeout, main_thread)
+        self.intents.append(intent)
+        for phrase in phrases:
+            regex, key = _compile_phrase(phrase)
+            open_ended = bool(_SLOT.match(phrase.split()[-1])) # a trailing {slot} can still grow
+            self._index.setdefault(key, []).append((intent, regex, open_ended))
+        return intent
+        
+    def load(self):
+        """Imports command modules/plugins and registers their intents (once)."""
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
+            for module in self.modules:
+                try:
+                    importlib.import_module(module)
+                except Exception as e:
+                    print(f"[COMMANDS] Failed to load {module}: {e}")
+            if self.entry_points:
+                self._load_entry_points()
+            for spec in REGISTRY:
+                self.add(**spec)
+            self._loaded = True
+            print(f"[COMMANDS] {len(self.intents)} commands loaded.")
+            
+    def _load_entry_points(self):
+        try:
+            from importlib.metadata import entry_points
+            eps = entry_points()
+            group = eps.select(group=self.ENTRY_POINT_GROUP) if hasattr(eps, "select") else eps.get(self.ENTRY_POINT_GROUP, [])
+        except Exception:
+            return
+        for ep in group:
+            try:
+                plugin = ep.load()
+                if callable(plugin):
+                    plugin(self) # register(router) style plugins
+            except Exception as e:
+                print(f"[COMMANDS] Failed to load plugin {ep.name}: {e}")
+                
+    def match(self, text):
+        """Returns (Intent, slots dict) for the best matching command, or None."""
+        best = self._match(text)
+        return best[:2] if best is not None else None
+        
+    def _match(self, text):
+        self.load()
+        text = text.lower().strip()
+        words = _TOKEN.findall(text)
+        keys = set(words)
+        keys.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+        best = None
+        for key in keys:
+            for intent, regex, open_ended in self._index.get(key, ()):
+                if best is not None and intent.order >= best[0].order:
+                    continue
+                m = regex.search(text)
+                if m:
+                    slots = {k: v.strip() for k, v in m.groupdict().items()}
+                    best = (intent, slots, open_ended)
+        return best
+        
+    def is_command(self, text):
+        return self.match(text) is not None
+        
+    def is_complete(self, text):
+        """
+        True when text is a whole command that more words can't change:
+        its phrase doesn't end in a {slot}. "search for cats" is a command,
+        but the speaker may still be saying "... and dogs".
+        """
+        best = self._match(text)
+        return best is not None and not best[2]
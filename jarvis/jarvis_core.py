@@ -1,46 +1,71 @@
 import cv2
+import numpy as np
 import time
 import mediapipe as mp
 import threading
 import sys
 import webbrowser
 import os
-import keyboard 
 import datetime
-import psutil
-import pyautogui
+from functools import partial
 
 from .config import Config
-from .voice_engine import VoiceEngine
+from .voice_engine import VoiceEngine, MutedVoice
 from .face_id import FaceID
+from .face_tracks import FaceTracker
+from .landmarks import LandmarkConverter
 from .vision_yolo import VisionSystem
+from .detections import Detections
 from .mouse_control import MouseController
 from .hologram_ui import HologramUI
+from .graphics_utils import GraphicsUtils
 from .sound_fx import SoundFx
+from .pipeline import FramePipeline
+from .frame_source import open_source
+from .perf import StageTimer
+from .telemetry import Telemetry
+from .intents import IntentRouter
+from .command_executor import CommandExecutor
+from .hotkeys import create_hotkeys
 
 class JarvisCore:
     """
     JARVIS Mark-II Premium Core.
     Integrates Voice, Vision, Biometrics, UI, and System Control.
     """
-    def __init__(self):
+    def __init__(self, source=None, headless=False, max_frames=None):
+        """
+        source: FrameSource to read from (defaults to the webcam).
+        headless: no window, microphone, keyboard hooks or real cursor; prints a
+                  throughput / per-stage timing report on exit (benchmark mode).
+        max_frames: stop after this many rendered frames.
+        """
         print(f"[SYSTEM] Booting {Config.APP_NAME} v{Config.VERSION}...")
         Config.setup_directories()
         
-        self.voice = VoiceEngine()
+        self.headless = headless
+        self.max_frames = max_frames
+        self.frames_rendered = 0
+        self.timer = StageTimer()
+        self._perf_rows = []
+        
+        self.commands = IntentRouter()
+        self.executor = CommandExecutor()
+        self.voice = MutedVoice() if headless else VoiceEngine(is_command=self.commands.is_complete)
         self.face_sys = FaceID()
-        self.vision = VisionSystem()
-        self.mouse = MouseController()
-        self.ui = HologramUI()
+        self.face_tracker = FaceTracker()
+        self.vision = VisionSystem(timer=self.timer)
+        self.mouse = MouseController(dry_run=headless)
+        self.telemetry = Telemetry().start()
+        self.hotkeys = create_hotkeys(headless)
+        self.ui = HologramUI(self.telemetry)
         
         # Permissions Check
         if not self.mouse.check_permissions():
             print("[WARNING] Mouse control blocked. Please enable Accessibility permissions.")
             self.ui.add_notification("MOUSE BLOCKED: Check Permissions")
-        
-        self.cap = cv2.VideoCapture(0)
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, Config.WIDTH)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, Config.HEIGHT)
+            
+        self.source = source if source is not None else open_source()
         
         self.mp_face_mesh = mp.solutions.face_mesh.FaceMesh(
             max_num_faces=3,
@@ -48,14 +73,17 @@ class JarvisCore:
             min_detection_confidence=0.7
         )
         self.mp_hands = mp.solutions.hands.Hands(
-            max_num_hands=1,
+            max_num_hands=Config.MAX_HANDS,
             min_detection_confidence=0.7
         )
         self.mp_draw = mp.solutions.drawing_utils
+        self.landmarks = LandmarkConverter()
         
         self.running = True
         self.registering_user = None
         self.registration_buffer = []
+        self._face_tracks = []          # tracks of the last processed face result
+        self._last_face_index = None    # pipeline frame index of that result
         self.identified_user = None
         self.is_locked = False
         self.mic_muted = False
@@ -65,260 +93,383 @@ class JarvisCore:
         cv2.setNumThreads(4)
         
         self.voice.speak("Systems online. At your service, sir.")
-        SoundFx.boot_sequence()
-
+        if not headless:
+            SoundFx.boot_sequence()
+            
     def process_command(self, cmd):
-        if self.mic_muted and "unmute" not in cmd:
+        match = self.commands.match(cmd)
+        intent, slots = match if match else (None, {})
+        if self.mic_muted and not (intent and intent.allow_muted):
             return
-
+            
         self.ui.add_notification(f"CMD: {cmd}")
         
         # Security Check
-        if self.is_locked and "register" not in cmd and "identify" not in cmd:
+        if self.is_locked and not (intent and intent.allow_locked) and "identify" not in cmd:
             self.voice.speak("Access denied. Please identify yourself.", emotion="urgent")
             return
-
-        if "shutdown system" in cmd:
-            self.voice.speak("Are you sure you want to shut down the PC?", emotion="urgent")
-            self.running = False
             
-        elif "goodbye" in cmd or "terminate" in cmd:
-            self.voice.speak("Shutting down protocols. Goodbye, sir.", emotion="sad")
-            self.running = False
+        if intent and intent.main_thread:
+            # State changes are applied here, between frames, where the loop reads that state
+            try:
+                intent.handler(self, **slots)
+            except Exception as e:
+                print(f"[COMMANDS] {intent.name} failed: {e}")
+                self.ui.add_notification(f"CMD FAILED: {intent.name}")
+        elif intent:
+            # Handlers run on the command pool; the frame loop never waits on them
+            self.executor.submit(intent.name, partial(intent.handler, self, **slots),
+                                 limit=intent.limit, timeout=intent.timeout)
+                                 
+    def _read_frame(self):
+        """
+        Grabs, mirrors and converts one camera frame.
+        Returns (frame, rgb_frame) or None if the camera failed.
+        Raises EOFError once a finite source (replay) is exhausted.
+        """
+        with self.timer.stage("capture"):
+            ret, frame = self.source.read()
+        if not ret:
+            if self.source.finished:
+                raise EOFError
+            return None
             
-        elif "enable object" in cmd:
-            if self.vision.toggle(True):
-                self.voice.speak("Object detection enabled.")
+        with self.timer.stage("preprocess"):
+            frame = cv2.flip(frame, 1)
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        return frame, rgb_frame
+        
+    def _poll_keys(self):
+        """Runs the hotkey actions fired since the last frame (never blocks)."""
+        for action in self.hotkeys.poll():
+            if action == "toggle_mouse":
+                self.mouse.paused_by_keyboard = not self.mouse.paused_by_keyboard
+            elif action == "toggle_debug":
+                self.debug_mode = not self.debug_mode
             else:
-                self.voice.speak("Vision module failed to load.")
+                self.process_command(action)
                 
-        elif "disable object" in cmd:
-            self.vision.toggle(False)
-            self.voice.speak("Vision module paused.")
-            
-        elif "register my name is" in cmd:
-            name = cmd.split("name is")[-1].strip()
-            self.registering_user = name
-            self.registration_buffer = []
-            self.voice.speak(f"Please look at the camera. Registering {name}.")
-            
-        elif "open youtube" in cmd:
-            webbrowser.open("https://youtube.com")
-            self.voice.speak("Opening YouTube.")
-            
-        elif "open google" in cmd:
-            webbrowser.open("https://google.com")
-            self.voice.speak("Opening Google.")
-            
-        elif "search for" in cmd:
-            query = cmd.split("search for")[-1].strip()
-            webbrowser.open(f"https://google.com/search?q={query}")
-            self.voice.speak(f"Searching for {query}.")
+    def _handle_hands(self, frame, hand_res, captured_at=None):
+        """
+        Draws the hand skeleton, drives the mouse and menu clicks.
+        captured_at: perf_counter() time of the frame hand_res came from.
+        Returns (mouse_status, cursor_pos).
+        """
+        h, w, _ = frame.shape
+        mouse_status = "NO_HAND"
+        cursor_pos = (0, 0)
+        
+        if hand_res is not None and hand_res.multi_hand_landmarks and not self.is_locked:
+            # Note: MediaPipe assumes mirrored image by default, but we flipped it.
+            # So "Left" is actually Left hand if we flipped.
+            labels = [c.classification[0].label.upper() for c in hand_res.multi_handedness]
+            for lm in hand_res.multi_hand_landmarks:
+                # Draw Skeleton
+                self.mp_draw.draw_landmarks(
+                    frame, 
+                    lm, 
+                    mp.solutions.hands.HAND_CONNECTIONS,
+                    self.mp_draw.DrawingSpec(color=(0,255,255), thickness=2, circle_radius=2),
+                    self.mp_draw.DrawingSpec(color=(255,0,0), thickness=2)
+                )
+                
+            # Update Mouse Logic: all hands in one (H, 21, 3) array
+            hands = np.stack([self.landmarks.normalized(lm.landmark) for lm in hand_res.multi_hand_landmarks])
+            mouse_status = self.mouse.update(hands, labels, (w, h), captured_at)
+            cursor_pos = self.mouse.cursor_pos
             
-        elif "search wikipedia" in cmd:
-            query = cmd.split("wikipedia")[-1].strip()
-            webbrowser.open(f"https://en.wikipedia.org/wiki/{query}")
-            self.voice.speak(f"Searching Wikipedia for {query}.")
+            # Click Actions
+            if "CLICK" in mouse_status:
+                action = self.ui.check_menu_click(cursor_pos)
+                if action:
+                    self.ui.add_notification(f"Menu: {action}")
+                    SoundFx.click()
+                    if action == "YOUTUBE": self.executor.submit("menu_youtube", partial(webbrowser.open, "https://youtube.com"))
+                    elif action == "GOOGLE": self.executor.submit("menu_google", partial(webbrowser.open, "https://google.com"))
+                    elif action == "MUSIC": self.executor.submit("menu_music", partial(webbrowser.open, "https://music.youtube.com"))
+                    elif action == "OBJECTS": 
+                        self.executor.submit("menu_objects", self.vision.toggle, timeout=120,
+                                             on_done=lambda state: self.voice.speak(f"Vision {'enabled' if state else 'disabled'}."))
+        else:
+            # No hands: lets the gesture engine release a held pinch
+            mouse_status = self.mouse.update(np.empty((0, 21, 3), dtype=np.float32), [], (w, h), captured_at)
             
-        elif "enable mouse" in cmd:
-            self.mouse.paused_by_keyboard = False
-            self.voice.speak("Mouse control active.")
+        return mouse_status, cursor_pos
+        
+    def _handle_faces(self, frame, face_res, fresh=True):
+        """
+        Draws face meshes and runs registration / identification.
+        Identities are cached per face track; FaceID only re-runs when the
+        track asks for it (see FaceTrack.needs_verify).
+        fresh=False: face_res was already processed on an earlier render (the
+        face worker hasn't finished a newer frame). It is only drawn again;
+        tracks, votes and the registration buffer are left alone.
+        """
+        h, w, _ = frame.shape
+        faces = face_res.multi_face_landmarks if face_res is not None else None
+        if not faces:
+            if fresh:
+                self.face_tracker.update([], self.frames_rendered)
+            return
             
-        elif "disable mouse" in cmd:
-            self.mouse.paused_by_keyboard = True
-            self.voice.speak("Mouse control paused.")
+        # (N, 2) pixel arrays in reused per-face buffers
+        lms_lists = [self.landmarks.pixels(lm.landmark, (w, h), slot=("face", i)) for i, lm in enumerate(faces)]
+        if fresh:
+            boxes = [(*pts.min(axis=0).tolist(), *pts.max(axis=0).tolist()) for pts in lms_lists]
+            self._face_tracks = self.face_tracker.update(boxes, self.frames_rendered)
+        tracks = self._face_tracks
+        
+        if fresh and not self.registering_user:
+            # One batched FaceID call for every track that is due for verification
+            due = [i for i, t in enumerate(tracks) if t.needs_verify(self.frames_rendered)]
+            if due:
+                with self.timer.stage("face_id"):
+                    matches = self.face_sys.identify_batch([lms_lists[i] for i in due])
+                for i, (raw_name, raw_conf) in zip(due, matches):
+                    tracks[i].vote(raw_name, raw_conf, self.frames_rendered)
+                    
+        for lm, lms_list, track in zip(faces, lms_lists, tracks):
+            # Settled faces get the light contour overlay instead of the full tessellation
+            connections = mp.solutions.face_mesh.FACEMESH_CONTOURS if track.confirmed else mp.solutions.face_mesh.FACEMESH_TESSELATION
+            self.mp_draw.draw_landmarks(frame, lm, connections,
+                None, self.mp_draw.DrawingSpec(color=Config.CYAN_DIM, thickness=1, circle_radius=1))
+                
+            if self.registering_user:
+                if fresh:
+                    self.registration_buffer.append(lms_list.copy())
+                count = len(self.registration_buffer)
+                
+                cv2.putText(frame, f"CALIBRATING: {int((count/Config.REGISTRATION_FRAMES)*100)}%", 
+                           (w//2 - 100, h//2), Config.FONT, 1, Config.ORANGE_WARN, 2)
+                           
+                if count >= Config.REGISTRATION_FRAMES:
+                    success = self.face_sys.register_face(self.registering_user, np.stack(self.registration_buffer))
+                    if success:
+                        self.voice.speak(f"Registration complete. Welcome, {self.registering_user}.")
+                        self.ui.show_greeting(f"WELCOME, {self.registering_user.upper()}")
+                        SoundFx.success()
+                        # Cached identities predate the new enrollment
+                        self.face_tracker.reset()
+                    else:
+                        self.voice.speak("Registration failed. Please try again.")
+                        SoundFx.error()
+                    self.registering_user = None
+                    
+            else:
+                name, conf = track.name, track.conf
+                cx, cy = int(lms_list[1][0]), int(lms_list[1][1])
+                
+                if not track.confirmed:
+                    cv2.putText(frame, "VERIFYING...", (cx, cy - 30), Config.FONT, 0.6, Config.ORANGE_WARN, 1)
+                    continue
+                    
+                if name != "UNKNOWN":
+                    if self.identified_user != name:
+                        self.identified_user = name
+                        self.is_locked = False
+                        self.ui.show_greeting(f"WELCOME BACK, {name.upper()}")
+                        self.voice.speak(f"Welcome back, {name}.", emotion="happy")
+                        SoundFx.success()
+                else:
+                    if Config.LOCK_ON_UNKNOWN and self.identified_user is None:
+                        self.is_locked = True
+                        
+                color = Config.GOLD if name != "UNKNOWN" else Config.RED_ALERT
+                cv2.putText(frame, f"{name} ({int(conf*100)}%)", (cx, cy - 30), Config.FONT, 0.6, color, 1)
+                
+    def _render(self, frame, detections, mouse_status, cursor_pos):
+        h, w, _ = frame.shape
+        
+        # FPS from the median frame interval instead of the last one (less jitter)
+        curr_time = time.perf_counter()
+        if self._prev_time != 0:
+            self.timer.add("frame", curr_time - self._prev_time)
+        self._prev_time = curr_time
+        frame_hist = self.timer.stages.get("frame")
+        p50 = frame_hist.percentiles((50,))[0] if frame_hist else 0
+        fps = 1000.0 / p50 if p50 > 0 else 0
+        
+        with self.timer.stage("ui"):
+            frame = self.ui.update(frame, detections, mouse_status, cursor_pos, fps, self.voice.is_listening, self.is_locked)
             
-        elif "take screenshot" in cmd:
-            ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            path = os.path.join(Config.SCREENSHOT_DIR, f"screenshot_{ts}.png")
-            pyautogui.screenshot(path)
-            self.voice.speak("Screenshot saved.")
-            self.ui.add_notification(f"Saved: {path}")
+        # Draw Cursor
+        if mouse_status not in ["INACTIVE", "NO_HAND", "KEY-PAUSED", "PAUSED (FIST)"]:
+            cv2.circle(frame, cursor_pos, 8, Config.CYAN_HOLO, 2)
+            cv2.circle(frame, cursor_pos, 4, Config.CYAN_HOLO, -1)
             
-        elif "maximize window" in cmd:
-            pyautogui.hotkey('win', 'up')
-            self.voice.speak("Window maximized.")
+        # Debug Overlay
+        if self.debug_mode:
+            y = h - 100
+            cv2.putText(frame, f"DEBUG: Hand={Config.GESTURE_HAND} Status={mouse_status}", (20, y), Config.FONT, 0.5, Config.WHITE, 1)
+            cv2.putText(frame, f"Cursor: {cursor_pos}", (20, y+20), Config.FONT, 0.5, Config.WHITE, 1)
             
-        elif "minimize window" in cmd:
-            pyautogui.hotkey('win', 'down')
-            self.voice.speak("Window minimized.")
+            if self.mouse.debug_info:
+                d = self.mouse.debug_info
+                info = f"Palm: {d.get('palm_size')} | Thresh: {d.get('threshold')} | L: {d.get('dist_left')} | R: {d.get('dist_right')}"
+                cv2.putText(frame, info, (20, y+40), Config.FONT, 0.5, Config.CYAN_HOLO, 1)
+                
+            if self.vision.enabled and detections.detected_index is not None:
+                lag = self.vision.frame_index - detections.detected_index
+                info = (f"YOLO: lag {lag} frames | age {int(detections.age() * 1000)} ms | dropped {self.vision.frames_dropped}"
+                        f" | runs {self.vision.detector_runs}/{self.vision.frames_seen} | tracks {len(self.vision.tracker)}")
+                cv2.putText(frame, info, (20, y+60), Config.FONT, 0.5, Config.CYAN_HOLO, 1)
+                
+            for (rx, ry, rw, rh) in Config.VISION_ROIS:
+                cv2.rectangle(frame, (rx, ry), (rx + rw, ry + rh), Config.CYAN_DIM, 1)
+                
+            self._draw_perf_overlay(frame)
             
-        elif "mute mic" in cmd:
-            self.mic_muted = True
-            self.voice.speak("Microphone muted.")
+        return frame
+        
+    def _draw_perf_overlay(self, frame):
+        """Per-stage p50/p95/p99 table (ms), refreshed every few frames."""
+        if self.frames_rendered % 15 == 0 or not self._perf_rows:
+            self._perf_rows = self.timer.summary()
             
-        elif "unmute mic" in cmd:
-            self.mic_muted = False
-            self.voice.speak("Microphone online.")
+        x, y = 20, 210
+        cv2.putText(frame, f"{'STAGE':<11}{'P50':>7}{'P95':>7}{'P99':>7}", (x, y), Config.FONT, 0.45, Config.GOLD, 1)
+        for name, _, _, p50, p95, p99, _ in self._perf_rows:
+            y += 18
+            cv2.putText(frame, f"{name:<11}{p50:>7.1f}{p95:>7.1f}{p99:>7.1f}", (x, y), Config.FONT, 0.45, Config.WHITE, 1)
             
-        elif "battery status" in cmd:
-            batt = psutil.sensors_battery()
-            if batt:
-                self.voice.speak(f"Battery is at {batt.percent} percent.")
-            else:
-                self.voice.speak("System is running on AC power.")
+        tc = GraphicsUtils.text_cache.stats()
+        cv2.putText(frame, f"TEXT CACHE: {tc['hit_rate'] * 100:.0f}% hits | {tc['entries']} sprites | {tc['bytes'] // 1024} KB",
+                    (x, y + 22), Config.FONT, 0.45, Config.GOLD, 1)
+                    
+    def _dispatch_voice(self):
+        self.executor.poll(self.ui.add_notification)
+        cmd = self.voice.get_command()
+        if cmd:
+            with self.timer.stage("commands"):
+                self.process_command(cmd)
                 
-        elif "time" in cmd:
-            now = datetime.datetime.now().strftime("%I:%M %p")
-            self.voice.speak(f"It is {now}.")
+    def _display(self, frame):
+        """
+        Shows the frame. Returns False when the user asked to quit
+        or the frame budget (max_frames) is used up.
+        """
+        self.frames_rendered += 1
+        if self.max_frames is not None and self.frames_rendered >= self.max_frames:
+            return False
+        if self.headless:
+            return True
             
-        elif "date" in cmd:
-            today = datetime.datetime.now().strftime("%A, %B %d")
-            self.voice.speak(f"Today is {today}.")
-
-    def run(self):
-        prev_time = 0
+        with self.timer.stage("display"):
+            cv2.imshow(Config.APP_NAME, frame)
+            key = cv2.waitKey(1) & 0xFF
+        return key != ord('q')
         
+    def _run_sequential(self):
         while self.running:
-            ret, frame = self.cap.read()
-            if not ret:
+            try:
+                item = self._read_frame()
+            except EOFError:
+                break
+            if item is None:
                 print("[SYSTEM] Camera Error.")
                 time.sleep(1)
                 continue
                 
-            frame = cv2.flip(frame, 1)
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            h, w, _ = frame.shape
-            
-            # Key Handling
-            if keyboard.is_pressed('esc'):
-                self.mouse.paused_by_keyboard = not self.mouse.paused_by_keyboard
-                time.sleep(0.3)
-            
-            if keyboard.is_pressed('d'):
-                self.debug_mode = not self.debug_mode
-                time.sleep(0.3)
+            frame, rgb_frame = item
+            self._poll_keys()
             
             # 1. Hands & Mouse
-            # Process once per frame
-            hand_res = self.mp_hands.process(rgb_frame)
-            mouse_status = "NO_HAND"
-            cursor_pos = (0, 0)
+            with self.timer.stage("hands"):
+                hand_res = self.mp_hands.process(rgb_frame)
+            mouse_status, cursor_pos = self._handle_hands(frame, hand_res)
             
-            if hand_res.multi_hand_landmarks and not self.is_locked:
-                for idx, lm in enumerate(hand_res.multi_hand_landmarks):
-                    # Handedness Check
-                    handedness = hand_res.multi_handedness[idx].classification[0].label
-                    # Note: MediaPipe assumes mirrored image by default, but we flipped it.
-                    # So "Left" is actually Left hand if we flipped.
-                    
-                    target_hand = Config.GESTURE_HAND
-                    if target_hand != "BOTH":
-                        if target_hand != handedness.upper():
-                            continue
-
-                    # Draw Skeleton
-                    self.mp_draw.draw_landmarks(
-                        frame, 
-                        lm, 
-                        mp.solutions.hands.HAND_CONNECTIONS,
-                        self.mp_draw.DrawingSpec(color=(0,255,255), thickness=2, circle_radius=2),
-                        self.mp_draw.DrawingSpec(color=(255,0,0), thickness=2)
-                    )
-                    
-                    # Update Mouse Logic
-                    mouse_status = self.mouse.update(lm.landmark, (w, h))
-                    cursor_pos = self.mouse.cursor_pos
-                    
-                    # Click Actions
-                    if "CLICK" in mouse_status:
-                        action = self.ui.check_menu_click(cursor_pos)
-                        if action:
-                            self.ui.add_notification(f"Menu: {action}")
-                            SoundFx.click()
-                            if action == "YOUTUBE": webbrowser.open("https://youtube.com")
-                            elif action == "GOOGLE": webbrowser.open("https://google.com")
-                            elif action == "MUSIC": webbrowser.open("https://music.youtube.com")
-                            elif action == "OBJECTS": 
-                                state = self.vision.toggle()
-                                self.voice.speak(f"Vision {'enabled' if state else 'disabled'}.")
-                    
-                    # Only process one hand if not BOTH
-                    if target_hand != "BOTH":
-                        break
-            else:
-                mouse_status = "NO_HAND" if not self.mouse.paused_by_keyboard else "KEY-PAUSED"
-
             # 2. Face ID
-            face_res = self.mp_face_mesh.process(rgb_frame)
-            if face_res.multi_face_landmarks:
-                for lm in face_res.multi_face_landmarks:
-                    self.mp_draw.draw_landmarks(frame, lm, mp.solutions.face_mesh.FACEMESH_TESSELATION,
-                        None, self.mp_draw.DrawingSpec(color=Config.CYAN_DIM, thickness=1, circle_radius=1))
-                    
-                    lms_list = [(p.x * w, p.y * h) for p in lm.landmark]
-                    
-                    if self.registering_user:
-                        self.registration_buffer.append(lms_list)
-                        count = len(self.registration_buffer)
-                        
-                        cv2.putText(frame, f"CALIBRATING: {int((count/Config.REGISTRATION_FRAMES)*100)}%", 
-                                   (w//2 - 100, h//2), Config.FONT, 1, Config.ORANGE_WARN, 2)
-                        
-                        if count >= Config.REGISTRATION_FRAMES:
-                            success = self.face_sys.register_face(self.registering_user, self.registration_buffer)
-                            if success:
-                                self.voice.speak(f"Registration complete. Welcome, {self.registering_user}.")
-                                self.ui.show_greeting(f"WELCOME, {self.registering_user.upper()}")
-                                SoundFx.success()
-                            else:
-                                self.voice.speak("Registration failed. Please try again.")
-                                SoundFx.error()
-                            self.registering_user = None
-                            
-                    else:
-                        name, conf = self.face_sys.identify(lms_list)
-                        
-                        if name != "UNKNOWN":
-                            if self.identified_user != name:
-                                self.identified_user = name
-                                self.is_locked = False
-                                self.ui.show_greeting(f"WELCOME BACK, {name.upper()}")
-                                self.voice.speak(f"Welcome back, {name}.", emotion="happy")
-                                SoundFx.success()
-                        else:
-                            if Config.LOCK_ON_UNKNOWN and self.identified_user is None:
-                                self.is_locked = True
-                            
-                        cx, cy = int(lms_list[1][0]), int(lms_list[1][1])
-                        color = Config.GOLD if name != "UNKNOWN" else Config.RED_ALERT
-                        cv2.putText(frame, f"{name} ({int(conf*100)}%)", (cx, cy - 30), Config.FONT, 0.6, color, 1)
+            with self.timer.stage("faces"):
+                face_res = self.mp_face_mesh.process(rgb_frame)
+            self._handle_faces(frame, face_res)
             
             # 3. Vision
-            detections = self.vision.detect(frame)
-            
-            # 4. UI
-            curr_time = time.time()
-            fps = 1 / (curr_time - prev_time) if prev_time != 0 else 0
-            prev_time = curr_time
-            
-            frame = self.ui.update(frame, detections, mouse_status, cursor_pos, fps, self.voice.is_listening, self.is_locked)
-            
-            # Draw Cursor
-            if mouse_status not in ["INACTIVE", "NO_HAND", "KEY-PAUSED", "PAUSED (FIST)"]:
-                cv2.circle(frame, cursor_pos, 8, Config.CYAN_HOLO, 2)
-                cv2.circle(frame, cursor_pos, 4, Config.CYAN_HOLO, -1)
-                
-            # Debug Overlay
-            if self.debug_mode:
-                y = h - 100
-                cv2.putText(frame, f"DEBUG: Hand={Config.GESTURE_HAND} Status={mouse_status}", (20, y), Config.FONT, 0.5, Config.WHITE, 1)
-                cv2.putText(frame, f"Cursor: {cursor_pos}", (20, y+20), Config.FONT, 0.5, Config.WHITE, 1)
+            with self.timer.stage("vision"):
+                detections = self.vision.detect(frame)
                 
-                if self.mouse.debug_info:
-                    d = self.mouse.debug_info
-                    info = f"Palm: {d.get('palm_size')} | Thresh: {d.get('threshold')} | L: {d.get('dist_left')} | R: {d.get('dist_right')}"
-                    cv2.putText(frame, info, (20, y+40), Config.FONT, 0.5, Config.CYAN_HOLO, 1)
+            # 4. UI
+            frame = self._render(frame, detections, mouse_status, cursor_pos)
             
             # 5. Voice
-            cmd = self.voice.get_command()
-            if cmd:
-                self.process_command(cmd)
+            self._dispatch_voice()
             
-            cv2.imshow(Config.APP_NAME, frame)
-            if cv2.waitKey(1) & 0xFF == ord('q'):
+            if not self._display(frame):
                 break
                 
-        self.cap.release()
-        cv2.destroyAllWindows()
+    def _run_pipelined(self):
+        """
+        Capture, hands, face mesh and YOLO each run on their own thread.
+        This thread only composes the freshest results onto the newest frame,
+        so a slow detector no longer holds back the HUD or the cursor.
+        """
+        def timed(name, fn):
+            def _run(packet):
+                with self.timer.stage(name):
+                    return fn(packet)
+            return _run
+            
+        pipeline = FramePipeline(self._read_frame, {
+            "hands": timed("hands", lambda p: (p.timestamp, self.mp_hands.process(p.rgb))),
+            "faces": timed("faces", lambda p: self.mp_face_mesh.process(p.rgb)),
+            # Packet frames are never drawn on (render works on a copy), so YOLO reads them as-is
+            "vision": timed("vision", lambda p: self.vision.detect(p.frame, p.index, shared=False)),
+        })
+        pipeline.start()
+        
+        try:
+            while self.running:
+                packet = pipeline.next_frame(timeout=0.5)
+                if packet is None:
+                    if pipeline.finished.is_set():
+                        break
+                    continue
+                    
+                # Workers still read packet.frame, so draw on a private copy.
+                frame = GraphicsUtils.pool.copy("render", packet.frame)
+                self._poll_keys()
+                
+                _, (hand_ts, hand_res) = pipeline.result("hands", (None, None))
+                mouse_status, cursor_pos = self._handle_hands(frame, hand_res, hand_ts)
+                
+                # The face worker is slower than the render loop: process each result once
+                face_idx, face_res = pipeline.result("faces")
+                self._handle_faces(frame, face_res, fresh=face_idx != self._last_face_index)
+                self._last_face_index = face_idx
+                
+                _, detections = pipeline.result("vision", Detections())
+                
+                frame = self._render(frame, detections, mouse_status, cursor_pos)
+                self._dispatch_voice()
+                
+                if not self._display(frame):
+                    break
+        finally:
+            pipeline.stop()
+            for name, count in pipeline.dropped_frames().items():
+                if count:
+                    print(f"[PIPELINE] {name}: {count} stale frames dropped")
+                    
+    def run(self):
+        self._prev_time = 0
+        start = time.perf_counter()
+        
+        if Config.PIPELINE_MODE:
+            self._run_pipelined()
+        else:
+            self._run_sequential()
+            
+        elapsed = time.perf_counter() - start
+        self.source.release()
+        self.face_sys.close()
+        self.telemetry.stop()
+        self.executor.stop()
+        self.hotkeys.stop()
+        self.mouse.stop()
+        if Config.PERF_DUMP_ON_EXIT:
+            ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+            self.timer.dump(os.path.join(Config.LOGS_DIR, f"perf_{ts}"))
+        if self.headless:
+            self.timer.report(self.frames_rendered, elapsed)
+        else:
+            cv2.destroyAllWindows()
         sys.exit(0)
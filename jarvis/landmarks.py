@@ -0,0 +1,33 @@
+import numpy as np
+from itertools import chain
+from operator import attrgetter
+
+_XYZ = attrgetter("x", "y", "z")
+
+class LandmarkConverter:
+    """
+    Turns MediaPipe landmark lists into NumPy arrays once per frame.
+    normalized() -> (N,3) float32 [x, y, z] in 0..1 image units.
+    pixels()     -> (N,2) float32 pixel coordinates, written into a buffer that
+                    is reused per slot, so callers that keep it must copy().
+    """
+    def __init__(self):
+        self._buffers = {}
+
+    @staticmethod
+    def normalized(landmarks):
+        n = len(landmarks)
+        flat = np.fromiter(chain.from_iterable(map(_XYZ, landmarks)), dtype=np.float32, count=3 * n)
+        return flat.reshape(n, 3)
+
+    def pixels(self, landmarks, size, slot=0):
+        """
+        size: (width, height) of the frame.
+        slot: buffer key, one per simultaneously used array (e.g. face index).
+        """
+        pts = self.normalized(landmarks)
+        buf = self._buffers.get(slot)
+        if buf is None or buf.shape[0] != len(pts):
+            buf = self._buffers[slot] = np.empty((len(pts), 2), dtype=np.float32)
+        np.multiply(pts[:, :2], np.asarray(size, dtype=np.float32), out=buf)
+        return buf
@@ -0,0 +1,57 @@
+import cv2
+import numpy as np
+
+class Letterbox:
+    """
+    Fits one frame region into a preallocated size x size detector input.
+    The region is resized (aspect kept) straight into the padded canvas, so no
+    per-frame buffers are allocated; unmap() sends boxes back to frame space.
+    """
+    PAD_VALUE = 114 # ultralytics' letterbox grey
+
+    def __init__(self, size, rect):
+        """
+        size: detector input edge in px (e.g. 320, 416, 640).
+        rect: (x, y, w, h) region of the frame to feed the detector.
+        """
+        self.size = size
+        self.rect = rect
+        x, y, w, h = rect
+        self.scale = min(size / w, size / h)
+        self.new_w = max(1, int(round(w * self.scale)))
+        self.new_h = max(1, int(round(h * self.scale)))
+        self.pad_x = (size - self.new_w) // 2
+        self.pad_y = (size - self.new_h) // 2
+
+        self.canvas = np.full((size, size, 3), self.PAD_VALUE, dtype=np.uint8)
+        self._dst = self.canvas[self.pad_y:self.pad_y + self.new_h, self.pad_x:self.pad_x + self.new_w]
+
+    def apply(self, frame):
+        """Writes the region of `frame` into the canvas and returns the canvas."""
+        x, y, w, h = self.rect
+        cv2.resize(frame[y:y + h, x:x + w], (self.new_w, self.new_h), dst=self._dst,
+                   interpolation=cv2.INTER_AREA if self.scale < 1 else cv2.INTER_LINEAR)
+        return self.canvas
+
+    def unmap(self, boxes):
+        """Maps (N,4) xyxy canvas boxes to frame coordinates, in place."""
+        x, y, w, h = self.rect
+        boxes[:, [0, 2]] = (boxes[:, [0, 2]] - self.pad_x) / self.scale + x
+        boxes[:, [1, 3]] = (boxes[:, [1, 3]] - self.pad_y) / self.scale + y
+        boxes[:, [0, 2]] = np.clip(boxes[:, [0, 2]], x, x + w)
+        boxes[:, [1, 3]] = np.clip(boxes[:, [1, 3]], y, y + h)
+        return boxes
+
+def build_letterboxes(frame_shape, size, rois):
+    """
+    One Letterbox per ROI (x, y, w, h), clipped to the frame.
+    An empty ROI list means the whole frame.
+    """
+    fh, fw = frame_shape[:2]
+    rects = []
+    for x, y, w, h in (rois or [(0, 0, fw, fh)]):
+        x, y = max(0, int(x)), max(0, int(y))
+        w, h = min(int(w), fw - x), min(int(h), fh - y)
+        if w > 0 and h > 0:
+            rects.append((x, y, w, h))
+    return [Letterbox(size, r) for r in rects]
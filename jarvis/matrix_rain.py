@@ -1,50 +1,82 @@
 import cv2
 import numpy as np
-import random
 from .config import Config
 
 class MatrixRain:
     """
-    Optimized Matrix Rain effect using numpy operations where possible.
+    Glyph-atlas Matrix Rain.
+    The 16 glyphs are rasterized once per cell size into a sparse atlas (lit
+    pixel offsets + blend weights); drops advance as one NumPy array, and each
+    frame only the pixels under a glyph are gathered, blended and written back
+    (no full-frame copy or blend).
+    Columns scale with the frame (MATRIX_COLUMNS across), MATRIX_DENSITY
+    sets the share of columns that carry a drop.
     """
+    CHARS = "0123456789ABCDEF"
+    SPARKLE_CHANCE = 0.05
+    RESET_CHANCE = 0.02
+
     def __init__(self):
         self.width = Config.WIDTH
         self.height = Config.HEIGHT
-        self.drops = np.random.randint(0, self.height // 20, size=(self.width // 20))
-        self.chars = list("0123456789ABCDEF")
-        
+        self.rng = np.random.default_rng()
+        self._build(self.height, self.width)
+
+    def _build(self, height, width):
+        """(Re)creates the atlas and drops for a frame size."""
+        self.height, self.width = height, width
+        self.cell = max(8, width // max(1, Config.MATRIX_COLUMNS))
+        cols = width // self.cell
+
+        self.drops = self.rng.integers(0, max(1, height // self.cell), size=cols)
+        self.active = self.rng.random(cols) < Config.MATRIX_DENSITY
+        self.col_x = np.arange(cols) * self.cell
+
+        # Atlas: per glyph the (dy, dx) of its lit pixels and their blend weights,
+        # padded to a common length by repeating the last pixel (same write twice)
+        scale = 0.4 * self.cell / 20
+        (_, th), _ = cv2.getTextSize("0", Config.FONT, scale, 1)
+        self.baseline = min(self.cell - 1, (self.cell + th) // 2) # glyph baseline inside its cell
+        masks = np.zeros((len(self.CHARS), self.cell, self.cell), dtype=np.uint8)
+        for i, ch in enumerate(self.CHARS):
+            cv2.putText(masks[i], ch, (0, self.baseline), Config.FONT, scale, 255, 1)
+        lit = [np.nonzero(m) for m in masks]
+        size = max(len(ys) for ys, _ in lit)
+        pad = lambda a: np.concatenate([a, np.repeat(a[-1:], size - len(a))])
+        self.glyph_dy = np.array([pad(ys) for ys, _ in lit])
+        self.glyph_dx = np.array([pad(xs) for _, xs in lit])
+        weights = np.array([pad(m[ys, xs]) for m, (ys, xs) in zip(masks, lit)], dtype=np.float32)
+        self.glyph_w = (weights * (Config.MATRIX_OPACITY / 255.0))[..., None] # (glyphs, pixels, 1)
+        self.colors = np.array([Config.GREEN_OK, Config.WHITE], dtype=np.float32)[:, None, :] # normal, sparkle
+
     def update(self, img):
         """
-        Updates the matrix rain effect on the provided image.
+        Updates the matrix rain effect on the provided image (in place).
         """
-        # Create a separate layer for the rain to allow alpha blending
-        overlay = img.copy()
-        
-        # Loop through drops
-        for i in range(len(self.drops)):
-            # Random character
-            char = random.choice(self.chars)
-            x = i * 20
-            y = self.drops[i] * 20
-            
-            # Draw character
-            # Only draw if on screen
-            if y < self.height + 20:
-                # Color variation for "tail" effect
-                color = Config.GREEN_OK
-                if random.random() > 0.95:
-                    color = Config.WHITE # Sparkle
-                
-                cv2.putText(overlay, char, (x, y), Config.FONT, 0.4, color, 1)
-            
-            # Reset drop
-            if y > self.height:
-                if random.random() > 0.98: # Random reset
-                    self.drops[i] = 0
-            else:
-                self.drops[i] += Config.MATRIX_SPEED
-                
-        # Blend overlay with original image
-        # Use addWeighted for transparency
-        cv2.addWeighted(overlay, Config.MATRIX_OPACITY, img, 1.0 - Config.MATRIX_OPACITY, 0, img)
+        h, w = img.shape[:2]
+        if (h, w) != (self.height, self.width):
+            self._build(h, w)
+
+        n = len(self.drops)
+        y = self.drops * self.cell
+
+        # Visible glyph cells: the text baseline sits at y, like the original putText rain
+        top = y - self.baseline
+        draw = self.active & (top >= 0) & (top + self.cell <= h)
+        idx = np.flatnonzero(draw)
+        if len(idx):
+            glyphs = self.rng.integers(0, len(self.CHARS), len(idx))
+            sparkle = (self.rng.random(len(idx)) < self.SPARKLE_CHANCE).astype(np.intp)
+
+            rows = top[idx, None] + self.glyph_dy[glyphs]          # (k, pixels)
+            cols = self.col_x[idx, None] + self.glyph_dx[glyphs]
+            px = img[rows, cols].astype(np.float32)                # (k, pixels, 3)
+            px += (self.colors[sparkle] - px) * self.glyph_w[glyphs]
+            img[rows, cols] = px.round().astype(np.uint8)
+
+        # Advance drops; off-screen ones restart at random
+        off = y > h
+        reset = off & (self.rng.random(n) < self.RESET_CHANCE)
+        self.drops[reset] = 0
+        self.drops[~off] += Config.MATRIX_SPEED
         return img
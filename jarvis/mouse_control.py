@@ -1,125 +1,149 @@
 import pyautogui
 import numpy as np
 import time
-import math
-from collections import deque
 from .config import Config
+from .cursor_output import CursorOutput
+from .gestures import GestureEngine
 
 class MouseController:
     """
     Handles Hand-to-Mouse interaction with advanced smoothing and safety checks.
+    Gestures come from the GestureEngine; the OS cursor is moved by a
+    CursorOutput thread, so update() only feeds it timestamped samples and
+    button / scroll / zoom actions.
     """
-    def __init__(self):
-        self.screen_w, self.screen_h = pyautogui.size()
-        self.x_history = deque(maxlen=Config.MOUSE_SMOOTHING)
-        self.y_history = deque(maxlen=Config.MOUSE_SMOOTHING)
+    def __init__(self, dry_run=False):
+        # dry_run: track gestures but never touch the real cursor (headless / replay)
+        self.dry_run = dry_run
+        if dry_run:
+            self.screen_w, self.screen_h = Config.WIDTH, Config.HEIGHT
+        else:
+            self.screen_w, self.screen_h = pyautogui.size()
+        self.output = CursorOutput((self.screen_w, self.screen_h), dry_run=dry_run).start()
         
         self.active = False
         self.last_click_time = 0
         self.cursor_pos = (0, 0)
         self.paused_by_keyboard = False
         self.debug_info = {}
+        self._last_sample = (None, None) # (timestamp, status) of the last processed hand sample
+        self.gestures = GestureEngine()
+        self.pressed = False             # left button held down by a pinch
+        
+    def stop(self):
+        self.output.stop()
         
     def check_permissions(self):
         """
         Checks if pyautogui has screen access.
         """
+        if self.dry_run:
+            return True
         try:
             # Attempt a safe read operation
             pyautogui.position()
             return True
         except Exception:
             return False
-
-    def update(self, landmarks, frame_shape):
+            
+    def update(self, hands, labels, frame_shape, timestamp=None):
         """
-        Updates mouse position based on hand landmarks.
+        Updates the mouse from every tracked hand.
+        hands: (H, 21, 3) normalized landmarks (LandmarkConverter); labels: H handedness strings.
         frame_shape: (width, height)
+        timestamp: time.perf_counter() of the camera frame (defaults to now).
+                   A sample already seen (same timestamp) is not processed twice.
+        The GESTURE_HAND hand drives the cursor; any two hands can zoom.
         Returns status string.
         """
         if self.paused_by_keyboard:
+            self._release()
+            self.output.hold()
             return "KEY-PAUSED"
             
-        w, h = frame_shape # Corrected geometry
-        
-        index_tip = landmarks[8]
-        thumb_tip = landmarks[4]
-        middle_tip = landmarks[12]
-        ring_tip = landmarks[16]
-        pinky_tip = landmarks[20]
-        
-        # Safety: Check if fist (All fingertips below PIP joints)
-        # 0=Wrist, 1-4=Thumb, 5-8=Index, 9-12=Middle, 13-16=Ring, 17-20=Pinky
-        # PIP joints are 6, 10, 14, 18
-        fingers_open = 0
-        if index_tip.y < landmarks[6].y: fingers_open += 1
-        if middle_tip.y < landmarks[10].y: fingers_open += 1
-        if ring_tip.y < landmarks[14].y: fingers_open += 1
-        if pinky_tip.y < landmarks[18].y: fingers_open += 1
+        t = timestamp if timestamp is not None else time.perf_counter()
+        if t == self._last_sample[0]:
+            status = self._last_sample[1]
+            return "ACTIVE" if "CLICK" in status else status # a click fires once
+        status = self._process(hands, labels, frame_shape, t)
+        self._last_sample = (t, status)
+        return status
+        
+    def _release(self):
+        if self.pressed:
+            self.output.release()
+            self.pressed = False
+            
+    def _process(self, hands, labels, frame_shape, t):
+        gestures, events = self.gestures.update(hands, labels, frame_shape, t)
+        
+        target = Config.GESTURE_HAND
+        hand = next((g for g in gestures if target == "BOTH" or g.label == target), None)
+        label = hand.label if hand is not None else None
+        status = None
+        for who, name, value in events:
+            if name == "zoom":
+                self.output.zoom(value * Config.GESTURE_SCROLL_CLICKS)
+                status = "ZOOM"
+            elif who != label:
+                continue
+            elif name == "press":
+                # Only a button that went down gets a mouseUp later
+                if self.output.press(t):
+                    self.pressed = True
+                    self.last_click_time = t
+                    status = "L-CLICK"
+            elif name == "release":
+                self._release()
+            elif name == "drag":
+                self.output.unpin() # the cursor follows the hand with the button held
+                status = "DRAG"
+            elif name == "right_click":
+                self.output.click(t, "right")
+                self.last_click_time = t
+                status = "R-CLICK"
+            elif name == "scroll":
+                self.output.scroll(value * Config.GESTURE_SCROLL_CLICKS)
+                
+        if hand is None:
+            self._release()
+            self.active = False
+            return "NO_HAND"
+            
+        self.debug_info = {
+            "palm_size": int(hand.palm_size),
+            "threshold": int(hand.threshold),
+            "dist_left": int(hand.pinch_dist),
+            "dist_right": int(hand.right_dist),
+            "gesture": hand.state,
+        }
         
-        if fingers_open == 0: # Strict fist check
+        # Safety: a fist pauses the cursor
+        if hand.state == "fist":
             self.active = False
+            self.output.hold()
             return "PAUSED (FIST)"
             
         self.active = True
         
-        # Movement
-        x1 = index_tip.x * w
-        y1 = index_tip.y * h
-        
+        # Movement: index fingertip, with a FRAME_REDUCTION margin mapped to the screen edges
+        w, h = frame_shape
         r = Config.FRAME_REDUCTION
-        x_clamped = np.clip(x1, r, w - r)
-        y_clamped = np.clip(y1, r, h - r)
+        x_clamped = np.clip(hand.pointer[0], r, w - r)
+        y_clamped = np.clip(hand.pointer[1], r, h - r)
         
         screen_x = np.interp(x_clamped, (r, w - r), (0, self.screen_w))
         screen_y = np.interp(y_clamped, (r, h - r), (0, self.screen_h))
         
-        self.x_history.append(screen_x)
-        self.y_history.append(screen_y)
-        
-        avg_x = sum(self.x_history) / len(self.x_history)
-        avg_y = sum(self.y_history) / len(self.y_history)
-        
-        self.cursor_pos = (int(avg_x), int(avg_y))
-        
-        try:
-            pyautogui.moveTo(avg_x, avg_y, _pause=False)
-        except pyautogui.FailSafeException:
-            pass 
-        
-        # Clicks
-        dist_left = math.hypot(x1 - thumb_tip.x * w, y1 - thumb_tip.y * h)
-        dist_right = math.hypot((middle_tip.x * w) - (thumb_tip.x * w), (middle_tip.y * h) - (thumb_tip.y * h))
-        
-        # Dynamic Threshold based on hand distance (Palm size approximation)
-        # Distance between Wrist (0) and Middle MCP (9)
-        wrist = landmarks[0]
-        middle_mcp = landmarks[9]
-        palm_size = math.hypot((wrist.x - middle_mcp.x)*w, (wrist.y - middle_mcp.y)*h)
-        
-        # Normalize palm size (approx 100-200px usually)
-        # If palm is large (close), threshold should be larger
-        # If palm is small (far), threshold should be smaller
-        
-        dynamic_threshold = Config.CLICK_THRESHOLD * (palm_size / 80.0) 
-        dynamic_threshold = max(15, min(dynamic_threshold, 70))
-        
-        self.debug_info = {
-            "palm_size": int(palm_size),
-            "threshold": int(dynamic_threshold),
-            "dist_left": int(dist_left),
-            "dist_right": int(dist_right)
-        }
-        
-        curr_time = time.time()
-        if curr_time - self.last_click_time > Config.CLICK_COOLDOWN:
-            if dist_left < dynamic_threshold:
-                pyautogui.click()
-                self.last_click_time = curr_time
-                return "L-CLICK"
-            elif dist_right < dynamic_threshold:
-                pyautogui.rightClick()
-                self.last_click_time = curr_time
-                return "R-CLICK"
-                
-        return "ACTIVE"
+        # One-Euro filtered; the output thread moves the real cursor
+        self.output.push(t, float(screen_x), float(screen_y))
+        if hand.state in ("scroll", "zoom"):
+            self.output.pin()
+        elif hand.state == "point":
+            self.output.unpin()
+        pos = self.output.current()
+        self.cursor_pos = (int(pos[0]), int(pos[1]))
+        
+        if status is None:
+            status = {"drag": "DRAG", "scroll": "SCROLL", "zoom": "ZOOM"}.get(hand.state, "ACTIVE")
+        return status
@@ -0,0 +1,92 @@
+import csv
+import json
+import threading
+import time
+import numpy as np
+from collections import deque
+from contextlib import contextmanager
+from .config import Config
+
+class LatencyHistogram:
+    """
+    Rolling window of the most recent samples (ms) for one stage,
+    plus lifetime call count and total for throughput reports.
+    """
+    def __init__(self, window=Config.PERF_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, ms):
+        self.samples.append(ms)
+        self.count += 1
+        self.total += ms
+
+    def percentiles(self, qs=(50, 95, 99)):
+        if not self.samples:
+            return tuple(0.0 for _ in qs)
+        return tuple(np.percentile(np.fromiter(self.samples, dtype=np.float64), qs))
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+class StageTimer:
+    """
+    Per-stage latency instrumentation on a monotonic clock.
+    Thread-safe, so pipeline workers can report into the same timer.
+    """
+    COLUMNS = ["stage", "calls", "mean_ms", "p50_ms", "p95_ms", "p99_ms", "total_s"]
+
+    def __init__(self, window=Config.PERF_WINDOW):
+        self.lock = threading.Lock()
+        self.window = window
+        self.stages = {}
+
+    def add(self, name, seconds):
+        with self.lock:
+            hist = self.stages.get(name)
+            if hist is None:
+                hist = self.stages[name] = LatencyHistogram(self.window)
+            hist.add(seconds * 1000.0)
+
+    @contextmanager
+    def stage(self, name):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - t0)
+
+    def summary(self):
+        """
+        One row per stage in first-seen order:
+        (stage, calls, mean_ms, p50_ms, p95_ms, p99_ms, total_s).
+        Percentiles cover the rolling window, mean/total the whole run.
+        """
+        with self.lock:
+            rows = []
+            for name, hist in self.stages.items():
+                p50, p95, p99 = hist.percentiles()
+                rows.append((name, hist.count, hist.mean(), p50, p95, p99, hist.total / 1000.0))
+            return rows
+
+    def report(self, frames, elapsed):
+        fps = frames / elapsed if elapsed > 0 else 0.0
+        print(f"[BENCH] {frames} frames in {elapsed:.2f}s -> {fps:.1f} FPS")
+        print(f"[BENCH] {'stage':<12}{'calls':>8}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'total s':>10}")
+        for name, calls, mean, p50, p95, p99, total in self.summary():
+            print(f"[BENCH] {name:<12}{calls:>8}{mean:>9.2f}{p50:>9.2f}{p95:>9.2f}{p99:>9.2f}{total:>10.2f}")
+
+    def dump(self, base_path):
+        """Writes the summary to <base_path>.json and <base_path>.csv."""
+        rows = [(r[0], r[1], *(round(v, 3) for v in r[2:])) for r in self.summary()]
+        try:
+            with open(base_path + ".json", 'w') as f:
+                json.dump([dict(zip(self.COLUMNS, r)) for r in rows], f, indent=4)
+            with open(base_path + ".csv", 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(self.COLUMNS)
+                writer.writerows(rows)
+            print(f"[PERF] Stage timings saved to {base_path}.json/.csv")
+        except Exception as e:
+            print(f"[PERF] Error saving timings: {e}")
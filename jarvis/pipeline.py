@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import namedtuple
+
+FramePacket = namedtuple("FramePacket", ["index", "timestamp", "frame", "rgb"])
+
+class LatestSlot:
+    """
+    Bounded (size 1) mailbox between pipeline stages.
+    Writers never block: an unread item is overwritten and counted as dropped,
+    so a slow consumer always sees the freshest frame instead of a backlog.
+    """
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._item = None
+        self._last = None
+        self._closed = False
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if self._item is not None:
+                self.dropped += 1
+            self._item = item
+            self._last = item
+            self._cond.notify_all()
+
+    def get(self, timeout=None):
+        """
+        Takes the pending item, waiting up to `timeout` seconds.
+        Returns None on timeout or when the slot is closed.
+        """
+        with self._cond:
+            if self._item is None and not self._closed:
+                self._cond.wait(timeout)
+            item = self._item
+            self._item = None
+            return item
+
+    def peek(self):
+        """Returns the most recent item without consuming it."""
+        with self._cond:
+            return self._last
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+class FramePipeline:
+    """
+    Staged capture -> inference -> render pipeline.
+    One capture thread fans each frame out to every inference worker and to the
+    render stage through LatestSlots. Workers run in parallel and publish their
+    newest result; the render stage (caller's thread) combines whatever is freshest.
+    """
+    def __init__(self, capture_fn, workers):
+        """
+        capture_fn: () -> (frame, rgb), None on camera failure,
+                    or raises EOFError when a finite source runs dry.
+        workers: dict of name -> fn(packet) returning that stage's result.
+        """
+        self.capture_fn = capture_fn
+        self.workers = workers
+
+        self.render_slot = LatestSlot()
+        self.in_slots = {name: LatestSlot() for name in workers}
+        self.out_slots = {name: LatestSlot() for name in workers}
+
+        self.frame_index = 0
+        self.finished = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start(self):
+        self._stop.clear()
+        self._threads = [threading.Thread(target=self._capture_loop, name="jarvis-capture", daemon=True)]
+        for name, fn in self.workers.items():
+            t = threading.Thread(target=self._worker_loop, args=(name, fn), name=f"jarvis-{name}", daemon=True)
+            self._threads.append(t)
+        for t in self._threads:
+            t.start()
+
+    def stop(self):
+        self._stop.set()
+        for slot in [self.render_slot, *self.in_slots.values(), *self.out_slots.values()]:
+            slot.close()
+        for t in self._threads:
+            t.join(timeout=2)
+        self._threads = []
+
+    def _capture_loop(self):
+        while not self._stop.is_set():
+            try:
+                item = self.capture_fn()
+            except EOFError:
+                self.finished.set()
+                return
+            if item is None:
+                print("[SYSTEM] Camera Error.")
+                time.sleep(1)
+                continue
+
+            frame, rgb = item
+            self.frame_index += 1
+            packet = FramePacket(self.frame_index, time.perf_counter(), frame, rgb)
+
+            for slot in self.in_slots.values():
+                slot.put(packet)
+            self.render_slot.put(packet)
+
+    def _worker_loop(self, name, fn):
+        in_slot = self.in_slots[name]
+        out_slot = self.out_slots[name]
+
+        while not self._stop.is_set():
+            packet = in_slot.get(timeout=0.1)
+            if packet is None:
+                continue
+            try:
+                out_slot.put((packet.index, fn(packet)))
+            except Exception as e:
+                print(f"[PIPELINE] {name} worker error: {e}")
+
+    def next_frame(self, timeout=0.1):
+        """Blocks until a frame newer than the last rendered one is available."""
+        return self.render_slot.get(timeout)
+
+    def result(self, name, default=None):
+        """
+        Latest finished result of a worker as (frame_index, value).
+        Returns (None, default) until the worker has produced anything.
+        """
+        latest = self.out_slots[name].peek()
+        if latest is None:
+            return None, default
+        return latest
+
+    def dropped_frames(self):
+        stats = {name: slot.dropped for name, slot in self.in_slots.items()}
+        stats["render"] = self.render_slot.dropped
+        return stats
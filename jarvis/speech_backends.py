@@ -0,0 +1,89 @@
+import json
+import os
+import speech_recognition as sr
+from .config import Config
+
+class SpeechBackend:
+    """
+    Pluggable speech recognizer used by VoiceEngine.
+    stream(source) is a generator of (text, is_final) pairs read from an open
+    sr.Microphone. Streaming backends also yield partial hypotheses (is_final
+    False) while the user is still talking, at least once per audio chunk.
+    """
+    name = "base"
+    streaming = False
+    sample_rate = None   # None = microphone default
+    chunk_size = 1024
+    
+    def prepare(self, source):
+        """Called once after the microphone is opened."""
+        
+    def stream(self, source):
+        raise NotImplementedError
+        
+    def reset(self):
+        """Discard the current utterance (e.g. after it was handled from partials)."""
+
+class GoogleBackend(SpeechBackend):
+    """Phrase-at-a-time recognition through the Google Web Speech API (needs network)."""
+    name = "google"
+    
+    def __init__(self):
+        self.recognizer = sr.Recognizer()
+        
+    def prepare(self, source):
+        self.recognizer.adjust_for_ambient_noise(source, duration=1)
+        self.recognizer.dynamic_energy_threshold = Config.MIC_DYNAMIC_ENERGY
+        self.recognizer.energy_threshold = Config.MIC_ENERGY_THRESHOLD
+        
+    def stream(self, source):
+        while True:
+            try:
+                audio = self.recognizer.listen(source, timeout=None, phrase_time_limit=5)
+                yield self.recognizer.recognize_google(audio).lower(), True
+            except sr.WaitTimeoutError: pass
+            except sr.UnknownValueError: pass
+
+class VoskBackend(SpeechBackend):
+    """
+    Offline streaming recognition with a Vosk/Kaldi model loaded from disk.
+    Audio is fed in STT_CHUNK_MS chunks; every chunk yields the current
+    partial hypothesis, and Vosk's endpointer yields the final text.
+    """
+    name = "vosk"
+    streaming = True
+    sample_rate = 16000
+    
+    def __init__(self, model_path=Config.VOSK_MODEL_PATH):
+        import vosk # Optional dependency: pip install vosk
+        vosk.SetLogLevel(-1)
+        if not os.path.isdir(model_path):
+            raise FileNotFoundError(f"Vosk model not found at {model_path}")
+        self.model = vosk.Model(model_path)
+        self.rec = vosk.KaldiRecognizer(self.model, self.sample_rate)
+        self.chunk_size = int(self.sample_rate * Config.STT_CHUNK_MS / 1000)
+        
+    def stream(self, source):
+        while True:
+            data = source.stream.read(self.chunk_size)
+            if self.rec.AcceptWaveform(data):
+                text = json.loads(self.rec.Result()).get("text", "")
+                if text:
+                    yield text, True
+            else:
+                yield json.loads(self.rec.PartialResult()).get("partial", ""), False
+                
+    def reset(self):
+        self.rec.Reset()
+
+def create_backend(name=Config.STT_BACKEND):
+    """
+    "google", "vosk", or "auto" (Vosk when it and its model are installed,
+    otherwise Google).
+    """
+    if name in ("vosk", "auto"):
+        try:
+            return VoskBackend()
+        except Exception as e:
+            print(f"[VOICE] Offline recognizer unavailable ({e}); using Google.")
+    return GoogleBackend()
@@ -0,0 +1,50 @@
+from collections import OrderedDict
+
+class SpriteCache:
+    """
+    Bounded LRU cache of pre-rendered sprites (e.g. glow text).
+    Values are (bgr, mask, ...) tuples of NumPy arrays; their byte size counts
+    against max_bytes and the least recently used sprites are evicted first.
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = OrderedDict()
+        
+    def get(self, key, render_fn):
+        """Returns the sprite for key, calling render_fn() to build it on a miss."""
+        item = self._items.get(key)
+        if item is not None:
+            self._items.move_to_end(key)
+            self.hits += 1
+            return item[0]
+            
+        self.misses += 1
+        sprite = render_fn()
+        size = sum(a.nbytes for a in sprite if hasattr(a, "nbytes"))
+        if size <= self.max_bytes:
+            self._items[key] = (sprite, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, old_size) = self._items.popitem(last=False)
+                self.bytes -= old_size
+                self.evictions += 1
+        return sprite
+        
+    def clear(self):
+        self._items.clear()
+        self.bytes = 0
+        
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._items),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -0,0 +1,86 @@
+import os
+import threading
+import time
+from collections import deque, namedtuple
+import psutil
+from .config import Config
+
+TelemetrySnapshot = namedtuple("TelemetrySnapshot", [
+    "timestamp",  # time.time() of the sample
+    "cpu",        # system CPU %
+    "ram",        # system RAM %
+    "battery",    # battery % (None on desktops)
+    "plugged",    # on AC power (None if unknown)
+    "proc_cpu",   # JARVIS CPU % (of one core)
+    "proc_rss",   # JARVIS resident memory, bytes
+    "threads",    # JARVIS thread count
+])
+
+class Telemetry:
+    """
+    Samples system and JARVIS process stats on a background thread.
+    `snapshot` is an immutable TelemetrySnapshot replaced atomically on every
+    sample and `history` a tuple of recent snapshots, so the render thread
+    reads both without locks or syscalls. The (slow on some platforms)
+    battery query only runs every TELEMETRY_BATTERY_EVERY samples.
+    """
+    def __init__(self, interval=Config.TELEMETRY_INTERVAL, history=Config.TELEMETRY_HISTORY):
+        self.interval = interval
+        self.process = psutil.Process(os.getpid())
+        self._ring = deque(maxlen=history)
+        self._battery = (None, None)
+        self._samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+        
+        # Prime the CPU counters (the first cpu_percent() call always returns 0)
+        psutil.cpu_percent(None)
+        self.process.cpu_percent(None)
+        self.snapshot = TelemetrySnapshot(time.time(), 0.0, psutil.virtual_memory().percent,
+                                          None, None, 0.0, self.process.memory_info().rss, self.process.num_threads())
+        self.history = (self.snapshot,)
+        
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="jarvis-telemetry", daemon=True)
+            self._thread.start()
+        return self
+        
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception as e:
+                print(f"[TELEMETRY] Sampling error: {e}")
+                
+    def sample(self):
+        """Takes one sample and publishes it."""
+        if self._samples % Config.TELEMETRY_BATTERY_EVERY == 0:
+            batt = psutil.sensors_battery()
+            self._battery = (batt.percent, batt.power_plugged) if batt else (None, None)
+        self._samples += 1
+        
+        with self.process.oneshot():
+            snap = TelemetrySnapshot(
+                timestamp=time.time(),
+                cpu=psutil.cpu_percent(None),
+                ram=psutil.virtual_memory().percent,
+                battery=self._battery[0],
+                plugged=self._battery[1],
+                proc_cpu=self.process.cpu_percent(None),
+                proc_rss=self.process.memory_info().rss,
+                threads=self.process.num_threads(),
+            )
+        self._ring.append(snap)
+        self.history = tuple(self._ring)
+        self.snapshot = snap
+        return snap
+        
+    def series(self, field):
+        """Recent values of one snapshot field, oldest first (for sparklines)."""
+        return [getattr(s, field) for s in self.history]
@@ -0,0 +1,137 @@
+import numpy as np
+from .config import Config
+
+def iou_matrix(a, b):
+    """
+    Pairwise IoU between (N,4) and (M,4) xyxy box arrays -> (N,M).
+    """
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)), dtype=np.float32)
+    a = a[:, None, :]
+    b = b[None, :, :]
+    iw = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    ih = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    inter = iw * ih
+    area_a = (a[..., 2] - a[..., 0]) * (a[..., 3] - a[..., 1])
+    area_b = (b[..., 2] - b[..., 0]) * (b[..., 3] - b[..., 1])
+    return inter / np.maximum(area_a + area_b - inter, 1e-6)
+
+def _xyxy_to_z(boxes):
+    w = boxes[:, 2] - boxes[:, 0]
+    h = boxes[:, 3] - boxes[:, 1]
+    return np.stack([boxes[:, 0] + w / 2, boxes[:, 1] + h / 2, w, h], axis=1)
+
+def _z_to_xyxy(z):
+    w = np.maximum(z[:, 2], 1.0)
+    h = np.maximum(z[:, 3], 1.0)
+    return np.stack([z[:, 0] - w / 2, z[:, 1] - h / 2, z[:, 0] + w / 2, z[:, 1] + h / 2], axis=1)
+
+class BoxTracker:
+    """
+    SORT-style multi-object tracker.
+    Each track is a constant-velocity Kalman filter over (cx, cy, w, h); all
+    tracks are predicted/updated together with batched NumPy ops. Detections
+    are associated greedily by IoU within the same class, so a track keeps its
+    ID across frames where the detector is not run at all.
+    """
+    # State: [cx, cy, w, h, vx, vy, vw, vh]
+    F = np.eye(8)
+    F[:4, 4:] = np.eye(4)
+    H = np.eye(4, 8)
+    Q = np.diag([1.0, 1.0, 1.0, 1.0, 0.05, 0.05, 0.01, 0.01])
+    R = np.diag([4.0, 4.0, 16.0, 16.0])
+
+    def __init__(self, iou_threshold=Config.TRACK_IOU_THRESHOLD, max_misses=Config.TRACK_MAX_MISSES):
+        self.iou_threshold = iou_threshold
+        self.max_misses = max_misses
+        self.next_id = 1
+
+        self.x = np.zeros((0, 8))
+        self.P = np.zeros((0, 8, 8))
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.conf = np.zeros(0)
+        self.misses = np.zeros(0, dtype=np.int64)
+        self.cls = np.zeros(0, dtype=np.int32)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def predict(self):
+        """Advances every track by one frame."""
+        if not len(self):
+            return
+        self.x = self.x @ self.F.T
+        self.P = np.einsum('ij,njk,lk->nil', self.F, self.P, self.F) + self.Q
+
+    def update(self, detections):
+        """
+        Associates one detector run (a Detections set) with the already
+        predicted tracks; unmatched detections start new tracks.
+        """
+        boxes = detections.boxes.astype(np.float64)
+        cls = detections.cls
+        confs = detections.conf.astype(np.float64)
+
+        iou = iou_matrix(self.boxes(), boxes)
+        if iou.size:
+            iou = np.where(self.cls[:, None] == cls[None, :], iou, 0.0)
+
+        matched_t, matched_d = [], []
+        while iou.size:
+            t, d = np.unravel_index(np.argmax(iou), iou.shape)
+            if iou[t, d] < self.iou_threshold:
+                break
+            matched_t.append(t)
+            matched_d.append(d)
+            iou[t, :] = 0.0
+            iou[:, d] = 0.0
+
+        if matched_t:
+            self._correct(np.array(matched_t), _xyxy_to_z(boxes[matched_d]))
+            self.conf[matched_t] = confs[matched_d]
+
+        missed = np.ones(len(self), dtype=bool)
+        missed[matched_t] = False
+        self.misses[missed] += 1
+        self.misses[matched_t] = 0
+        self._prune(self.misses <= self.max_misses)
+
+        new = np.ones(len(boxes), dtype=bool)
+        new[matched_d] = False
+        if new.any():
+            self._spawn(boxes[new], cls[new], confs[new])
+
+    def _correct(self, idx, z):
+        x, P = self.x[idx], self.P[idx]
+        HP = np.einsum('ij,njk->nik', self.H, P)
+        S = np.einsum('nij,kj->nik', HP, self.H) + self.R
+        K = np.einsum('nji,njk->nik', HP, np.linalg.inv(S))
+        innovation = z - x @ self.H.T
+        self.x[idx] = x + np.einsum('nij,nj->ni', K, innovation)
+        self.P[idx] = P - np.einsum('nij,njk->nik', K, HP)
+
+    def _spawn(self, boxes, cls, confs):
+        n = len(boxes)
+        x = np.zeros((n, 8))
+        x[:, :4] = _xyxy_to_z(boxes)
+        P = np.tile(np.diag([10.0, 10.0, 10.0, 10.0, 1e3, 1e3, 1e3, 1e3]), (n, 1, 1))
+
+        self.x = np.concatenate([self.x, x])
+        self.P = np.concatenate([self.P, P])
+        self.ids = np.concatenate([self.ids, np.arange(self.next_id, self.next_id + n)])
+        self.conf = np.concatenate([self.conf, confs])
+        self.misses = np.concatenate([self.misses, np.zeros(n, dtype=np.int64)])
+        self.cls = np.concatenate([self.cls, cls])
+        self.next_id += n
+
+    def _prune(self, keep):
+        self.x, self.P = self.x[keep], self.P[keep]
+        self.ids, self.conf, self.misses = self.ids[keep], self.conf[keep], self.misses[keep]
+        self.cls = self.cls[keep]
+
+    def boxes(self):
+        """Current (T,4) xyxy boxes of all live tracks."""
+        return _z_to_xyxy(self.x[:, :4])
+
+    def reset(self):
+        self.__init__(self.iou_threshold, self.max_misses)
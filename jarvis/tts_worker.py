@@ -0,0 +1,165 @@
+import hashlib
+import itertools
+import os
+import queue
+import threading
+import time
+import wave
+import pyttsx3
+import winsound
+from .config import Config
+
+class TTSWorker:
+    """
+    One long-lived text-to-speech thread.
+    The pyttsx3 engine is created once, on the worker thread that uses it.
+    Utterances wait in a priority queue (lower number first, FIFO within a
+    priority); identical pending utterances are merged, and interrupt() cuts
+    the current one short. Fixed phrases are rendered to WAV files in
+    TTS_CACHE_DIR while idle (or after their first live use) and afterwards
+    played straight from disk, skipping synthesis.
+    """
+    URGENT, NORMAL, LOW = 0, 1, 2
+    
+    def __init__(self):
+        self._queue = queue.PriorityQueue()
+        self._seq = itertools.count()
+        self._pending = set()         # (text, emotion) currently queued
+        self._lock = threading.Lock()
+        self._interrupt = threading.Event()
+        self._busy = threading.Event()
+        self._quiet_until = 0.0       # short tail so the mic doesn't catch our echo
+        self._to_cache = list(Config.TTS_CACHED_PHRASES.items()) # (text, emotion) still to render
+        self.voice_id = None
+        self.engine = None
+        self._thread = threading.Thread(target=self._loop, name="jarvis-tts", daemon=True)
+        
+    def start(self):
+        self._thread.start()
+        return self
+        
+    def stop(self):
+        self.interrupt()
+        self._queue.put((-1, -1, None, None))
+        self._thread.join(timeout=2)
+        
+    @property
+    def is_speaking(self):
+        return self._busy.is_set() or not self._queue.empty() or time.monotonic() < self._quiet_until
+        
+    def say(self, text, emotion="neutral", priority=NORMAL, interrupt=False):
+        """Queues an utterance. interrupt=True drops everything pending and stops the current one."""
+        if interrupt:
+            self.interrupt()
+        with self._lock:
+            if (text, emotion) in self._pending:
+                return False
+            self._pending.add((text, emotion))
+        self._queue.put((priority, next(self._seq), text, emotion))
+        return True
+        
+    def interrupt(self):
+        with self._lock:
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._pending.clear()
+        self._interrupt.set()
+        
+    # ---------------- worker thread ----------------
+    def _loop(self):
+        try:
+            self.engine = pyttsx3.init()
+            self._setup_voice()
+            self.engine.connect('started-word', self._on_word)
+        except Exception as e:
+            print(f"[VOICE] TTS init error: {e}")
+            return
+            
+        while True:
+            try:
+                _, _, text, emotion = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                self._precache_next()
+                continue
+            if text is None:
+                break
+                
+            with self._lock:
+                self._pending.discard((text, emotion))
+            self._interrupt.clear()
+            self._busy.set()
+            try:
+                self._speak(text, emotion)
+            except Exception as e:
+                print(f"[VOICE] Speak Error: {e}")
+            finally:
+                self._quiet_until = time.monotonic() + 0.2
+                self._busy.clear()
+                
+    def _setup_voice(self):
+        voices = self.engine.getProperty('voices')
+        # Try to find a good male voice for JARVIS (David on Windows)
+        for v in voices:
+            if "David" in v.name:
+                self.voice_id = v.id
+                break
+        if not self.voice_id and voices:
+            self.voice_id = voices[0].id
+            
+        self.engine.setProperty('voice', self.voice_id)
+        self.engine.setProperty('volume', Config.VOICE_VOLUME)
+        # Pitch adjustment is not directly supported by standard pyttsx3 SAPI5 driver easily without XML
+        # But we set the rate lower to simulate a deeper, calmer tone.
+        
+    def _rate(self, emotion):
+        return Config.VOICE_RATE + Config.VOICE_EMOTION_RATES.get(emotion, 0)
+        
+    def _cache_path(self, text, rate):
+        key = f"{self.voice_id}|{rate}|{Config.VOICE_VOLUME}|{text}".encode("utf-8")
+        return os.path.join(Config.TTS_CACHE_DIR, hashlib.sha1(key).hexdigest()[:16] + ".wav")
+        
+    def _speak(self, text, emotion):
+        rate = self._rate(emotion)
+        path = self._cache_path(text, rate)
+        if os.path.exists(path):
+            self._play_file(path)
+            return
+            
+        self.engine.setProperty('rate', rate)
+        self.engine.say(text)
+        self.engine.runAndWait()
+        if Config.TTS_CACHED_PHRASES.get(text) == emotion and (text, emotion) not in self._to_cache:
+            self._to_cache.append((text, emotion)) # first use: render it for next time
+            
+    def _on_word(self, name, location, length):
+        if self._interrupt.is_set():
+            self.engine.stop()
+            
+    def _play_file(self, path):
+        with wave.open(path, 'rb') as w:
+            duration = w.getnframes() / float(w.getframerate())
+        winsound.PlaySound(path, winsound.SND_FILENAME | winsound.SND_ASYNC | winsound.SND_NODEFAULT)
+        if self._interrupt.wait(duration):
+            winsound.PlaySound(None, 0) # stop playback
+            
+    def _precache_next(self):
+        """Renders one missing cached phrase (only while idle)."""
+        while self._to_cache:
+            text, emotion = self._to_cache.pop(0)
+            rate = self._rate(emotion)
+            path = self._cache_path(text, rate)
+            if os.path.exists(path):
+                continue
+            try:
+                os.makedirs(Config.TTS_CACHE_DIR, exist_ok=True)
+                tmp = path + ".tmp.wav"
+                self.engine.setProperty('rate', rate)
+                self.engine.save_to_file(text, tmp)
+                self.engine.runAndWait()
+                os.replace(tmp, path)
+            except Exception as e:
+                print(f"[VOICE] Phrase cache error: {e}")
+            return
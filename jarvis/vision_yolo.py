@@ -1,20 +1,53 @@
+import cv2
+import os
 import torch
+import threading
+import time
 from ultralytics import YOLO
 from .config import Config
+from .pipeline import LatestSlot
+from .tracker import BoxTracker
+from .detections import Detections
+from .letterbox import build_letterboxes
 import math
 
 class VisionSystem:
     """
     Manages YOLOv8 Object Detection with GPU acceleration and stability checks.
+    In async mode inference runs on a background worker and detect() never blocks.
+    YOLO only runs every few frames (sooner when the scene moves); a BoxTracker
+    carries boxes and stable track IDs across the frames in between.
     """
-    def __init__(self):
+    def __init__(self, timer=None):
         self.model = None
+        self.names = {}
         self.enabled = False
         self.device = 'cpu'
+        self.timer = timer
+        
+        self.async_mode = Config.YOLO_ASYNC
+        self.frame_index = 0
+        self.latest = Detections()
+        self._slot = LatestSlot()
+        self._worker = None
+        self._worker_stop = None  # threading.Event of the current worker
+        
+        self.tracker = BoxTracker()
+        self.detector_runs = 0
+        self.frames_seen = 0
+        self._frames_since_detect = Config.YOLO_MAX_INTERVAL
+        self._motion_ref = None
+        self._fused = None
+        self._detected_index = None
+        self._detected_at = None
+        self._reset_pending = False
+        self._letterboxes = []
+        self._letterbox_key = None
         
     def load_model(self):
         """
         Loads the YOLO model. Attempts CUDA first, falls back to CPU.
+        Non-torch backends load an exported copy of the weights (see _model_path).
         """
         if self.model is not None:
             return True
@@ -33,47 +66,226 @@ class VisionSystem:
             else:
                 self.device = 'cpu'
                 
-            self.model = YOLO(Config.YOLO_MODEL)
-            self.model.to(self.device)
-            print(f"[VISION] Model loaded on {self.device}.")
+            backend = Config.VISION_BACKEND
+            if backend == "openvino":
+                self.device = 'cpu' # OpenVINO picks its own device through ultralytics
+                
+            # Publish only a fully placed model; detect() may run on another thread.
+            model = YOLO(self._model_path(), task="detect")
+            if backend == "torch":
+                model.to(self.device)
+            self.names = dict(model.names)
+            self.model = model
+            print(f"[VISION] Model loaded on {self.device} ({backend}).")
             return True
             
         except Exception as e:
             print(f"[VISION] Critical Load Error: {e}")
             self.model = None
             return False
-
-    def detect(self, frame):
+            
+    def _model_path(self):
+        """
+        Weights for the configured backend. Exported models are cached next to
+        the .pt file (e.g. yolov8n-int8.onnx, yolov8n-fp16_openvino_model/) and
+        only exported on first use. Exports are fixed to YOLO_IMGSZ.
+        """
+        backend = Config.VISION_BACKEND
+        precision = Config.VISION_PRECISION
+        if backend == "torch":
+            return Config.YOLO_MODEL
+            
+        if backend == "onnxruntime" and precision == "fp16" and self.device != 'cuda':
+            print("[VISION] FP16 ONNX export needs CUDA. Using FP32.")
+            precision = "fp32"
+            
+        base = f"{os.path.splitext(Config.YOLO_MODEL)[0]}-{Config.YOLO_IMGSZ}"
+        if backend == "onnxruntime":
+            target = f"{base}-{precision}.onnx"
+        elif backend == "openvino":
+            target = f"{base}-{precision}_openvino_model"
+        else:
+            raise ValueError(f"Unknown vision backend: {backend}")
+            
+        if not os.path.exists(target):
+            print(f"[VISION] Exporting {Config.YOLO_MODEL} for {backend} ({precision})...")
+            os.replace(self._export(backend, precision), target)
+        return target
+        
+    def _export(self, backend, precision):
+        model = YOLO(Config.YOLO_MODEL)
+        if backend == "openvino":
+            # int8 runs NNCF post-training quantization on ultralytics' calibration set
+            return model.export(format="openvino", imgsz=Config.YOLO_IMGSZ,
+                                half=precision == "fp16", int8=precision == "int8")
+                                
+        half = precision == "fp16"
+        path = model.export(format="onnx", imgsz=Config.YOLO_IMGSZ, half=half, device=0 if half else "cpu")
+        if precision == "int8":
+            # Weight-only dynamic quantization; needs no calibration data
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+            quantized = os.path.splitext(path)[0] + "-int8-tmp.onnx"
+            quantize_dynamic(path, quantized, weight_type=QuantType.QUInt8)
+            os.remove(path)
+            path = quantized
+        return path
+        
+    def detect(self, frame, frame_index=None, shared=True):
         """
         Runs detection on the frame.
-        Returns list of dicts: {'bbox': (x1,y1,x2,y2), 'label': str, 'conf': float}
+        Returns a Detections set (boxes / conf / cls / track_ids arrays).
+        YOLO runs only on scheduled frames; tracked boxes are returned for every frame.
+        In async mode the frame is handed to the worker and the newest finished
+        result is fused when it arrives; its detected_index may lag frame_index.
+        shared=False: nobody writes to frame after this call (the pipeline's
+        packet frames), so the async worker reads it without a private copy.
         """
         if not self.enabled or self.model is None:
-            return []
+            return Detections()
             
-        try:
-            results = self.model(frame, verbose=False, stream=False, conf=Config.YOLO_CONF_THRESHOLD)
-            detections = []
+        if frame_index is None:
+            frame_index = self.frame_index + 1
+        self.frame_index = frame_index
+        captured_at = time.perf_counter()
+        if self._reset_pending:
+            # Tracker state is owned by the detect() caller's thread; reset it here.
+            self._reset_pending = False
+            self.tracker.reset()
+            self._fused = None
+            self._detected_index = None
+            self._detected_at = None
+            self._frames_since_detect = Config.YOLO_MAX_INTERVAL
+        self.frames_seen += 1
+        run_detector = self._should_detect(frame)
+        self.tracker.predict()
+        
+        if not self.async_mode:
+            if run_detector:
+                self._fuse(self._infer(frame, frame_index, captured_at))
+            return self._tracked(frame_index, captured_at)
+            
+        if run_detector:
+            # A caller that keeps drawing on its frame gives the worker its own copy.
+            self._slot.put((frame.copy() if shared else frame, frame_index, captured_at))
+        latest = self.latest
+        if latest is not self._fused:
+            self._fuse(latest)
+        return self._tracked(frame_index, captured_at)
+        
+    def _should_detect(self, frame):
+        """
+        Fixed schedule: every YOLO_DETECT_INTERVAL frames.
+        Adaptive: every YOLO_MAX_INTERVAL frames on a still scene, but as often as
+        YOLO_DETECT_INTERVAL while the downscaled frame keeps changing.
+        """
+        self._frames_since_detect += 1
+        since = self._frames_since_detect
+        
+        if Config.YOLO_ADAPTIVE_INTERVAL:
+            run = since >= Config.YOLO_MAX_INTERVAL
+            if not run and since >= Config.YOLO_DETECT_INTERVAL:
+                run = self._motion(frame) > Config.YOLO_MOTION_THRESHOLD
+        else:
+            run = since >= Config.YOLO_DETECT_INTERVAL
             
-            for r in results:
-                boxes = r.boxes
-                for box in boxes:
-                    x1, y1, x2, y2 = box.xyxy[0]
-                    conf = float(box.conf[0])
-                    cls = int(box.cls[0])
-                    label = self.model.names[cls]
-                    
-                    detections.append({
-                        'bbox': (int(x1), int(y1), int(x2), int(y2)),
-                        'conf': conf,
-                        'label': label
-                    })
-            return detections
+        if run:
+            self._frames_since_detect = 0
+            if Config.YOLO_ADAPTIVE_INTERVAL:
+                self._motion_ref = self._thumbnail(frame)
+        return run
+        
+    def _thumbnail(self, frame):
+        small = cv2.resize(frame, (64, 36), interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        
+    def _motion(self, frame):
+        """Mean grey-level change since the last detector run."""
+        if self._motion_ref is None:
+            return float('inf')
+        return float(cv2.absdiff(self._thumbnail(frame), self._motion_ref).mean())
+        
+    def _fuse(self, detections):
+        self._fused = detections
+        self._detected_index = detections.frame_index
+        self._detected_at = detections.captured_at
+        self.tracker.update(detections)
+        
+    def _tracked(self, frame_index, captured_at):
+        t = self.tracker
+        return Detections(t.boxes(), t.conf, t.cls, t.ids, self.names,
+                          frame_index, captured_at, self._detected_index, self._detected_at)
+                          
+    def _infer(self, frame, frame_index, captured_at):
+        t0 = time.perf_counter()
+        try:
+            self.detector_runs += 1
+            letterboxes = self._get_letterboxes(frame.shape)
+            inputs = [lb.apply(frame) for lb in letterboxes]
+            results = self.model(inputs, imgsz=Config.YOLO_IMGSZ, verbose=False, stream=False,
+                                 conf=Config.YOLO_CONF_THRESHOLD, device=self.device)
+                                 
+            parts = []
+            for lb, r in zip(letterboxes, results):
+                part = Detections.from_ultralytics([r], self.names)
+                lb.unmap(part.boxes)
+                parts.append(part)
+            detections = Detections.concat(parts, self.names, frame_index, captured_at)
+            return detections.filter(Config.YOLO_CLASSES, Config.YOLO_MIN_AREA)
             
         except Exception as e:
             print(f"[VISION] Detection Error: {e}")
-            return []
+            return Detections(names=self.names, frame_index=frame_index, captured_at=captured_at)
+        finally:
+            if self.timer is not None:
+                self.timer.add("yolo", time.perf_counter() - t0)
+                
+    def _get_letterboxes(self, frame_shape):
+        """Letterbox buffers per ROI, rebuilt only when size, ROIs or frame shape change."""
+        key = (frame_shape, Config.YOLO_IMGSZ, tuple(map(tuple, Config.VISION_ROIS)))
+        if key != self._letterbox_key:
+            self._letterboxes = build_letterboxes(frame_shape, Config.YOLO_IMGSZ, Config.VISION_ROIS)
+            self._letterbox_key = key
+        return self._letterboxes
+        
+    def _worker_loop(self, stop, previous):
+        """
+        Runs until its own `stop` event is set. A worker stopped by a quick
+        disable/enable may still be finishing an inference; the new one waits
+        for it (`previous`) because inference reuses the letterbox buffers.
+        """
+        if previous is not None:
+            previous.join()
+        print("[VISION] Async inference worker started.")
+        while not stop.is_set():
+            item = self._slot.get(timeout=0.2)
+            if item is None or self.model is None:
+                continue
+            frame, frame_index, captured_at = item
+            result = self._infer(frame, frame_index, captured_at)
+            if not stop.is_set():
+                self.latest = result
+                
+    def _start_worker(self):
+        if self._worker_stop is not None and self._worker.is_alive():
+            return
+        self._stop_worker()
+        stop = threading.Event()
+        self._worker = threading.Thread(target=self._worker_loop, args=(stop, self._worker),
+                                        name="jarvis-yolo", daemon=True)
+        self._worker_stop = stop
+        self._worker.start()
+        
+    def _stop_worker(self):
+        """Signals the current worker to exit after its inference (doesn't wait)."""
+        if self._worker_stop is not None:
+            self._worker_stop.set()
+            self._worker_stop = None
             
+    @property
+    def frames_dropped(self):
+        """Frames the async worker skipped because inference fell behind."""
+        return self._slot.dropped
+        
     def toggle(self, state=None):
         if state is None:
             self.enabled = not self.enabled
@@ -83,4 +295,12 @@ class VisionSystem:
         if self.enabled and self.model is None:
             self.load_model()
             
+        if self.enabled and self.async_mode:
+            self._start_worker()
+        elif not self.enabled:
+            self._stop_worker()
+            self._slot.get(timeout=0) # drop a queued frame from before the pause
+            self.latest = Detections()
+            self._reset_pending = True
+            
         return self.enabled
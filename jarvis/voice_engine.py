@@ -1,91 +1,62 @@
-import pyttsx3
 import speech_recognition as sr
 import threading
 import time
 from collections import deque
 from .config import Config
 from .sound_fx import SoundFx
+from .speech_backends import create_backend
+from .tts_worker import TTSWorker
 
 class VoiceEngine:
     """
     Handles Speech-to-Text (STT) and Text-to-Speech (TTS).
     Premium Edition: Deeper voice, emotional tone stubs, robust recovery.
+    Recognition runs through a pluggable SpeechBackend (Config.STT_BACKEND);
+    streaming backends let commands fire from partial results.
     """
-    def __init__(self):
-        self.engine = pyttsx3.init()
-        self.recognizer = sr.Recognizer()
-        self.microphone = sr.Microphone()
+    def __init__(self, is_command=None):
+        """
+        is_command: optional predicate; when given, a streamed partial only
+        fires once its command words are a complete, known command.
+        Commands it rejects wait for the final result of the utterance.
+        Without it nothing fires from partials.
+        """
+        self.tts = TTSWorker().start()
+        self.backend = create_backend()
+        self.is_command = is_command
+        self._partial = None
         
         self.command_queue = deque()
         self.lock = threading.Lock()
-        self.is_speaking = False
         self.is_listening = True
         self.active_mode = False 
         
-        self._setup_voice()
         self.start_listener()
         
-    def _setup_voice(self):
-        try:
-            voices = self.engine.getProperty('voices')
-            selected = None
-            # Try to find a good male voice for JARVIS (David on Windows)
-            for v in voices:
-                if "David" in v.name:
-                    selected = v.id
-                    break
-            if not selected and voices:
-                selected = voices[0].id
-                
-            self.engine.setProperty('voice', selected)
-            self.engine.setProperty('rate', Config.VOICE_RATE)
-            self.engine.setProperty('volume', Config.VOICE_VOLUME)
-            
-            # Pitch adjustment is not directly supported by standard pyttsx3 SAPI5 driver easily without XML
-            # But we set the rate lower to simulate a deeper, calmer tone.
-        except Exception as e:
-            print(f"[VOICE] Setup Error: {e}")
-
-    def speak(self, text, emotion="neutral"):
+    @property
+    def is_speaking(self):
+        return self.tts.is_speaking
+        
+    def speak(self, text, emotion="neutral", priority=None, interrupt=False):
         """
-        Non-blocking speech with emotional context (stub).
+        Non-blocking speech, queued on the persistent TTS worker.
+        Urgent lines jump the queue; interrupt=True also cuts off what is playing.
         """
         print(f"[JARVIS]: {text}")
+        if priority is None:
+            priority = TTSWorker.URGENT if emotion == "urgent" else TTSWorker.NORMAL
+        self.tts.say(text, emotion, priority, interrupt)
         
-        def _speak_thread():
-            self.is_speaking = True
-            try:
-                eng = pyttsx3.init()
-                eng.setProperty('voice', self.engine.getProperty('voice'))
-                
-                # Adjust rate slightly based on emotion
-                rate = Config.VOICE_RATE
-                if emotion == "urgent": rate += 20
-                elif emotion == "sad": rate -= 20
-                eng.setProperty('rate', rate)
-                
-                eng.say(text)
-                eng.runAndWait()
-            except Exception as e:
-                print(f"[VOICE] Speak Error: {e}")
-            finally:
-                time.sleep(0.2)
-                self.is_speaking = False
-                
-        threading.Thread(target=_speak_thread).start()
-
     def start_listener(self):
         threading.Thread(target=self._listen_loop, daemon=True).start()
-
+        
     def _listen_loop(self):
-        print("[VOICE] Listener started.")
+        print(f"[VOICE] Listener started ({self.backend.name}).")
         
         while self.is_listening:
             try:
-                with self.microphone as source:
-                    self.recognizer.adjust_for_ambient_noise(source, duration=1)
-                    self.recognizer.dynamic_energy_threshold = Config.MIC_DYNAMIC_ENERGY
-                    self.recognizer.energy_threshold = Config.MIC_ENERGY_THRESHOLD
+                with sr.Microphone(sample_rate=self.backend.sample_rate, chunk_size=self.backend.chunk_size) as source:
+                    self.backend.prepare(source)
                     
                     while self.is_listening:
                         if self.is_speaking:
@@ -93,31 +64,20 @@ class VoiceEngine:
                             continue
                             
                         try:
-                            audio = self.recognizer.listen(source, timeout=None, phrase_time_limit=5)
-                            text = self.recognizer.recognize_google(audio).lower()
-                            print(f"[USER]: {text}")
-                            
-                            if Config.WAKE_WORD in text:
-                                parts = text.split(Config.WAKE_WORD, 1)
-                                command = parts[1].strip()
-                                
-                                if command and Config.ONE_SHOT_COMMAND:
-                                    with self.lock:
-                                        self.command_queue.append(command)
-                                    SoundFx.success()
-                                else:
-                                    self.active_mode = True
-                                    SoundFx.listening_start()
-                                    self.speak("Yes sir?")
-                                    
-                            elif self.active_mode:
-                                with self.lock:
-                                    self.command_queue.append(text)
-                                self.active_mode = False 
-                                SoundFx.listening_end()
-                                
-                        except sr.WaitTimeoutError: pass
-                        except sr.UnknownValueError: pass
+                            for text, final in self.backend.stream(source):
+                                if not self.is_listening:
+                                    break
+                                if self.is_speaking:
+                                    # Don't transcribe our own voice
+                                    self.backend.reset()
+                                    self._partial = None
+                                    if not self.backend.streaming:
+                                        break
+                                    continue
+                                if final:
+                                    self._handle_phrase(text)
+                                elif text:
+                                    self._handle_partial(text)
                         except sr.RequestError:
                             print("[VOICE] Network Error")
                             time.sleep(2)
@@ -128,9 +88,91 @@ class VoiceEngine:
             except Exception as e:
                 print(f"[VOICE] Critical Listener Error: {e}")
                 time.sleep(1)
-
+                
+    def _handle_phrase(self, text):
+        """A finished utterance (the only input for non-streaming backends)."""
+        self._partial = None
+        print(f"[USER]: {text}")
+        
+        if Config.WAKE_WORD in text:
+            parts = text.split(Config.WAKE_WORD, 1)
+            command = parts[1].strip()
+            
+            if command and Config.ONE_SHOT_COMMAND:
+                self._queue_command(command)
+                SoundFx.success()
+            else:
+                self.active_mode = True
+                SoundFx.listening_start()
+                self.speak("Yes sir?")
+                
+        elif self.active_mode:
+            self._queue_command(text)
+            self.active_mode = False 
+            SoundFx.listening_end()
+            
+    def _handle_partial(self, text):
+        """
+        Spots wake word + command in a streaming partial hypothesis.
+        Once the command words have stayed the same for STT_STABLE_PARTIALS
+        chunks it is dispatched without waiting for the end-of-utterance.
+        Only closed commands fire early ("mute mic", "time"): one ending in
+        free text ("search for {query}") could still be mid-phrase, so it is
+        left to the final result.
+        """
+        if Config.WAKE_WORD in text:
+            if not Config.ONE_SHOT_COMMAND: return
+            command = text.split(Config.WAKE_WORD, 1)[1].strip()
+        elif self.active_mode:
+            command = text.strip()
+        else:
+            return
+            
+        now = time.perf_counter()
+        if self._partial is None:
+            self._partial = [None, 0, now] # command, stable count, first heard
+        if not command:
+            return
+        if command != self._partial[0]:
+            self._partial[0], self._partial[1] = command, 1
+            return
+        self._partial[1] += 1
+        if self.is_command is None or not self.is_command(command):
+            return
+        if self._partial[1] >= Config.STT_STABLE_PARTIALS:
+            latency = (now - self._partial[2]) * 1000
+            print(f"[USER]: {text} (streamed, {latency:.0f} ms after wake)")
+            self._queue_command(command)
+            if self.active_mode:
+                self.active_mode = False
+                SoundFx.listening_end()
+            else:
+                SoundFx.success()
+            self.backend.reset()
+            self._partial = None
+            
+    def _queue_command(self, command):
+        with self.lock:
+            self.command_queue.append(command)
+            
     def get_command(self):
         with self.lock:
             if self.command_queue:
                 return self.command_queue.popleft()
             return None
+
+class MutedVoice:
+    """
+    Drop-in VoiceEngine replacement for headless / replay runs.
+    No microphone or TTS engine is opened; speech is only logged.
+    """
+    def __init__(self):
+        self.is_speaking = False
+        self.is_listening = False
+        self.active_mode = False
+        
+    def speak(self, text, emotion="neutral"):
+        print(f"[JARVIS]: {text}")
+        
+    def get_command(self):
+        return None
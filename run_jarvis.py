@@ -1,5 +1,31 @@
+import argparse
+from jarvis.config import Config
+from jarvis.frame_source import open_source
 from jarvis.jarvis_core import JarvisCore
 
+def parse_args():
+    parser = argparse.ArgumentParser(description=f"{Config.APP_NAME} v{Config.VERSION}")
+    parser.add_argument("--replay", metavar="SOURCE",
+                        help="Video file, image directory or 'synthetic' instead of the webcam")
+    parser.add_argument("--camera", type=int, default=Config.CAMERA_INDEX,
+                        help="Webcam index (default: %(default)s)")
+    parser.add_argument("--headless", action="store_true",
+                        help="No window, mic or cursor; print a timing report on exit")
+    parser.add_argument("--frames", type=int, metavar="N",
+                        help="Stop after N rendered frames")
+    parser.add_argument("--objects", action="store_true",
+                        help="Start with YOLO object detection enabled")
+    parser.add_argument("--sequential", action="store_true",
+                        help="Run every stage on one thread (every replayed frame is processed)")
+    return parser.parse_args()
+
 if __name__ == "__main__":
-    app = JarvisCore()
+    args = parse_args()
+    if args.sequential:
+        Config.PIPELINE_MODE = False
+        
+    source = open_source(args.replay if args.replay else args.camera)
+    app = JarvisCore(source=source, headless=args.headless, max_frames=args.frames)
+    if args.objects:
+        app.vision.toggle(True)
     app.run()
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+from jarvis import face_id
+from jarvis.config import Config
+from jarvis.face_store import FaceStore
+
+@pytest.fixture
+def fid(tmp_path, monkeypatch):
+    """FaceID on a throwaway store, searching through a 1-probe IVF index."""
+    monkeypatch.setattr(face_id, "FaceStore", lambda: FaceStore(str(tmp_path / "faces.sqlite"), str(tmp_path / "faces.json")))
+    monkeypatch.setattr(Config, "FACE_INDEX_FILE", str(tmp_path / "face_index.npz"))
+    monkeypatch.setattr(Config, "FACE_INDEX_MIN_SAMPLES", 1)
+    monkeypatch.setattr(Config, "FACE_INDEX_NPROBE", 1)
+    f = face_id.FaceID()
+    yield f
+    f.close()
+
+def test_identify_falls_back_when_probed_bucket_is_empty(fid):
+    rng = np.random.default_rng(0)
+    faces = [rng.uniform(100, 400, (478, 2)).astype(np.float32) for _ in range(64)]
+    for i, lms in enumerate(faces):
+        fid._append_sample(f"user{i}", fid.get_embedding(lms))
+        
+    index = fid._get_index()
+    query = fid.get_embedding(faces[0])
+    query /= np.linalg.norm(query)
+    bucket = int(np.argmax(index.centroids @ query))
+    for sample_id in index._ids[bucket].tolist():
+        index.remove(sample_id)
+    assert len(index.search(query)[0]) == 0
+    
+    assert fid.identify(faces[0]) == ("user0", pytest.approx(1.0))
+    assert fid.identify_batch([faces[0]], k=3)[0][0][0] == "user0"